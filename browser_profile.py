@@ -0,0 +1,182 @@
+import argparse
+import json
+import os
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from wait_utils import wait_for_network_idle
+import logging
+
+logger = logging.getLogger(__name__)
+
+# resources the scraper never reads: images, media and fonts, by extension and
+# by LinkedIn's image CDN path (those urls have no extension)
+LEAN_BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.svg",
+    "*.mp4", "*.webm", "*.m3u8", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*media.licdn.com/dms/image/*",
+    "*media.licdn.com/playlist/*",
+]
+
+# added to every document before its own scripts run, so animated modals and
+# list items are in their final state as soon as they are inserted
+DISABLE_ANIMATIONS_JS = """
+(function () {
+    var style = document.createElement('style');
+    style.textContent = '*, *::before, *::after { animation: none !important; transition: none !important; '
+        + 'scroll-behavior: auto !important; caret-color: transparent !important; }';
+    (document.head || document.documentElement).appendChild(style);
+})();
+"""
+
+# navigation timing of the current page, summed with its resource entries
+PAGE_LOAD_METRICS_JS = """
+var navigation = performance.getEntriesByType('navigation')[0];
+var resources = performance.getEntriesByType('resource');
+var bytes = navigation ? navigation.transferSize : 0;
+for (var i = 0; i < resources.length; i++) {
+    bytes += resources[i].transferSize || 0;
+}
+return {
+    loadMs: navigation ? navigation.loadEventEnd - navigation.startTime : null,
+    domContentLoadedMs: navigation ? navigation.domContentLoadedEventEnd - navigation.startTime : null,
+    resources: resources.length,
+    timingBytes: bytes
+};
+"""
+
+
+def lean_mode_from_env() -> dict:
+    """Read LEAN_MODE, HEADLESS and LEAN_BLOCKED_URLS (comma separated, added to the defaults)."""
+    extra_patterns = [pattern.strip() for pattern in os.getenv("LEAN_BLOCKED_URLS", "").split(",") if pattern.strip()]
+    return {
+        "lean": os.getenv("LEAN_MODE") == "1",
+        "headless": os.getenv("HEADLESS") == "1",
+        "blocked_url_patterns": LEAN_BLOCKED_URL_PATTERNS + extra_patterns,
+    }
+
+
+def chrome_options(lean=False, headless=False, record_network=False) -> Options:
+    options = Options()
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1280,2000")
+    if lean:
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_argument("--mute-audio")
+        options.add_argument("--autoplay-policy=user-gesture-required")
+        options.add_argument("--disable-extensions")
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if record_network:
+        # Network.* events in driver.get_log("performance"), for transferred bytes
+        options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    return options
+
+
+def apply_lean_mode(driver, blocked_url_patterns=None) -> bool:
+    """Block resources by url pattern and disable animations through CDP; returns False if the driver has no CDP."""
+    if not hasattr(driver, "execute_cdp_cmd"):
+        logger.warning("Lean mode needs a Chromium driver with CDP, continuing without it")
+        return False
+    patterns = LEAN_BLOCKED_URL_PATTERNS if blocked_url_patterns is None else blocked_url_patterns
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": DISABLE_ANIMATIONS_JS})
+    driver.execute_cdp_cmd("Emulation.setEmulatedMedia", {
+        "features": [{"name": "prefers-reduced-motion", "value": "reduce"}],
+    })
+    logger.info(f"Lean mode: blocking {len(patterns)} url patterns, animations disabled")
+    return True
+
+
+def create_chrome_driver(chrome_driver_path, lean=False, headless=False, blocked_url_patterns=None,
+                         record_network=False):
+    """Start Chrome, in lean mode (resource blocking, no animations, no images) when lean is set."""
+    options = chrome_options(lean=lean, headless=headless, record_network=record_network)
+    driver = webdriver.Chrome(service=Service(chrome_driver_path), options=options)
+    if lean and apply_lean_mode(driver, blocked_url_patterns):
+        # CDP settings only cover the tab they were sent to, so remember them for new tabs
+        driver.lean_blocked_url_patterns = blocked_url_patterns
+    return driver
+
+
+def apply_lean_mode_to_new_tab(driver) -> None:
+    """Apply the driver's lean mode to the tab it just switched to; a driver not started lean is left alone."""
+    if hasattr(driver, "lean_blocked_url_patterns"):
+        apply_lean_mode(driver, driver.lean_blocked_url_patterns)
+
+
+def network_totals(driver) -> dict:
+    """Sum transferred bytes and count finished and blocked requests from the performance log since the last call."""
+    totals = {"transferred_bytes": 0, "requests": 0, "blocked_requests": 0}
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        if message["method"] == "Network.loadingFinished":
+            totals["requests"] += 1
+            totals["transferred_bytes"] += int(message["params"].get("encodedDataLength", 0))
+        elif message["method"] == "Network.loadingFailed" and message["params"].get("blockedReason"):
+            totals["blocked_requests"] += 1
+    return totals
+
+
+def measure_page_load(driver, url, settle_timeout=10) -> dict:
+    driver.get_log("performance")  # drop events from earlier pages
+    start = time.perf_counter()
+    driver.get(url)
+    wait_for_network_idle(driver, quiet=0.5, timeout=settle_timeout)
+    metrics = driver.execute_script(PAGE_LOAD_METRICS_JS)
+    metrics["wall_seconds"] = time.perf_counter() - start
+    metrics.update(network_totals(driver))
+    return metrics
+
+
+def benchmark_lean_mode(chrome_driver_path, urls, repeat=3, headless=True, setup=None) -> dict:
+    """Load each url repeat times with and without lean mode; returns {mode: {url: averaged metrics}}.
+
+    setup(driver), e.g. a cached login, runs once per browser before measuring.
+    """
+    results = {}
+    for mode, lean in (("default", False), ("lean", True)):
+        driver = create_chrome_driver(chrome_driver_path, lean=lean, headless=headless, record_network=True)
+        try:
+            if setup is not None:
+                setup(driver)
+            results[mode] = {}
+            for url in urls:
+                runs = [measure_page_load(driver, url) for _ in range(repeat)]
+                results[mode][url] = {
+                    key: sum(run[key] or 0 for run in runs) / len(runs)
+                    for key in ("wall_seconds", "loadMs", "domContentLoadedMs", "transferred_bytes",
+                                "requests", "blocked_requests")
+                }
+        finally:
+            driver.quit()
+    return results
+
+
+def print_benchmark(results) -> None:
+    print(f"{'mode':<10}{'url':<60}{'wall s':>9}{'load ms':>10}{'KB':>10}{'requests':>10}{'blocked':>9}")
+    for mode, pages in results.items():
+        for url, metrics in pages.items():
+            print(f"{mode:<10}{url[:58]:<60}{metrics['wall_seconds']:>9.2f}{metrics['loadMs']:>10.0f}"
+                  f"{metrics['transferred_bytes'] / 1024:>10.0f}{metrics['requests']:>10.0f}"
+                  f"{metrics['blocked_requests']:>9.0f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare page loads with and without lean mode")
+    parser.add_argument("urls", nargs="+", help="pages to load, e.g. a stand-in server's skills page")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--headed", action="store_true", help="show the browser instead of running headless")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    benchmark_results = benchmark_lean_mode(os.getenv("CHROME_DRIVER_PATH"), args.urls, args.repeat,
+                                            headless=not args.headed)
+    print_benchmark(benchmark_results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(benchmark_results, file, indent=2)
@@ -1,23 +1,201 @@
+import atexit
+import csv
+import io
 import os
+import struct
+import sys
+import tempfile
+import threading
+import time
+
+LOG_FORMATS = ("text", "csv", "binary")
+BINARY_MAGIC = b"CLKLOG1\n"
+# little-endian float64 timestamp followed by the uint32 length of the utf-8 XPath
+BINARY_RECORD_HEADER = struct.Struct("<dI")
+
 
 class ClickLogger:
-    """Class to log the user's click stream by storing the XPath of the clicked elements in a file."""
+    """Class to log the user's click stream by storing the XPath of the clicked elements in a file.
+
+    By default every click opens, appends to and closes the log file. With buffered=True
+    clicks are kept in memory and written in batches when buffer_size clicks are pending,
+    flush_interval seconds after the oldest pending click (by a timer thread) or when the
+    process exits. max_bytes rotates the log file to .1, .2, ... keeping backup_count old
+    files. log_format "csv" and "binary" add a timestamp to every click. Logging a click
+    after close() raises ValueError.
+    """
 
-    def __init__(self, log_file_path: str):
+    def __init__(self, log_file_path: str, buffered: bool = False, buffer_size: int = 1000,
+                 flush_interval: float = 1.0, max_bytes: int = None, backup_count: int = 3,
+                 log_format: str = "text"):
         """Initialize the ClickLogger with the log file path."""
         self.log_file_path = log_file_path
         assert self.log_file_path, "Log file path should not be empty"
+        assert log_format in LOG_FORMATS, f"Log format should be one of {LOG_FORMATS}"
+        self.buffered = buffered
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.log_format = log_format
+        self.buffer = []
+        self.lock = threading.RLock()
+        self.flush_timer = None
+        self.closed = False
         self.log_file = None
         self.initialize_log_file()
+        if self.buffered:
+            atexit.register(self.close)
+
+    def header(self) -> bytes:
+        if self.log_format == "binary":
+            return BINARY_MAGIC
+        if self.log_format == "csv":
+            return b"timestamp,XPath\n"
+        return b"XPath\n"
+
+    def encode(self, records) -> bytes:
+        if self.log_format == "binary":
+            parts = []
+            for timestamp, xpath in records:
+                data = xpath.encode("utf-8")
+                parts.append(BINARY_RECORD_HEADER.pack(timestamp, len(data)))
+                parts.append(data)
+            return b"".join(parts)
+        if self.log_format == "csv":
+            output = io.StringIO()
+            csv.writer(output, lineterminator="\n").writerows((f"{timestamp:.6f}", xpath) for timestamp, xpath in records)
+            return output.getvalue().encode("utf-8")
+        return "".join(xpath + "\n" for _, xpath in records).encode("utf-8")
 
     def initialize_log_file(self):
         """Initialize the log file if it doesn't exist."""
+        if self.buffered:
+            # keep one handle open for the lifetime of the logger
+            self.log_file = open(self.log_file_path, "ab")
+            if self.log_file.tell() == 0:
+                self.log_file.write(self.header())
+            return
         if not os.path.exists(self.log_file_path):
-            with open(self.log_file_path, 'w') as f:
-                f.write("XPath\n")
+            with open(self.log_file_path, 'wb') as f:
+                f.write(self.header())
 
     def log_click(self, xpath: str):
         """Log the user's click stream by writing the XPath of the clicked element to the log file."""
         assert xpath, "XPath should not be empty"
-        with open(self.log_file_path, 'a') as f:
-            f.write(xpath + '\n')
+        with self.lock:
+            if self.closed:
+                raise ValueError(f"ClickLogger for {self.log_file_path} is closed")
+            if not self.buffered:
+                self.write([(time.time(), xpath)])
+                return
+            self.buffer.append((time.time(), xpath))
+            if len(self.buffer) >= self.buffer_size:
+                self.flush()
+            elif self.flush_timer is None:
+                self.flush_timer = threading.Timer(self.flush_interval, self.flush)
+                self.flush_timer.daemon = True
+                self.flush_timer.start()
+
+    def write(self, records):
+        data = self.encode(records)
+        if self.max_bytes and self.current_size() + len(data) > self.max_bytes:
+            self.rotate()
+        if self.buffered:
+            self.log_file.write(data)
+            self.log_file.flush()
+        else:
+            with open(self.log_file_path, 'ab') as f:
+                f.write(data)
+
+    def current_size(self) -> int:
+        if self.log_file is not None:
+            return self.log_file.tell()
+        return os.path.getsize(self.log_file_path) if os.path.exists(self.log_file_path) else 0
+
+    def rotate(self):
+        """Move the log file to .1 (shifting older backups up) and start a new one."""
+        if self.log_file is not None:
+            self.log_file.close()
+        for index in range(self.backup_count - 1, 0, -1):
+            source = f"{self.log_file_path}.{index}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.log_file_path}.{index + 1}")
+        if self.backup_count > 0:
+            os.replace(self.log_file_path, f"{self.log_file_path}.1")
+        else:
+            os.remove(self.log_file_path)
+        self.initialize_log_file()
+
+    def flush(self):
+        """Write all buffered clicks to the log file."""
+        with self.lock:
+            if self.flush_timer is not None:
+                self.flush_timer.cancel()
+                self.flush_timer = None
+            if not self.buffer or self.log_file is None:
+                return
+            records, self.buffer = self.buffer, []
+            self.write(records)
+
+    def close(self):
+        """Flush buffered clicks and close the log file."""
+        with self.lock:
+            self.flush()
+            self.closed = True
+            if self.log_file is not None:
+                self.log_file.close()
+                self.log_file = None
+        if self.buffered:
+            atexit.unregister(self.close)
+
+
+def read_click_log(log_file_path: str) -> list:
+    """Return the (timestamp, xpath) records of a csv or binary click log; text logs have no timestamps."""
+    with open(log_file_path, 'rb') as f:
+        data = f.read()
+    if data.startswith(BINARY_MAGIC):
+        records = []
+        offset = len(BINARY_MAGIC)
+        while offset + BINARY_RECORD_HEADER.size <= len(data):
+            timestamp, length = BINARY_RECORD_HEADER.unpack_from(data, offset)
+            offset += BINARY_RECORD_HEADER.size
+            records.append((timestamp, data[offset:offset + length].decode("utf-8")))
+            offset += length
+        return records
+    lines = data.decode("utf-8").splitlines()
+    if lines and lines[0] == "timestamp,XPath":
+        return [(float(timestamp), xpath) for timestamp, xpath in csv.reader(lines[1:])]
+    return [(None, xpath) for xpath in lines[1:]]
+
+
+def benchmark_click_logger(clicks: int = 20000) -> dict:
+    """Compare clicks/second of the per-click open/close logger with the buffered modes."""
+    xpath = 'id("profilePagedListComponent-ALL-SKILLS-NONE-en-US-0")/DIV[1]/DIV[1]/DIV[2]/DIV[1]/A[1]/DIV[1]/SPAN[1]'
+    configurations = {
+        "per_click_text": {},
+        "buffered_text": {"buffered": True},
+        "buffered_csv": {"buffered": True, "log_format": "csv"},
+        "buffered_binary": {"buffered": True, "log_format": "binary"},
+    }
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for name, options in configurations.items():
+            log_file_path = os.path.join(directory, f"{name}.log")
+            start = time.perf_counter()
+            click_logger = ClickLogger(log_file_path, **options)
+            for _ in range(clicks):
+                click_logger.log_click(xpath)
+            click_logger.close()
+            elapsed = time.perf_counter() - start
+            results[name] = {
+                "clicks_per_second": clicks / elapsed,
+                "bytes": os.path.getsize(log_file_path),
+            }
+    return results
+
+
+if __name__ == "__main__":
+    click_count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    for name, result in benchmark_click_logger(click_count).items():
+        print(f"{name:>16}: {result['clicks_per_second']:>12,.0f} clicks/s {result['bytes']:>10,} bytes")
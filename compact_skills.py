@@ -0,0 +1,215 @@
+import argparse
+import json
+import mmap
+import os
+import re
+import struct
+import logging
+
+logger = logging.getLogger(__name__)
+
+COMPACT_SKILLS_MAGIC = b"LSKR"
+COMPACT_SKILLS_VERSION = 1
+COMPACT_SKILLS_SUFFIX = ".skr"
+# a prefix id of NO_VALUE marks a field the record does not have, NULL_VALUE one set to None
+NO_VALUE = 0xFFFFFFFF
+NULL_VALUE = 0xFFFFFFFE
+
+# magic, version, field count, record count, string count
+HEADER = struct.Struct("<4sHHII")
+OFFSET = struct.Struct("<I")
+
+# the trailing index of an id("...-<n>") anchor; splitting it off lets every
+# record of a profile share one interned prefix and suffix
+INDEX_BEFORE_QUOTE_PATTERN = re.compile(r"(?<![0-9])([0-9]{1,9})(?=\")")
+
+
+def split_value(value):
+    """Return (prefix, number, suffix) with prefix + str(number) + suffix == value; number is None when not split."""
+    match = INDEX_BEFORE_QUOTE_PATTERN.search(value)
+    if match is None or str(int(match.group(1))) != match.group(1):
+        return value, None, ""
+    return value[:match.start()], int(match.group(1)), value[match.end():]
+
+
+def write_compact_skills(records, file_path) -> None:
+    """Write skill records (dicts of strings or None, e.g. linkedin_skills_detailed.json) in the compact format.
+
+    Layout: header, string offsets and utf-8 blob (field names are the first
+    strings), then one fixed width row per record holding (prefix id, number, suffix id) per field, so a
+    reader can map the file and decode any record without parsing the rest.
+    """
+    fields = []
+    for record in records:
+        for field in record:
+            if field not in fields:
+                fields.append(field)
+    strings = {}
+
+    def intern(text):
+        if text not in strings:
+            strings[text] = len(strings)
+        return strings[text]
+
+    for field in fields:
+        intern(field)
+    rows = bytearray()
+    row_format = struct.Struct("<" + "III" * len(fields))
+    for record in records:
+        values = []
+        for field in fields:
+            if field not in record:
+                values.extend((NO_VALUE, NO_VALUE, NO_VALUE))
+                continue
+            value = record[field]
+            if value is None:
+                values.extend((NULL_VALUE, NO_VALUE, NO_VALUE))
+                continue
+            if not isinstance(value, str):
+                raise ValueError(f"Only string values can be stored, {field} is {type(value).__name__}")
+            prefix, number, suffix = split_value(value)
+            values.extend((intern(prefix), NO_VALUE if number is None else number, intern(suffix)))
+        rows += row_format.pack(*values)
+
+    blob = bytearray()
+    offsets = bytearray()
+    for text in strings:
+        offsets += OFFSET.pack(len(blob))
+        blob += text.encode("utf-8")
+    offsets += OFFSET.pack(len(blob))
+
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "wb") as file:
+        file.write(HEADER.pack(COMPACT_SKILLS_MAGIC, COMPACT_SKILLS_VERSION, len(fields), len(records), len(strings)))
+        file.write(offsets)
+        file.write(blob)
+        file.write(rows)
+    os.replace(temp_path, file_path)
+    logger.info(f"Wrote {len(records)} skill records with {len(strings)} interned strings to {file_path}")
+
+
+class CompactSkills:
+    """Read-only, memory-mapped view of a compact skills file.
+
+    Records are decoded only when accessed. The name index is built from the
+    name column on the first lookup by name, after which get(name) and
+    `name in skills` are O(1).
+    """
+
+    def __init__(self, file_path, name_field="name"):
+        self.file_path = file_path
+        self.name_field = name_field
+        self.file = open(file_path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, field_count, self.record_count, self.string_count = HEADER.unpack_from(self.data, 0)
+        if magic != COMPACT_SKILLS_MAGIC or version != COMPACT_SKILLS_VERSION:
+            self.close()
+            raise ValueError(f"{file_path} is not a version {COMPACT_SKILLS_VERSION} compact skills file")
+        self.offsets_start = HEADER.size
+        self.blob_start = self.offsets_start + (self.string_count + 1) * OFFSET.size
+        blob_size = OFFSET.unpack_from(self.data, self.offsets_start + self.string_count * OFFSET.size)[0]
+        self.rows_start = self.blob_start + blob_size
+        self.row_format = struct.Struct("<" + "III" * field_count)
+        self.strings = {}
+        self.fields = [self.string(index) for index in range(field_count)]
+        self.name_index = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.record_count
+
+    def __iter__(self):
+        for index in range(self.record_count):
+            yield self[index]
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.record_count:
+            raise IndexError(index)
+        values = self.row(index)
+        record = {}
+        for position, field in enumerate(self.fields):
+            # fields the record did not have stay absent, explicit nulls come back as None
+            if values[position * 3] != NO_VALUE:
+                record[field] = self.value(values, position)
+        return record
+
+    def __contains__(self, name):
+        return name in self.index()
+
+    def row(self, index) -> tuple:
+        return self.row_format.unpack_from(self.data, self.rows_start + index * self.row_format.size)
+
+    def value(self, values, position):
+        prefix_id, number, suffix_id = values[position * 3:position * 3 + 3]
+        if prefix_id in (NO_VALUE, NULL_VALUE):
+            return None
+        number_text = "" if number == NO_VALUE else str(number)
+        return self.string(prefix_id) + number_text + self.string(suffix_id)
+
+    def string(self, string_id) -> str:
+        text = self.strings.get(string_id)
+        if text is None:
+            start, end = struct.unpack_from("<II", self.data, self.offsets_start + string_id * OFFSET.size)
+            text = self.strings[string_id] = self.data[self.blob_start + start:self.blob_start + end].decode("utf-8")
+        return text
+
+    def index(self) -> dict:
+        """Return {name: record index}, built on first use; the first record wins for duplicate names."""
+        if self.name_index is None:
+            self.name_index = {}
+            if self.name_field in self.fields:
+                position = self.fields.index(self.name_field)
+                for index in range(self.record_count):
+                    name = self.value(self.row(index), position)
+                    if name is not None:
+                        self.name_index.setdefault(name, index)
+        return self.name_index
+
+    def get(self, name, default=None):
+        index = self.index().get(name)
+        return default if index is None else self[index]
+
+    def names(self) -> list:
+        return list(self.index())
+
+    def to_records(self) -> list:
+        return list(self)
+
+    def close(self) -> None:
+        self.data.close()
+        self.file.close()
+
+
+def convert_json_to_compact(json_path, compact_path) -> None:
+    with open(json_path, "r") as file:
+        records = json.load(file)
+    write_compact_skills(records, compact_path)
+
+
+def convert_compact_to_json(compact_path, json_path, indent=2) -> None:
+    with CompactSkills(compact_path) as skills:
+        records = skills.to_records()
+    with open(json_path, "w") as file:
+        json.dump(records, file, indent=indent)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert skill records between JSON and the compact format")
+    parser.add_argument("source", help="a .json file to compact, or a .skr file to expand")
+    parser.add_argument("target", nargs="?", help="output file (default: source with the other suffix)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    base, suffix = os.path.splitext(args.source)
+    if suffix == COMPACT_SKILLS_SUFFIX:
+        target = args.target or f"{base}.json"
+        convert_compact_to_json(args.source, target)
+    else:
+        target = args.target or f"{base}{COMPACT_SKILLS_SUFFIX}"
+        convert_json_to_compact(args.source, target)
+    print(f"{args.source}: {os.path.getsize(args.source):,} bytes -> {target}: {os.path.getsize(target):,} bytes")
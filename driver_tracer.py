@@ -0,0 +1,211 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+import logging
+
+logger = logging.getLogger(__name__)
+
+TRACE_FILE_ENV = "TRACE_FILE"
+
+# driver and element methods that make a WebDriver round trip
+TRACED_DRIVER_COMMANDS = frozenset([
+    "get", "find_element", "find_elements", "execute_script", "execute_async_script",
+    "get_cookies", "add_cookie", "save_screenshot", "set_script_timeout", "quit",
+])
+TRACED_ELEMENT_COMMANDS = frozenset([
+    "find_element", "find_elements", "get_attribute", "get_property", "click", "send_keys",
+    "is_displayed", "is_enabled", "is_selected",
+])
+TRACED_PROPERTIES = frozenset(["page_source", "current_url", "text", "tag_name"])
+
+
+class Tracer:
+    """Records WebDriver commands and the scraper spans that contain them.
+
+    Events use the Chrome trace-event format (complete "X" events in microseconds),
+    so write_chrome_trace() output loads in chrome://tracing or Perfetto.
+    """
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.events = []
+        self.lock = threading.Lock()
+        self.local = threading.local()
+
+    def stack(self) -> list:
+        if not hasattr(self.local, "stack"):
+            self.local.stack = []
+        return self.local.stack
+
+    def now_us(self) -> float:
+        return (time.perf_counter() - self.origin) * 1e6
+
+    def add_event(self, name, category, start_us, args=None):
+        event = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": start_us,
+            "dur": self.now_us() - start_us,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "stack": list(self.stack()),
+        }
+        if args:
+            event["args"] = args
+        with self.lock:
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name, **args):
+        start_us = self.now_us()
+        stack = self.stack()
+        try:
+            stack.append(name)
+            yield
+        finally:
+            stack.pop()
+            self.add_event(name, "span", start_us, args)
+
+    def command(self, name, func, *args, **kwargs):
+        start_us = self.now_us()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.add_event(name, "webdriver", start_us)
+
+    def command_events(self) -> list:
+        with self.lock:
+            return [event for event in self.events if event["cat"] == "webdriver"]
+
+    def summary(self, top=15) -> list:
+        """Return (command, calls, total seconds, mean ms) sorted by total time."""
+        totals = {}
+        for event in self.command_events():
+            calls, total = totals.get(event["name"], (0, 0.0))
+            totals[event["name"]] = (calls + 1, total + event["dur"])
+        rows = [
+            (name, calls, total / 1e6, total / calls / 1e3)
+            for name, (calls, total) in totals.items()
+        ]
+        rows.sort(key=lambda row: row[2], reverse=True)
+        return rows[:top]
+
+    def print_summary(self, top=15) -> None:
+        print(f"{'command':<28}{'calls':>8}{'total s':>10}{'mean ms':>10}")
+        for name, calls, total, mean in self.summary(top):
+            print(f"{name:<28}{calls:>8}{total:>10.3f}{mean:>10.2f}")
+
+    def write_chrome_trace(self, file_path) -> None:
+        with self.lock:
+            events = [{key: value for key, value in event.items() if key != "stack"} for event in self.events]
+        with open(file_path, "w") as file:
+            json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, file)
+        logger.info(f"Wrote {len(events)} trace events to {file_path}")
+
+    def write_folded_stacks(self, file_path) -> None:
+        """Write span;...;command <microseconds> lines for flamegraph.pl or speedscope."""
+        folded = {}
+        for event in self.command_events():
+            key = ";".join(event["stack"] + [event["name"]])
+            folded[key] = folded.get(key, 0) + event["dur"]
+        with open(file_path, "w") as file:
+            for key, duration in sorted(folded.items()):
+                file.write(f"{key} {int(duration)}\n")
+
+
+def unwrap(value):
+    if isinstance(value, TracingElement):
+        return value.element
+    if isinstance(value, (list, tuple)):
+        return type(value)(unwrap(item) for item in value)
+    return value
+
+
+class TracingElement:
+    """WebElement proxy that records its commands in the driver's tracer."""
+
+    def __init__(self, element, tracer):
+        self.element = element
+        self.tracer = tracer
+
+    def __eq__(self, other):
+        return self.element == unwrap(other)
+
+    def __hash__(self):
+        return hash(self.element)
+
+    def __getattr__(self, name):
+        if name in TRACED_PROPERTIES:
+            return self.tracer.command(name, getattr, self.element, name)
+        attribute = getattr(self.element, name)
+        if name not in TRACED_ELEMENT_COMMANDS:
+            return attribute
+
+        @functools.wraps(attribute)
+        def traced_command(*args, **kwargs):
+            result = self.tracer.command(name, attribute, *unwrap(args), **kwargs)
+            return wrap(result, self.tracer)
+        return traced_command
+
+
+def wrap(result, tracer):
+    if isinstance(result, list):
+        return [wrap(item, tracer) for item in result]
+    if hasattr(result, "find_element") and not isinstance(result, (TracingDriver, TracingElement)):
+        return TracingElement(result, tracer)
+    return result
+
+
+class TracingDriver:
+    """WebDriver proxy that records every command with its latency."""
+
+    def __init__(self, driver, tracer=None):
+        self.driver = driver
+        self.tracer = tracer or Tracer()
+
+    def __getattr__(self, name):
+        if name in TRACED_PROPERTIES:
+            return self.tracer.command(name, getattr, self.driver, name)
+        attribute = getattr(self.driver, name)
+        if name not in TRACED_DRIVER_COMMANDS:
+            return attribute
+
+        @functools.wraps(attribute)
+        def traced_command(*args, **kwargs):
+            result = self.tracer.command(name, attribute, *unwrap(args), **kwargs)
+            return wrap(result, self.tracer)
+        return traced_command
+
+
+def trace_span(driver, name, **args):
+    """Return a span context for driver's tracer, or a no-op when the driver is not traced."""
+    tracer = getattr(driver, "tracer", None)
+    if not isinstance(tracer, Tracer):
+        return nullcontext()
+    return tracer.span(name, **args)
+
+
+def traced(name, record=()):
+    """Decorator for scraper functions taking the driver first; runs them inside a span.
+
+    Only the arguments named in record are stored in the span, so credentials
+    and other arguments never reach the trace file.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(driver, *args, **kwargs):
+            span_args = {}
+            if record:
+                bound = signature.bind_partial(driver, *args, **kwargs).arguments
+                span_args = {arg: str(bound[arg]) for arg in record if arg in bound}
+            with trace_span(driver, name, **span_args):
+                return func(driver, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,108 @@
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from skill_harvester import ALL_SKILLS_CONTAINER_SELECTOR
+import logging
+
+logger = logging.getLogger(__name__)
+
+STALE_RETRIES = 2
+
+
+def css_string(value) -> str:
+    return '"' + value.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def skill_container_locators(skill_name=None, container_id=None, selector=ALL_SKILLS_CONTAINER_SELECTOR) -> list:
+    """Locators for a skill's ALL-SKILLS container: by its id, then by its 'Edit <skill>' aria-label."""
+    locators = []
+    if container_id:
+        locators.append((By.ID, container_id))
+    if skill_name:
+        aria_label = css_string(f"Edit {skill_name}")
+        locators.append((By.CSS_SELECTOR, f"{selector}:has(svg[aria-label={aria_label}])"))
+    return locators
+
+
+class ElementHandle:
+    """WebElement stand-in that remembers how it was located and re-resolves itself when it goes stale.
+
+    locators are (by, value) pairs tried in order; index picks among the
+    matches, for handles that came from find_elements. A handle found inside
+    another handle searches its parent, which recovers first if it is stale
+    too. Every method and property of the element is available; a
+    StaleElementReferenceException re-resolves the element and repeats the
+    call, up to max_retries times, so a re-render costs one lookup.
+    """
+
+    def __init__(self, driver, locators, element=None, parent=None, index=0, max_retries=STALE_RETRIES,
+                 description=None):
+        self.driver = driver
+        self.locators = list(locators)
+        self.current = element
+        self.parent = parent
+        self.index = index
+        self.max_retries = max_retries
+        self.description = description or " or ".join(f"{by}={value}" for by, value in self.locators)
+        self.recoveries = 0
+
+    def __repr__(self):
+        return f"ElementHandle({self.description})"
+
+    def resolve(self):
+        """Look the element up again, trying each locator in turn."""
+        for by, value in self.locators:
+            if self.parent is None:
+                elements = self.driver.find_elements(by, value)
+            else:
+                elements = self.parent.call(lambda element: element.find_elements(by, value))
+            if len(elements) > self.index:
+                self.current = elements[self.index]
+                return self.current
+        raise NoSuchElementException(f"{self.description} is no longer on the page")
+
+    @property
+    def element(self):
+        if self.current is None:
+            self.resolve()
+        return self.current
+
+    def call(self, action):
+        """Return action(element), re-resolving and retrying when the element is stale."""
+        for attempt in range(self.max_retries + 1):
+            try:
+                return action(self.element)
+            except StaleElementReferenceException:
+                if attempt == self.max_retries:
+                    raise
+                self.recoveries += 1
+                self.current = None
+                logger.info("%s went stale, re-resolving (%d/%d)", self.description, attempt + 1, self.max_retries)
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        value = self.call(lambda element: getattr(element, name))
+        if not callable(value):
+            return value
+
+        def call_method(*args, **kwargs):
+            return self.call(lambda element: getattr(element, name)(*args, **kwargs))
+        return call_method
+
+    def find_element(self, by=By.ID, value=None):
+        handle = ElementHandle(self.driver, [(by, value)], parent=self, max_retries=self.max_retries,
+                               description=f"{value} in {self.description}")
+        handle.resolve()
+        return handle
+
+    def find_elements(self, by=By.ID, value=None) -> list:
+        elements = self.call(lambda element: element.find_elements(by, value))
+        return [
+            ElementHandle(self.driver, [(by, value)], element=element, parent=self, index=index,
+                          max_retries=self.max_retries, description=f"{value}[{index}] in {self.description}")
+            for index, element in enumerate(elements)
+        ]
+
+    def execute_script(self, script, *args):
+        """Run script with the element as arguments[0], followed by args."""
+        return self.call(lambda element: self.driver.execute_script(script, element, *args))
@@ -1,3 +1,4 @@
+import os
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException, WebDriverException
 from selenium.webdriver.support.ui import WebDriverWait
@@ -8,65 +9,104 @@ from selenium.common.exceptions import ElementNotInteractableException
 import logging
 logger = logging.getLogger(__name__)
 
+PAGE_HELPERS_JS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pageHelpers.js")
+with open(PAGE_HELPERS_JS_PATH, "r") as _file:
+    PAGE_HELPERS_JS = _file.read()
+
+# calls an installed helper by name; reports when this document has none yet
+PAGE_HELPER_CALL_JS = """
+var helpers = window.__scraperHelpers;
+if (!helpers) {
+    return {installed: false};
+}
+return {installed: true, value: helpers[arguments[0]].apply(null, arguments[1])};
+"""
+
+def call_page_helper(driver, name, *args):
+    """Call a pageHelpers.js function in the current document.
+
+    The library is sent only when the document does not have it yet (first
+    call after a navigation); every other call sends just the short call script.
+    """
+    response = driver.execute_script(PAGE_HELPER_CALL_JS, name, list(args))
+    if not response["installed"]:
+        response = driver.execute_script(PAGE_HELPERS_JS + PAGE_HELPER_CALL_JS, name, list(args))
+    return response["value"]
+
 def get_element_info(driver, element):
     try:
-        element_info = driver.execute_script("""
-            var el = arguments[0];
-            var rect = el.getBoundingClientRect();
-            return {
-                tagName: el.tagName,
-                id: el.id,
-                className: el.className,
-                textContent: el.textContent.trim().substring(0, 50),
-                isDisplayed: el.offsetParent !== null,
-                location: {
-                    x: rect.left,
-                    y: rect.top
-                },
-                size: {
-                    width: rect.width,
-                    height: rect.height
-                }
-            };
-        """, element)
-        return element_info
+        return call_page_helper(driver, "info", element)
     except WebDriverException as e:
         return f"Error getting element info: {str(e)}"
 
-def get_element_attributes(driver, element):
+def get_element_attributes(driver, element, names=None):
     try:
-        attributes = driver.execute_script("""
-            var items = {};
-            for (index = 0; index < arguments[0].attributes.length; ++index) {
-                items[arguments[0].attributes[index].name] = arguments[0].attributes[index].value
-            };
-            return items;
-        """, element)
-        return attributes
+        return call_page_helper(driver, "attributes", element, names)
     except WebDriverException as e:
         return f"Error getting element attributes: {str(e)}"
 
-def get_element_properties(driver, element, only_own_properties=False):
+def get_element_properties(driver, element, only_own_properties=False, fields=None,
+                           max_properties=None, max_value_length=None):
+    """Return the element's DOM properties as strings.
+
+    fields reads only those properties instead of every enumerable one;
+    max_properties and max_value_length cap the result, which then has
+    "__truncated__" set.
+    """
     try:
-        properties = driver.execute_script("""
-            var items = {};
-            var obj = arguments[0];
-            var onlyOwn = arguments[1];
-            for (var prop in obj) {
-                if (!onlyOwn || obj.hasOwnProperty(prop)) {
-                    try {
-                        items[prop] = obj[prop] !== null ? obj[prop].toString() : 'null';
-                    } catch (e) {
-                        items[prop] = "Cannot convert to string";
-                    }
-                }
-            }
-            return items;
-        """, element, only_own_properties)
-        return properties
+        return call_page_helper(driver, "properties", element, only_own_properties, fields,
+                                max_properties, max_value_length)
     except WebDriverException as e:
         return f"Error getting element properties: {str(e)}"
 
+def get_elements_info(driver, elements):
+    """get_element_info for every element in one round trip; a failed element gets {"error": message}."""
+    try:
+        return call_page_helper(driver, "batch", "info", list(elements))
+    except WebDriverException as e:
+        return f"Error getting elements info: {str(e)}"
+
+def get_elements_attributes(driver, elements, names=None):
+    """get_element_attributes for every element in one round trip, optionally only the attributes in names."""
+    try:
+        return call_page_helper(driver, "batch", "attributes", list(elements), names)
+    except WebDriverException as e:
+        return f"Error getting elements attributes: {str(e)}"
+
+def get_elements_properties(driver, elements, only_own_properties=False, fields=None,
+                            max_properties=200, max_value_length=200):
+    """get_element_properties for every element in one round trip.
+
+    Capped by default: a full dump is thousands of properties per element.
+    """
+    try:
+        return call_page_helper(driver, "batch", "properties", list(elements), only_own_properties, fields,
+                                max_properties, max_value_length)
+    except WebDriverException as e:
+        return f"Error getting elements properties: {str(e)}"
+
+def get_absolute_xpath(driver, element):
+    """Return the element's /html[1]/body[1]/... path, memoized in the page."""
+    try:
+        return call_page_helper(driver, "absoluteXPath", element)
+    except WebDriverException as e:
+        return f"Error getting element xpath: {str(e)}"
+
+def get_id_xpath(driver, element):
+    """Return the element's path from its nearest ancestor with an id, e.g. id("x")/DIV[1]."""
+    try:
+        return call_page_helper(driver, "idXPath", element)
+    except WebDriverException as e:
+        return f"Error getting element xpath: {str(e)}"
+
+def find_element_by_cached_xpath(driver, xpath):
+    """Return the element at xpath, or None; repeated lookups of the same xpath are answered from the page's cache."""
+    try:
+        return call_page_helper(driver, "findByXPath", xpath)
+    except WebDriverException as e:
+        logger.error(f"Error finding element by xpath '{xpath}': {str(e)}")
+        return None
+
 def find_element_by_unique_xpath(driver, xpath, timeout=10):
     try:
         element = WebDriverWait(driver, timeout).until(
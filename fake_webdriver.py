@@ -0,0 +1,550 @@
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor
+import urllib.error
+import urllib.request
+from bs4 import BeautifulSoup
+from selenium.webdriver.common.by import By
+from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchWindowException
+from selenium.common.exceptions import StaleElementReferenceException
+from selenium.common.exceptions import WebDriverException
+from skill_harvester import ALL_SKILLS_CONTAINER_SELECTOR, HARVEST_SKILL_CONTAINERS_JS
+from multi_tab import TAB_NAVIGATE_JS, TAB_PROBE_JS
+from scroll_planner import SKILL_SCROLL_MAP_JS, SCROLL_INTO_VIEW_JS
+from pagination import LOAD_MORE_JS
+from page_capture import CAPTURE_START_JS, CAPTURE_CHUNK_JS, CAPTURE_END_JS
+from wait_utils import WAIT_FOR_DOM_JS
+import logging
+
+logger = logging.getLogger(__name__)
+
+# height reported for document.body.scrollHeight, the fake page never grows
+FAKE_SCROLL_HEIGHT = 1000
+FAKE_VIEWPORT_HEIGHT = 800
+SKILL_MODAL_CLASS = "pe-edit-form-page__modal"
+# attributes that belong to one window or tab
+WINDOW_STATE = ("current_url", "source", "soup", "select_cache", "modal", "pending_navigation", "hidden_containers")
+
+XPATH_STEP_PATTERN = re.compile(r'^(\.?//|\./)([\w*-]+)(?:\[(.*)\])?$')
+XPATH_CLAUSE_PATTERNS = [
+    (re.compile(r"^@([\w-]+)\s*=\s*'([^']*)'$"), lambda m: (f'[{m.group(1)}="{m.group(2)}"]', None)),
+    (re.compile(r"^@([\w-]+)$"), lambda m: (f'[{m.group(1)}]', None)),
+    (re.compile(r"^contains\(@([\w-]+),\s*'([^']*)'\)$"), lambda m: (f'[{m.group(1)}*="{m.group(2)}"]', None)),
+    (re.compile(r"^starts-with\(@([\w-]+),\s*'([^']*)'\)$"), lambda m: (f'[{m.group(1)}^="{m.group(2)}"]', None)),
+    (re.compile(r"^text\(\)\s*=\s*'([^']*)'$"), lambda m: ('', lambda text: text == m.group(1))),
+    (re.compile(r"^contains\(text\(\),\s*'([^']*)'\)$"), lambda m: ('', lambda text: m.group(1) in text)),
+]
+
+
+def xpath_to_css(xpath):
+    """Translate the single-step XPaths the scraper uses into a css selector and optional text filter."""
+    match = XPATH_STEP_PATTERN.match(xpath.strip())
+    if match is None:
+        raise WebDriverException(f"FakeWebDriver does not support XPath: {xpath}")
+    axis, tag, predicate = match.groups()
+    css = "" if tag == "*" else tag
+    text_filters = []
+    if predicate:
+        for clause in re.split(r'\s+and\s+', predicate):
+            for pattern, translate in XPATH_CLAUSE_PATTERNS:
+                clause_match = pattern.match(clause.strip())
+                if clause_match:
+                    clause_css, text_filter = translate(clause_match)
+                    css += clause_css
+                    if text_filter:
+                        text_filters.append(text_filter)
+                    break
+            else:
+                raise WebDriverException(f"FakeWebDriver does not support XPath predicate: {clause}")
+    css = css or "*"
+    if axis == "./":
+        css = f":scope > {css}"
+    return css, text_filters
+
+
+def own_text(tag):
+    return "".join(tag.find_all(string=True, recursive=False)).strip()
+
+
+def select(root, by, value) -> list:
+    """Find bs4 tags under root for a selenium (by, value) locator."""
+    if by == By.ID:
+        return root.select(f'[id="{value}"]')
+    if by == By.CLASS_NAME:
+        return root.select(f'.{value}')
+    if by == By.TAG_NAME:
+        return root.find_all(value)
+    if by == By.CSS_SELECTOR:
+        return root.select(value)
+    if by == By.XPATH:
+        css, text_filters = xpath_to_css(value)
+        tags = root.select(css)
+        for text_filter in text_filters:
+            tags = [tag for tag in tags if text_filter(own_text(tag))]
+        return tags
+    raise WebDriverException(f"FakeWebDriver does not support locator strategy: {by}")
+
+
+class FakeWebElement:
+    """WebElement stand-in backed by a BeautifulSoup tag; stale once its tag leaves the current page."""
+
+    def __init__(self, driver, tag):
+        self.parent = driver
+        self.tag = tag
+
+    def attached_tag(self):
+        root = self.tag
+        while root.parent is not None:
+            root = root.parent
+        if root is not self.parent.soup and root is not self.parent.modal:
+            raise StaleElementReferenceException("stale element reference: element is not attached to the page document")
+        return self.tag
+
+    def __eq__(self, other):
+        return isinstance(other, FakeWebElement) and self.tag is other.tag
+
+    def __hash__(self):
+        return id(self.tag)
+
+    @property
+    def tag_name(self):
+        return self.attached_tag().name
+
+    @property
+    def text(self):
+        return self.attached_tag().get_text(" ", strip=True)
+
+    def get_attribute(self, name):
+        self.parent.count_command("get_attribute")
+        self.attached_tag()
+        if name == "innerHTML":
+            return self.tag.decode_contents()
+        if name == "outerHTML":
+            return str(self.tag)
+        value = self.tag.get(name)
+        if isinstance(value, list):
+            return " ".join(value)
+        return value
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        self.parent.count_command("find_elements")
+        return [FakeWebElement(self.parent, tag) for tag in select(self.attached_tag(), by, value)]
+
+    def is_displayed(self):
+        self.attached_tag()
+        return True
+
+    def is_enabled(self):
+        return not self.attached_tag().has_attr("disabled")
+
+    def is_selected(self):
+        return self.attached_tag().has_attr("checked")
+
+    def click(self):
+        self.parent.count_command("click")
+        self.attached_tag()
+        if self.tag.get("aria-label") == "Dismiss":
+            self.parent.close_modal()
+            return
+        href = self.tag.get("href")
+        if self.tag.name == "button" and self.tag.get("type") == "submit":
+            form = self.tag.find_parent("form")
+            href = form.get("action") if form else None
+        if href and (href in self.parent.pages or self.parent.default_page is not None):
+            self.parent.get(href)
+
+    def send_keys(self, *values):
+        self.parent.count_command("send_keys")
+        self.attached_tag()
+        self.tag["value"] = "".join(str(value) for value in values)
+
+
+class FakeSwitchTo:
+    """driver.switch_to stand-in for windows and tabs."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, window_name):
+        self.driver.switch_window(window_name)
+
+    def new_window(self, type_hint=None):
+        self.driver.new_window()
+
+
+class FakeWebDriver:
+    """Minimal WebDriver stand-in that serves local HTML instead of a live browser.
+
+    pages maps a url to an html file name (or a callable returning page source).
+    Scripts are answered by python handlers registered in script_handlers, keyed
+    by the exact script text the scraper sends. With auto_open_modal the fake
+    plays the user who clicks an edit link: waiting for the skill modal inserts
+    modal_source into the page, and clicking its Dismiss button removes it.
+    With fetch_urls, a url without a page is fetched over http, e.g. from a
+    StandInServer, and the response status is kept in last_status (with the
+    seconds of a Retry-After header in last_retry_after).
+    Each window or tab keeps its own page and modal; navigations started by
+    TAB_NAVIGATE_JS load in the background like a real tab and show up on the
+    first TAB_PROBE_JS after they finish. Elements go stale like real ones once
+    their page is replaced, or after rerender().
+    With serialize_responses, string results take a json round trip like a
+    remote driver's responses, so each one is a fresh copy in memory.
+    With page_size, a skills page shows only its first page_size ALL-SKILLS
+    containers and each "Show more" (LOAD_MORE_JS) reveals the next page_size.
+    Every command is counted in command_counts.
+    """
+
+    def __init__(self, pages=None, default_page=None, modal_source=None, auto_open_modal=False, fetch_urls=False,
+                 serialize_responses=False, page_size=None):
+        self.pages = dict(pages or {})
+        self.default_page = default_page
+        self.modal_source = modal_source
+        self.auto_open_modal = auto_open_modal
+        self.fetch_urls = fetch_urls
+        self.serialize_responses = serialize_responses
+        self.page_size = page_size
+        self.hidden_containers = []
+        self.last_status = None
+        self.last_retry_after = None
+        self.current_url = "about:blank"
+        self.source = "<html><head></head><body></body></html>"
+        self.soup = BeautifulSoup(self.source, "html.parser")
+        # the loaded page is static, so its lookups are cached until the next get()
+        self.select_cache = {}
+        self.modal = None
+        self.parsed_pages = {}
+        self.command_counts = {}
+        self.cookies = []
+        self.quit_called = False
+        self.pending_navigation = None
+        self.current_window_handle = "window-1"
+        self.window_count = 1
+        self.windows = {}
+        self.navigation_pool = None
+        self.script_handlers = {
+            HARVEST_SKILL_CONTAINERS_JS: self.harvest_skill_containers,
+            TAB_NAVIGATE_JS: self.navigate_in_background,
+            TAB_PROBE_JS: self.probe_tab,
+            SKILL_SCROLL_MAP_JS: self.skill_scroll_map,
+            SCROLL_INTO_VIEW_JS: self.scroll_into_view,
+            LOAD_MORE_JS: self.load_more,
+            CAPTURE_START_JS: self.capture_start,
+            CAPTURE_CHUNK_JS: self.capture_chunk,
+            CAPTURE_END_JS: self.capture_end,
+        }
+        self.capture_buffer = None
+        self.scroll_y = 0
+        self.scroll_tops = {}
+        self.async_script_handlers = {
+            WAIT_FOR_DOM_JS: self.wait_for_dom,
+        }
+
+    def count_command(self, command):
+        self.command_counts[command] = self.command_counts.get(command, 0) + 1
+
+    def load_page(self, page):
+        if callable(page):
+            return page()
+        with open(page, "r", encoding="utf-8") as file:
+            return file.read()
+
+    def page_for(self, url):
+        page = self.pages.get(url, self.default_page)
+        if page is None and self.fetch_urls and url.startswith(("http://", "https://")):
+            page = lambda: self.fetch(url)
+        return page
+
+    def fetch(self, url) -> str:
+        # like a browser, an error status still renders the response body
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                self.last_status = response.status
+                self.last_retry_after = None
+                return response.read().decode("utf-8")
+        except urllib.error.HTTPError as e:
+            self.last_status = e.code
+            retry_after = e.headers.get("Retry-After", "")
+            # only the delay-seconds form, an HTTP date is ignored
+            self.last_retry_after = int(retry_after) if retry_after.isdigit() else None
+            return e.read().decode("utf-8")
+        except urllib.error.URLError as e:
+            raise WebDriverException(f"FakeWebDriver could not fetch {url}: {e.reason}")
+
+    def get(self, url):
+        self.count_command("get")
+        if self.quit_called:
+            raise WebDriverException("FakeWebDriver session has been quit")
+        page = self.page_for(url)
+        if page is None:
+            raise WebDriverException(f"FakeWebDriver has no page for {url}")
+        if url in self.parsed_pages:
+            self.show_page(url, *self.parsed_pages[url])
+        else:
+            self.show_page(url, self.load_page(page))
+
+    def show_page(self, url, source, soup=None):
+        self.current_url = url
+        self.source = source
+        # a paginated page changes as it loads, so it never shares a preloaded tree
+        self.soup = soup if soup is not None and self.page_size is None else BeautifulSoup(source, "html.parser")
+        self.select_cache = {}
+        self.modal = None
+        self.pending_navigation = None
+        self.hidden_containers = []
+        if self.page_size is not None:
+            for container in select(self.soup, By.CSS_SELECTOR, ALL_SKILLS_CONTAINER_SELECTOR)[self.page_size:]:
+                self.hidden_containers.append(container.extract())
+
+    @property
+    def switch_to(self):
+        return FakeSwitchTo(self)
+
+    @property
+    def window_handles(self):
+        handles = list(self.windows)
+        if self.current_window_handle is not None:
+            handles.append(self.current_window_handle)
+        return sorted(handles, key=lambda handle: int(handle.split("-")[1]))
+
+    def window_state(self):
+        return {name: getattr(self, name) for name in WINDOW_STATE}
+
+    def store_current_window(self):
+        if self.current_window_handle is not None:
+            self.windows[self.current_window_handle] = self.window_state()
+
+    def switch_window(self, handle):
+        self.count_command("switch_to_window")
+        if handle == self.current_window_handle:
+            return
+        if handle not in self.windows:
+            raise NoSuchWindowException(f"no such window: {handle}")
+        self.store_current_window()
+        for name, value in self.windows.pop(handle).items():
+            setattr(self, name, value)
+        self.current_window_handle = handle
+
+    def new_window(self):
+        self.count_command("new_window")
+        self.store_current_window()
+        self.window_count += 1
+        self.current_window_handle = f"window-{self.window_count}"
+        self.show_page("about:blank", "<html><head></head><body></body></html>")
+
+    def close(self):
+        self.count_command("close")
+        self.current_window_handle = None
+
+    def navigate_in_background(self, url):
+        if self.navigation_pool is None:
+            self.navigation_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="fake-tab")
+        page = self.page_for(url) or (lambda: "<html><head></head><body></body></html>")
+        self.pending_navigation = (url, self.navigation_pool.submit(self.load_page, page))
+
+    def probe_tab(self, modal_selector, item_selector):
+        if self.pending_navigation is not None:
+            url, future = self.pending_navigation
+            if not future.done():
+                return None
+            self.show_page(url, future.result())
+        if not self.select_document(By.CSS_SELECTOR, modal_selector):
+            return None
+        return [tag.get_text(" ", strip=True) for tag in self.select_document(By.CSS_SELECTOR, item_selector)]
+
+    def preload(self, url):
+        """Parse the page for url ahead of time so a later get() does not pay for parsing."""
+        page = self.page_for(url)
+        source = self.load_page(page)
+        self.parsed_pages[url] = (source, BeautifulSoup(source, "html.parser"))
+
+    def respond(self, value):
+        if self.serialize_responses and isinstance(value, str):
+            return json.loads(json.dumps({"value": value}))["value"]
+        return value
+
+    def current_source(self):
+        if self.modal is None:
+            return self.source
+        body_end = self.source.rfind("</body>")
+        if body_end == -1:
+            return self.source + str(self.modal)
+        return self.source[:body_end] + str(self.modal) + self.source[body_end:]
+
+    @property
+    def page_source(self):
+        self.count_command("page_source")
+        return self.respond(self.current_source())
+
+    def select_document(self, by, value) -> list:
+        """Select in the loaded page (cached) and in the open modal, which is kept as its own small tree."""
+        key = (by, value)
+        tags = self.select_cache.get(key)
+        if tags is None:
+            tags = self.select_cache[key] = select(self.soup, by, value)
+        if self.modal is not None:
+            tags = tags + select(self.modal, by, value)
+        return tags
+
+    def open_modal(self):
+        if self.modal_source is not None and self.modal is None:
+            self.modal = BeautifulSoup(self.modal_source, "html.parser")
+
+    def close_modal(self):
+        self.modal = None
+
+    def rerender(self):
+        """Rebuild the page and modal from their html, like a re-render: every element found so far goes stale."""
+        self.soup = BeautifulSoup(str(self.soup), "html.parser")
+        if self.modal is not None:
+            self.modal = BeautifulSoup(str(self.modal), "html.parser")
+        self.select_cache = {}
+        self.scroll_tops = {}
+
+    def find_element(self, by=By.ID, value=None):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"Unable to locate element: {by}={value}")
+        return elements[0]
+
+    def find_elements(self, by=By.ID, value=None):
+        self.count_command("find_elements")
+        return [FakeWebElement(self, tag) for tag in self.select_document(by, value)]
+
+    def execute_script(self, script, *args):
+        self.count_command("execute_script")
+        handler = self.script_handlers.get(script)
+        if handler is not None:
+            return self.respond(handler(*args))
+        if "scrollHeight" in script and script.strip().startswith("return"):
+            return FAKE_SCROLL_HEIGHT
+        return None
+
+    def execute_async_script(self, script, *args):
+        self.count_command("execute_async_script")
+        handler = self.async_script_handlers.get(script)
+        if handler is not None:
+            return handler(*args)
+        return None
+
+    def harvest_skill_containers(self, selector, offset=0, last_id=None):
+        containers = self.select_document(By.CSS_SELECTOR, selector)
+        if offset > len(containers) or (offset > 0 and containers[offset - 1].get("id") != last_id):
+            offset = 0
+        records = []
+        for position in range(offset, len(containers)):
+            container = containers[position]
+            svg = container.select_one("div.pvs-navigation__icon svg[aria-label]")
+            edit_link = container.select_one("a[id^='navigation-add-edit-deeplink-edit-skills']")
+            records.append({
+                "id": container.get("id"),
+                "ariaLabel": svg.get("aria-label") if svg else None,
+                "editLinkId": edit_link.get("id") if edit_link else None,
+                "editLinkHref": edit_link.get("href") if edit_link else None,
+                "summary": " | ".join(
+                    " ".join(span.get_text(" ", strip=True).split())
+                    for span in container.select('.pvs-entity__sub-components span[aria-hidden="true"]')),
+                "position": position,
+                "top": position * 100,
+            })
+        return {
+            "start": offset,
+            "total": len(containers),
+            "lastId": containers[-1].get("id") if containers else None,
+            "records": records,
+        }
+
+    def skill_scroll_map(self, selector):
+        # containers sit 100px apart, as in harvest_skill_containers
+        entries = []
+        for position, container in enumerate(self.select_document(By.CSS_SELECTOR, selector)):
+            svg = container.select_one("div.pvs-navigation__icon svg[aria-label]")
+            self.scroll_tops[id(container)] = position * 100
+            entries.append([svg.get("aria-label") if svg else None, FakeWebElement(self, container), position * 100,
+                            container.get("id")])
+        return entries
+
+    def scroll_into_view(self, element, margin):
+        top = self.scroll_tops.get(id(element.attached_tag()), 0)
+        if self.scroll_y + margin <= top <= self.scroll_y + FAKE_VIEWPORT_HEIGHT - margin:
+            return False
+        self.scroll_y = max(0, top - margin)
+        return True
+
+    def capture_start(self):
+        # the serialized page stays on the "browser" side, like window.__scraperCapture,
+        # and is indexed in UTF-16 code units as a javascript string is
+        self.capture_buffer = self.current_source().encode("utf-16-le", "surrogatepass")
+        return len(self.capture_buffer) // 2
+
+    def capture_chunk(self, offset, size):
+        length = len(self.capture_buffer) // 2
+        end = min(offset + size, length)
+        last = int.from_bytes(self.capture_buffer[2 * end - 2:2 * end], "little")
+        if end < length and 0xD800 <= last <= 0xDBFF:
+            end += -1 if end - offset > 1 else 1
+        return [self.capture_buffer[2 * offset:2 * end].decode("utf-16-le", "surrogatepass"), end]
+
+    def capture_end(self):
+        self.capture_buffer = None
+
+    def load_more(self):
+        # a static page, or one whose containers are all shown, has no "Show more" button to click
+        if not self.hidden_containers:
+            return False
+        parent = select(self.soup, By.CSS_SELECTOR, ALL_SKILLS_CONTAINER_SELECTOR)[-1].parent
+        for container in self.hidden_containers[:self.page_size]:
+            parent.append(container)
+        self.hidden_containers = self.hidden_containers[self.page_size:]
+        self.select_cache = {}
+        return True
+
+    def wait_for_dom(self, selector, mode, target, quiet_ms, timeout_ms):
+        # the fake page never changes on its own, so every condition is decided immediately
+        if mode == "present" and self.auto_open_modal and selector and SKILL_MODAL_CLASS in selector:
+            self.open_modal()
+        count = len(self.select_document(By.CSS_SELECTOR, selector)) if selector else 0
+        if mode == "present":
+            ok = count > 0
+        elif mode in ("count_above", "more_items"):
+            ok = count > target
+        elif mode == "stable":
+            ok = count > 0
+        else:
+            ok = True
+        # nothing is ever in flight, so a more_items wait that fails went idle
+        reason = "condition" if ok else ("idle" if mode == "more_items" else "timeout")
+        return {"ok": ok, "count": count, "elapsedMs": 0, "reason": reason, "inflight": 0}
+
+    def get_cookies(self):
+        self.count_command("get_cookies")
+        return [dict(cookie) for cookie in self.cookies]
+
+    def add_cookie(self, cookie_dict):
+        self.count_command("add_cookie")
+        self.cookies = [cookie for cookie in self.cookies if cookie["name"] != cookie_dict["name"]]
+        self.cookies.append(dict(cookie_dict))
+
+    def delete_all_cookies(self):
+        self.cookies = []
+
+    def set_script_timeout(self, time_to_wait):
+        pass
+
+    def implicitly_wait(self, time_to_wait):
+        pass
+
+    def save_screenshot(self, filename):
+        return True
+
+    def quit(self):
+        self.count_command("quit")
+        self.quit_called = True
+        if self.navigation_pool is not None:
+            self.navigation_pool.shutdown(wait=False)
@@ -1,28 +1,38 @@
 
-import time
 import os
-import re
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
-from selenium.common.exceptions import NoSuchElementException
 from selenium.common.exceptions import StaleElementReferenceException
-from selenium.webdriver.remote.webelement import WebElement
-from bs4 import BeautifulSoup
-from bs4.element import Tag
-import time
 import logging
+from skill_harvester import SkillContainerIndex, harvest_skill_containers
+from browser_profile import create_chrome_driver, lean_mode_from_env
+from element_handle import ElementHandle
+from driver_tracer import TracingDriver, trace_span, traced, TRACE_FILE_ENV
+from logging_setup import setup_logging
+from multi_tab import fetch_skill_modals_in_tabs
+from page_capture import capture_to_file, capture_compression_from_env
+from pagination import SkillListPaginator
+from rate_limiter import rate_limited, shared_rate_limiter
+from scroll_planner import scroll_planner_for
+from result_store import ResultStore, refreshing_skill_handler, record_removed_skills
+from snapshot_store import default_snapshot_store, profile_from_url
+from session_cache import LINKEDIN_BASE_URL, session_cache_from_env, login_with_cache
+from wait_utils import wait_stats, wait_for_element, wait_for_stable_count, wait_for_network_idle
 
-# Set up logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+SKILL_CONTAINER_SELECTOR = "li[id^='profilePagedListComponent-'][id*='-SKILLS-VIEW-DETAILS-profileTabSection-']"
+SKILL_MODAL_SELECTOR = ".pe-edit-form-page__modal"
+SELECTED_ITEM_SELECTOR = ".pe-edit-form-page__modal .selected-item"
+SKILLS_LIST_XPATH = "//div[contains(@class, 'scaffold-finite-scroll')]"
+DISMISS_BUTTON_XPATH = "//button[@aria-label='Dismiss']"
+
+@traced("login")
 def login(driver, email, pswd):
     logger.info("Attempting to log in...")
-    driver.get("https://www.linkedin.com/login")
+    driver.get(f"{LINKEDIN_BASE_URL}/login")
     
     try:
         username_field = WebDriverWait(driver, 10).until(
@@ -87,19 +97,22 @@ def login(driver, email, pswd):
         logger.error(f"Login failed: {str(e)}")
         raise
     
+@traced("go_to_skills_page", record=("username",))
 def go_to_skills_page(driver, username) -> None:
     logger.info("Navigating to skills page...")
-    driver.get(f"https://www.linkedin.com/in/{username}/details/skills/")
+    driver.get(f"{LINKEDIN_BASE_URL}/in/{username}/details/skills/")
     
     # Wait for the page to finish loading
     try:
         WebDriverWait(driver, 10).until(
-            EC.presence_of_element_located((By.XPATH, "//div[contains(@class, 'scaffold-finite-scroll')]"))
+            EC.presence_of_element_located((By.XPATH, SKILLS_LIST_XPATH))
         )
     except TimeoutException:
         logger.warning("Page load timeout. Proceeding anyway.")
     
-    time.sleep(10)  # Wait additional time for any dynamic content to load
+    # Wait until the skill list stops growing instead of a fixed 10s
+    wait_for_stable_count(driver, SKILL_CONTAINER_SELECTOR, quiet=1.0, timeout=10,
+                          label="go_to_skills_page", legacy_seconds=10)
     capture_page_source(driver, "skills_page.txt")
     logger.info(f"Current URL: {driver.current_url}")
 
@@ -112,181 +125,204 @@ def capture_screenshot(driver, filename) -> None:
 def capture_page_source(driver, filename) -> None:
     if not filename.endswith(".txt"):
         raise ValueError("Filename must end with .txt")
-    with open(filename,"w") as file:
-        file.write(driver.page_source)
-    logger.info(f"Page source saved as {filename}")
+    snapshot_store = default_snapshot_store()
+    if snapshot_store is not None:
+        # deduplicated, compressed capture indexed by profile and stage
+        snapshot_store.save(driver.page_source, profile=profile_from_url(driver.current_url), stage=filename[:-len(".txt")])
+        return
+    # streamed in chunks (optionally compressed), so a large page is never
+    # held in memory as a whole
+    capture_to_file(driver, filename, compression=capture_compression_from_env())
 
 def scroll_to_skill(driver, skill_name):
     try:
-        # Locate the skill element by its name
-        skill_element = driver.find_element_by_xpath(f"//span[text()='{skill_name}']")
-        
-        # Get the position of the skill element
-        skill_position = driver.execute_script("return arguments[0].getBoundingClientRect().top + window.scrollY;", skill_element)
-        
-        # Scroll to the skill element's position
-        driver.execute_script("window.scrollTo(0, arguments[0]);", skill_position)
-        time.sleep(1)
+        # Look the skill up in the page's name -> (container, offset) map and
+        # scroll only if it is out of view
+        skill_element, moved = scroll_planner_for(driver).scroll_to(skill_name)
+        if skill_element is None:
+            logger.warning("%s is not on the page, not scrolling", skill_name)
+            return None
+        if moved:
+            wait_for_network_idle(driver, quiet=0.25, timeout=1, label="scroll_to_skill", legacy_seconds=1)
         
-        logger.info(f"{skill_name} is now in view.")
+        logger.info("%s is now in view.", skill_name)
+        return skill_element
     except Exception as e:
-        logger.error(f"An error occurred while scrolling to {skill_name}: {e}")
+        logger.error("An error occurred while scrolling to %s: %s", skill_name, e)
 
 
+@traced("process_skill_modal", record=("skill_name",))
 def process_skill_modal(driver, skill_name):
     try:
         # scroll skill listing page to make this skill_name visible
         scroll_to_skill(driver, skill_name)
-        time.sleep(3)          
+        # the page settles in scroll_to_skill's network-idle wait, so nothing
+        # waits in place of the 3 second sleep that used to follow the scroll
+        wait_stats.record("process_skill_modal.settle", 3, 0.0)
 
         # prompt user to click the edit skill link from the skill listing page
-        logger.info(f"click {skill_name}")
+        logger.info("click %s", skill_name)
         
         # now pause for up to 15 seconds for user to click the edit_skill_link 
         # and the edit_skill_modal appears
-        # the modal has "pe-edit-form-page__modal" as one of its class names
-        edit_skill_modal = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CLASS_NAME, "pe-edit-form-page__modal")) 
-        )
-        # wait until the modal appears
-        time.sleep(5)          
+        # the modal has "pe-edit-form-page__modal" as one of its class names;
+        # not timed, the user's click never replaced a fixed sleep
+        wait_for_element(driver, SKILL_MODAL_SELECTOR, timeout=15)
+        edit_skill_modal = driver.find_element(By.CLASS_NAME, "pe-edit-form-page__modal")
+        # held as a handle, so a re-render of the modal while its items load
+        # costs one lookup instead of the skill
+        edit_skill_modal = ElementHandle(driver, [(By.CLASS_NAME, "pe-edit-form-page__modal")],
+                                         element=edit_skill_modal, description="skill modal")
+        # wait until the modal's selected items stop appearing
+        wait_for_stable_count(driver, SELECTED_ITEM_SELECTOR, quiet=0.5, timeout=5,
+                              label="process_skill_modal.render", legacy_seconds=5)
         
         # scroll vertically to the bottom of the modal to load all selected items
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(5)
+        wait_for_stable_count(driver, SELECTED_ITEM_SELECTOR, quiet=0.5, timeout=5,
+                              label="process_skill_modal.load_items", legacy_seconds=5)
         
         # find all selected items in the modal
-        selected_items = edit_skill_modal.find_elements(By.CLASS_NAME, "selected-item")
-        logger.info(f"found {len(selected_items)} selected items")
+        # read their text now, the elements are gone once the modal is dismissed
+        selected_items = [item.text for item in edit_skill_modal.find_elements(By.CLASS_NAME, "selected-item")]
+        logger.info("found %d selected items", len(selected_items))
               
         # scroll to the top to make the dismiss button visible
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(5)
         
         # the modal's dismiss button has aria-label="Dismiss" 
-        dismiss_button = WebDriverWait(driver, 5).until(
-            EC.element_to_be_clickable((By.XPATH, "//button[@aria-label='Dismiss']")) 
-        )
+        with wait_stats.timed("process_skill_modal.dismiss", legacy_seconds=5):
+            dismiss_button = WebDriverWait(driver, 5).until(
+                EC.element_to_be_clickable((By.XPATH, DISMISS_BUTTON_XPATH)) 
+            )
         # if dismiss is not found in modal then raise an exception and exit
         if dismiss_button is None:
             raise Exception("dismiss_button not found in modal")
-        dismiss_button.click()
+        ElementHandle(driver, [(By.XPATH, DISMISS_BUTTON_XPATH)], element=dismiss_button,
+                      description="Dismiss button").click()
         
-        logger.info(f"Successfully finished process_skill_modal for skill_name: {skill_name}")
+        logger.info("Successfully finished process_skill_modal for skill_name: %s", skill_name)
         return selected_items
         
+    except StaleElementReferenceException as e:
+        logger.error("Skill modal for %s kept re-rendering, giving up: %s", skill_name, e)
     except Exception as e:
-        logger.error(f"Error process_skill_modal for skill_name: {skill_name} exception:{str(e)}")    
+        logger.error("Error process_skill_modal for skill_name: %s exception:%s", skill_name, e)    
+
+@traced("find_skill_containers")
+def find_skill_containers(driver, skill_handler=None, expected_total=None, fingerprints=None, pagination=None):
+    """Discover every ALL-SKILLS container and return the skill names.
 
-def find_skill_containers(driver):
+    Each new skill is passed to skill_handler(driver, skill_name), process_skill_modal
+    by default; pass False to only collect the names. expected_total, when the page
+    states the list's total, stops pagination as soon as that many skills are loaded;
+    a count from an earlier scrape is no total, the profile may have changed since.
+    A fingerprints dict is filled with each skill's fingerprint before its handler runs,
+    and a pagination dict is updated with the paginator's report, whose "complete"
+    tells whether the whole list was loaded.
+    """
     logger.info("Attempting to find all skill containers...")
-    skill_containers = []
+    if skill_handler is None:
+        skill_handler = process_skill_modal
+    skill_containers = SkillContainerIndex()
+    paginator = SkillListPaginator(driver, expected_total=expected_total)
     skills = []
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    scroll_attempts = 0
-    max_scroll_attempts = 10  # Adjust this value as needed
 
-    while scroll_attempts < max_scroll_attempts:
-        # Find all skill containers, including both ALL-SKILLS and INDUSTRY-KNOWLEDGE-SKILLS
-        current_containers = driver.find_elements(By.XPATH, "//li[starts-with(@id, 'profilePagedListComponent-') and contains(@id, '-SKILLS-VIEW-DETAILS-profileTabSection-')]")
+    while True:
+        # Harvest only the ALL-SKILLS containers added since the last pass
+        new_all_skills_containers = skill_containers.discover(driver)
         
-        # Filter for ALL-SKILLS containers
-        new_all_skills_containers = [
-            container for container in current_containers 
-            if 'ALL-SKILLS' in container.get_attribute('id') 
-            and container not in skill_containers
-        ]
-        
-        if new_all_skills_containers:
-            for container in new_all_skills_containers:
-                skill_containers.append(container)
-                # Step 1: Find the div with class "pvs-navigation__icon"
+        new_skills = []
+        for container in new_all_skills_containers:
+            skill_name = container['name']
+            if skill_name is None:
+                continue
+            logger.info("Found new ALL-SKILLS container. Skill: %s", skill_name)
+            new_skills.append(skill_name)
+            if fingerprints is not None:
+                fingerprints[skill_name] = container['fingerprint']
+        skills.extend(new_skills)
+        if skill_handler and new_skills:
+            # visit the new skills in document order, so the page only scrolls forward
+            for skill_name in scroll_planner_for(driver).plan(new_skills):
                 try:
-                    icon_div = container.find_element(By.XPATH, ".//div[@class='pvs-navigation__icon']")
-                    if icon_div is None:
-                        logger.warn(f"Could not find pvs-navigation__icon div for container ID: {container.get_attribute('id')}")
-                    else:
-                        logger.info(f"Found pvs-navigation__icon div for container ID: {container.get_attribute('id')}")
-        
-                        # Step 2: Find the svg element within the div
-                        svg_element = None
-                        try:
-                            svg_element = icon_div.find_element(By.XPATH, "./svg[@aria-label]")
-                        except NoSuchElementException:
-                            logger.warning("Could not find SVG element with aria-label in icon_div")
- 
-                        if svg_element is None:
-                            # look for teh svg within  the innerHTML of the div
-                            icon_div_innerHtml = icon_div.get_attribute('innerHTML')
-                            pattern = r'aria-label="Edit\s*(.*?)"'
-                            match = re.search(pattern, icon_div_innerHtml)
+                    selected_items = skill_handler(driver, skill_name)
+                    logger.info("skill:%s has %d selected_items", skill_name, len(selected_items))
+                except Exception as e:
+                    logger.error("Error processing skill:%s : %s", skill_name, e)
+        if new_all_skills_containers:
+            logger.info("Found %d new ALL-SKILLS containers. Total: %d", len(new_all_skills_containers), len(skill_containers))
+
+        if paginator.finished(skill_containers.offset):
+            break
+        with trace_span(driver, "scroll_pass", idle_passes=paginator.idle_passes):
+            # Scroll down (or click "Show more") and wait for appended items
+            paginator.next_page(skill_containers.offset)
 
-                            if match:
-                                logger.info(f"Found pattern: {repr(pattern)} in icon_div_innerHtml")
+    report = paginator.report()
+    if pagination is not None:
+        pagination.update(report)
+    logger.info(f"Total skills found {len(skills)}")
+    return skills
 
-                                skill_name = match.group(1)
-                                if skill_name is None:
-                                    logger.warning(f"Could not find skill_name in pattern: {repr(pattern)}")
-                                else:
-                                    logger.info(f"!!! Found skill_name: [{skill_name}]")
-                                    skills.append(skill_name)
-                                    selected_items = process_skill_modal(driver, skill_name)
-                                    logger.info(f"skill:{skill_name} has {len(selected_items)} selected_items")
-                                    
+def collect_skill_edit_links(driver, fingerprints=None, pagination=None) -> dict:
+    """Discover every skill without opening modals and return {skill_name: edit form url}.
 
-                            else:
-                                logger.warning(f"Could not find pattern: {repr(pattern)} in icon_div_innerHtml")
-                        else:
-                            logger.info(f"Found SVG element within pvs-navigation__icon div for container ID: {container.get_attribute('id')}")
-                        
-                            # Extract and process the skill name
-                            skill_name = svg_element.get_attribute('aria-label')
-                            if skill_name is None:
-                                logger.warning("Could not extract skill name from SVG element")
-                            else:
-                                if skill_name.startswith("Edit "):
-                                    skill_name = skill_name[5:]  # Remove "Edit " prefix
-                                logger.info(f"Found new ALL-SKILLS container. Skill: {skill_name}")
-                                skills.append(skill_name)
-                                selected_items = process_skill_modal(driver, skill_name)
-                                logger.info(f"skill:{skill_name} has {len(selected_items)} selected_items")
+    fingerprints and pagination are filled as by find_skill_containers.
+    """
+    find_skill_containers(driver, skill_handler=False, fingerprints=fingerprints, pagination=pagination)
+    edit_links = {}
+    for container in harvest_skill_containers(driver):
+        if container['name'] is None or not container['editLinkHref']:
+            continue
+        edit_links.setdefault(container['name'], container['editLinkHref'])
+    logger.info(f"Collected {len(edit_links)} skill edit links")
+    return edit_links
 
+@traced("fetch_skill_modal", record=("skill_name",))
+def fetch_skill_modal(driver, skill_name, edit_url):
+    """Open the skill's edit form directly by url and return its selected items.
 
-                except NoSuchElementException:
-                    logger.warning(f"find_element pvs-navigation__icon div fo skill container Skill: {skill_name} raised NoSuchElementException")
-                except Exception as e:
-                    logger.error(f"Error processing skill:{skill_name} : {str(e)}")
-            
-            logger.info(f"Found {len(new_all_skills_containers)} new ALL-SKILLS containers. Total: {len(skill_containers)}")
-            scroll_attempts = 0  # Reset scroll attempts if we found new containers
-        else:
-            scroll_attempts += 1
-            logger.info(f"No new ALL-SKILLS containers found. Scroll attempt {scroll_attempts}/{max_scroll_attempts}")
+    The form renders the same modal as clicking the edit link, but there is no
+    list to scroll to the skill and nothing to dismiss afterwards.
+    """
+    try:
+        driver.get(edit_url)
+        wait_for_element(driver, SKILL_MODAL_SELECTOR, timeout=15, label="fetch_skill_modal.mount")
+        wait_for_stable_count(driver, SELECTED_ITEM_SELECTOR, quiet=0.5, timeout=5,
+                              label="fetch_skill_modal.load_items")
+        selected_items = driver.find_elements(By.CSS_SELECTOR, SELECTED_ITEM_SELECTOR)
+        logger.info("found %d selected items for %s", len(selected_items), skill_name)
+        return selected_items
+    except Exception as e:
+        logger.error("Error fetch_skill_modal for skill_name: %s exception:%s", skill_name, e)
 
-        # Scroll down
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)  # Wait for potential new content to load
+def deep_link_skill_handler(edit_links):
+    """Return a skill_handler(driver, skill_name) that fetches each skill's modal from edit_links."""
+    def handle_skill(driver, skill_name):
+        return fetch_skill_modal(driver, skill_name, edit_links[skill_name])
+    return handle_skill
 
-        # Check if scrolled
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            break  # Stop if the page height didn't change after scrolling
-        last_height = new_height
+@traced("process_skills_by_deep_link")
+def process_skills_by_deep_link(driver, edit_links, skill_handler=None) -> list:
+    """Pass every skill in edit_links to skill_handler and return the skill names.
 
-        # Check for "Show more" button and click if present
+    skill_handler defaults to deep_link_skill_handler(edit_links); pass False to only return the names.
+    """
+    if skill_handler is None:
+        skill_handler = deep_link_skill_handler(edit_links)
+    for skill_name in edit_links:
+        if not skill_handler:
+            break
         try:
-            show_more_button = driver.find_element(By.XPATH, "//button[contains(text(), 'Show more')]")
-            show_more_button.click()
-            logger.info("Clicked 'Show more' button")
-            time.sleep(2)  # Wait for new content to load after clicking
-            scroll_attempts = 0  # Reset scroll attempts after clicking "Show more"
-        except NoSuchElementException:
-            pass  # No "Show more" button found, continue scrolling
-
-    logger.info(f"Total skills found {len(skills)}")
-    return skills
+            selected_items = skill_handler(driver, skill_name)
+            logger.info("skill:%s has %d selected_items", skill_name, len(selected_items))
+        except Exception as e:
+            logger.error("Error processing skill:%s : %s", skill_name, e)
+    return list(edit_links)
 
 def main():
+    setup_logging(log_file='linkedin_scraper.log', json_format=os.getenv("LOG_JSON") == "1")
     chrome_driver_path = os.getenv("CHROME_DRIVER_PATH")
     email = os.getenv("LINKEDIN_EMAIL")
     pswd = os.getenv("LINKEDIN_PSWD")
@@ -296,16 +332,56 @@ def main():
         logger.error("Please ensure all environment variables are set.")
         return
 
-    service = Service(chrome_driver_path)
-    driver = webdriver.Chrome(service=service)
+    # check the session cache settings before starting Chrome, which a bad setting would leave running
+    session_cache = session_cache_from_env()
+    result_store = ResultStore(os.getenv("RESULT_STORE_DIR", "linkedin_skills_data"))
+    refresh = os.getenv("REFRESH_PROFILE") == "1"
+    if result_store.is_profile_done(username) and not refresh:
+        logger.info(f"{username} is already complete in the result store, set REFRESH_PROFILE=1 to update it")
+        result_store.close()
+        return
+
+    # LEAN_MODE=1 blocks images, media and fonts and disables animations; HEADLESS=1 hides the browser
+    driver = create_chrome_driver(chrome_driver_path, **lean_mode_from_env())
+    trace_file = os.getenv(TRACE_FILE_ENV)
+    if trace_file:
+        # record every WebDriver command and its latency, grouped by scraper stage
+        driver = TracingDriver(driver)
+    # page requests share one adaptive token bucket, RATE_LIMIT=0 turns it off
+    rate_limiter = shared_rate_limiter()
+    driver = rate_limited(driver, rate_limiter)
     
     try:
-        login(driver, email, pswd)
+        if session_cache is None:
+            login(driver, email, pswd)
+        else:
+            login_with_cache(driver, session_cache, lambda driver: login(driver, email, pswd))
         logger.info("Login successful, proceeding to skills page")
         go_to_skills_page(driver, username)
         capture_page_source(driver, "after_go_to_skills_page.txt")
 
-        skill_containers = find_skill_containers(driver)
+        # in every mode, only skills whose list-page fingerprint changed since they were stored get
+        # their modal reopened, and stored skills the complete list no longer has are marked removed
+        fingerprints = {}
+        pagination = {}
+        modal_tabs = int(os.getenv("MODAL_TABS", "1"))
+        if modal_tabs > 1:
+            # load the edit forms in several tabs of this session at once
+            edit_links = collect_skill_edit_links(driver, fingerprints, pagination)
+            skill_containers = fetch_skill_modals_in_tabs(driver, edit_links, modal_tabs, result_store, username,
+                                                          fingerprints)
+        elif os.getenv("DEEP_LINK_MODE") == "1":
+            # open each skill's edit form by url instead of scrolling to and clicking it
+            edit_links = collect_skill_edit_links(driver, fingerprints, pagination)
+            skill_handler = refreshing_skill_handler(result_store, username, fingerprints,
+                                                     deep_link_skill_handler(edit_links))
+            skill_containers = process_skills_by_deep_link(driver, edit_links, skill_handler)
+        else:
+            skill_handler = refreshing_skill_handler(result_store, username, fingerprints, process_skill_modal)
+            skill_containers = find_skill_containers(driver, skill_handler=skill_handler, fingerprints=fingerprints,
+                                                     pagination=pagination)
+        record_removed_skills(result_store, username, fingerprints, pagination)
+        result_store.mark_profile_done(username, skill_containers)
         logger.info(f"Found {len(skill_containers)} skill containers")
         capture_page_source(driver, f"after-found-{len(skill_containers)}-skill-containers.txt")
     
@@ -314,6 +390,14 @@ def main():
         capture_page_source(driver, "error_state.txt")
     
     finally:
+        result_store.close()
+        wait_stats.report()
+        if rate_limiter is not None:
+            logger.info(f"Rate limiter: {rate_limiter.summary()}")
+        if trace_file:
+            driver.tracer.write_chrome_trace(trace_file)
+            driver.tracer.write_folded_stacks(f"{trace_file}.folded")
+            driver.tracer.print_summary()
         logger.info("Quitting webdriver")
         driver.quit()
         
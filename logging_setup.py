@@ -1,14 +1,73 @@
 # logging_setup.py
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import queue
 import sys
 
-def setup_logging(log_file='app.log', console_level=logging.INFO, file_level=logging.DEBUG):
+_listener = None
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats each record as one JSON object per line, for shipping logs."""
+
+    def format(self, record):
+        entry = {
+            "time": self.formatTime(record),
+            "name": record.name,
+            "level": record.levelname,
+            "thread": record.threadName,
+            "message": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # formatted by ExceptionQueueHandler before the record was queued
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry)
+
+
+class ExceptionQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that keeps a record's traceback in exc_text instead of folding it into the message.
+
+    QueueHandler.prepare formats the whole record into msg and drops exc_info,
+    so the listener's formatters would never see the exception on its own.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            # tracebacks hold frames, which should not outlive the call on the queue
+            record.exc_info = None
+        return record
+
+
+def stop_logging():
+    """Stop the background listener after it has written every queued record."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def setup_logging(log_file='app.log', console_level=logging.INFO, file_level=logging.DEBUG,
+                  use_queue=True, json_format=False):
+    global _listener
+
     # Create a root logger
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)  # Set to lowest level to catch all logs
 
     # Create formatter
-    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    if json_format:
+        formatter = JsonFormatter()
+    else:
+        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 
     # Create stdout handler and set level to console_level
     stdout_handler = logging.StreamHandler(sys.stdout)
@@ -21,11 +80,24 @@ def setup_logging(log_file='app.log', console_level=logging.INFO, file_level=log
     file_handler.setFormatter(formatter)
 
     # Remove any existing handlers (to avoid duplicate logs)
+    stop_logging()
     for handler in root_logger.handlers[:]:
         root_logger.removeHandler(handler)
 
-    # Add handlers to the root logger
-    root_logger.addHandler(stdout_handler)
-    root_logger.addHandler(file_handler)
+    if not use_queue:
+        # Add handlers to the root logger
+        root_logger.addHandler(stdout_handler)
+        root_logger.addHandler(file_handler)
+        return root_logger
+
+    # The calling thread only enqueues records; a background listener thread
+    # formats them and does the console and disk I/O
+    log_queue = queue.SimpleQueue()
+    queue_handler = ExceptionQueueHandler(log_queue)
+    queue_handler.setLevel(min(console_level, file_level))
+    root_logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, stdout_handler, file_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
 
-    return root_logger
\ No newline at end of file
+    return root_logger
@@ -0,0 +1,228 @@
+import time
+from collections import deque
+from selenium.common.exceptions import WebDriverException
+from browser_profile import apply_lean_mode_to_new_tab
+from driver_tracer import trace_span
+from result_store import reuse_stored_skill
+import logging
+
+logger = logging.getLogger(__name__)
+
+# start loading url in the current tab without waiting for it; the marker
+# attribute disappears with the old document, so a probe can tell the new
+# page apart from the one being left
+TAB_NAVIGATE_JS = """
+document.documentElement.setAttribute('data-tab-leaving', '1');
+window.location.href = arguments[0];
+"""
+
+# null until the new document has the modal, then the selected item texts
+TAB_PROBE_JS = """
+var modalSelector = arguments[0], itemSelector = arguments[1];
+if (document.documentElement.hasAttribute('data-tab-leaving') || document.readyState !== 'complete') {
+    return null;
+}
+if (!document.querySelector(modalSelector)) {
+    return null;
+}
+return Array.prototype.map.call(document.querySelectorAll(itemSelector), function (item) {
+    return item.textContent.trim();
+});
+"""
+
+
+class TabSlot:
+    """One tab and the skill edit form it is loading."""
+
+    def __init__(self, handle):
+        self.handle = handle
+        self.skill_name = None
+        self.attempt = 0
+        self.started = 0.0
+        self.items = None
+        self.changed = 0.0
+
+    def assign(self, skill_name, attempt):
+        self.skill_name = skill_name
+        self.attempt = attempt
+        self.started = self.changed = time.monotonic()
+        self.items = None
+
+    def release(self):
+        self.skill_name = None
+        self.items = None
+
+
+class MultiTabModalFetcher:
+    """Spreads skill edit forms across tabs of one logged-in browser.
+
+    WebDriver runs one command at a time against the current window, so the
+    tabs are driven round robin: an idle tab starts a navigation without
+    waiting for it, and busy tabs are polled until their modal's selected
+    items stop changing for quiet seconds. Page loads and renders in all tabs
+    overlap. A tab that errors or times out is replaced and its skill retried
+    up to max_attempts times, after which the skill's result is None and the
+    profile carries on. New tabs get the driver's lean mode, which CDP
+    applies per tab.
+    """
+
+    def __init__(self, driver, tabs=3, quiet=0.5, timeout=15, poll_interval=0.05, max_attempts=2):
+        assert tabs > 0, "Tab count should be positive"
+        self.driver = driver
+        self.tabs = tabs
+        self.quiet = quiet
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        # imported here because linkedin_scraper imports this module
+        from linkedin_scraper import SKILL_MODAL_SELECTOR, SELECTED_ITEM_SELECTOR
+        self.modal_selector = SKILL_MODAL_SELECTOR
+        self.item_selector = SELECTED_ITEM_SELECTOR
+        self.home_handle = None
+        self.slots = []
+        self.retries = 0
+
+    def open_tabs(self):
+        self.home_handle = self.driver.current_window_handle
+        for _ in range(self.tabs):
+            self.slots.append(TabSlot(self.new_tab()))
+
+    def new_tab(self):
+        self.driver.switch_to.new_window("tab")
+        apply_lean_mode_to_new_tab(self.driver)
+        return self.driver.current_window_handle
+
+    def close_tabs(self):
+        for slot in self.slots:
+            try:
+                self.driver.switch_to.window(slot.handle)
+                self.driver.close()
+            except WebDriverException as e:
+                logger.warning(f"Could not close tab {slot.handle}: {str(e)}")
+        self.slots = []
+        self.driver.switch_to.window(self.home_handle)
+
+    def reopen(self, slot):
+        """Replace a tab that has gone away."""
+        self.driver.switch_to.window(self.home_handle)
+        slot.handle = self.new_tab()
+
+    def start(self, slot, skill_name, attempt, edit_url, pending, results):
+        slot.assign(skill_name, attempt)
+        try:
+            self.driver.switch_to.window(slot.handle)
+            self.driver.execute_script(TAB_NAVIGATE_JS, edit_url)
+        except WebDriverException as e:
+            self.drop(slot, pending, results, str(e))
+            return
+        logger.debug("tab %s: loading %s (attempt %d)", slot.handle, skill_name, attempt)
+
+    def fail(self, slot, pending, results, reason):
+        skill_name, attempt = slot.skill_name, slot.attempt
+        slot.release()
+        if attempt < self.max_attempts:
+            self.retries += 1
+            logger.warning("tab %s: %s failed (%s), retrying", slot.handle, skill_name, reason)
+            pending.append((skill_name, attempt + 1))
+        else:
+            logger.error("tab %s: %s failed after %d attempts: %s", slot.handle, skill_name, attempt, reason)
+            results[skill_name] = None
+
+    def drop(self, slot, pending, results, reason):
+        """Fail the tab's skill after a WebDriver error and replace the tab, or stop using it if that fails too."""
+        self.fail(slot, pending, results, reason)
+        try:
+            self.reopen(slot)
+        except WebDriverException as reopen_error:
+            logger.error(f"tab {slot.handle}: could not reopen, dropping it: {str(reopen_error)}")
+            self.slots.remove(slot)
+
+    def poll(self, slot, pending, results, on_result) -> bool:
+        """Check a busy tab; return True when it finished or failed its skill."""
+        try:
+            self.driver.switch_to.window(slot.handle)
+            items = self.driver.execute_script(TAB_PROBE_JS, self.modal_selector, self.item_selector)
+        except WebDriverException as e:
+            self.drop(slot, pending, results, str(e))
+            return True
+        now = time.monotonic()
+        if items != slot.items:
+            slot.items = items
+            slot.changed = now
+        elif items is not None and now - slot.changed >= self.quiet:
+            logger.info("found %d selected items for %s", len(items), slot.skill_name)
+            results[slot.skill_name] = items
+            if on_result is not None:
+                on_result(slot.skill_name, items)
+            slot.release()
+            return True
+        if now - slot.started >= self.timeout:
+            self.fail(slot, pending, results, f"no stable modal after {self.timeout}s")
+            return True
+        return False
+
+    def fetch(self, edit_links, on_result=None) -> dict:
+        """Fetch the selected items of every skill in edit_links ({skill_name: edit form url}).
+
+        Returns {skill_name: [item texts] or None} in edit_links order;
+        on_result(skill_name, items) is called as each skill completes.
+        """
+        pending = deque((skill_name, 1) for skill_name in edit_links)
+        results = {}
+        start = time.perf_counter()
+        with trace_span(self.driver, "multi_tab_fetch", tabs=self.tabs, skills=len(edit_links)):
+            self.open_tabs()
+            try:
+                while pending or any(slot.skill_name is not None for slot in self.slots):
+                    if not self.slots:
+                        raise WebDriverException("every tab failed and none could be reopened")
+                    progressed = False
+                    # a copy, drop() removes tabs that cannot be reopened
+                    for slot in list(self.slots):
+                        if slot.skill_name is None:
+                            if pending:
+                                skill_name, attempt = pending.popleft()
+                                self.start(slot, skill_name, attempt, edit_links[skill_name], pending, results)
+                                progressed = True
+                        elif self.poll(slot, pending, results, on_result):
+                            progressed = True
+                    if not progressed:
+                        time.sleep(self.poll_interval)
+            finally:
+                self.close_tabs()
+        logger.info(f"Fetched {len(results)} skill modals in {self.tabs} tabs in "
+                    f"{time.perf_counter() - start:.1f}s with {self.retries} retries")
+        return {skill_name: results.get(skill_name) for skill_name in edit_links}
+
+
+def fetch_skill_modals_in_tabs(driver, edit_links, tabs, result_store=None, profile=None, fingerprints=None) -> list:
+    """Fetch every skill in edit_links across tabs, appending results to result_store; returns the skill names.
+
+    With fingerprints (see collect_skill_edit_links) only new and changed skills
+    are fetched, as by refreshing_skill_handler; without, every skill not yet in
+    result_store is.
+    """
+    if result_store is not None:
+        if fingerprints is None:
+            edit_links_to_fetch = {
+                skill_name: edit_url for skill_name, edit_url in edit_links.items()
+                if not result_store.is_skill_done(profile, skill_name)
+            }
+        else:
+            edit_links_to_fetch = {
+                skill_name: edit_url for skill_name, edit_url in edit_links.items()
+                if not reuse_stored_skill(result_store, profile, skill_name, fingerprints.get(skill_name))
+            }
+        on_result = lambda skill_name, items: result_store.append_skill(
+            profile, {"name": skill_name, "selected_items": items,
+                      "fingerprint": (fingerprints or {}).get(skill_name)})
+    else:
+        edit_links_to_fetch = edit_links
+        on_result = None
+    results = MultiTabModalFetcher(driver, tabs=tabs).fetch(edit_links_to_fetch, on_result=on_result)
+    if result_store is not None:
+        # failed skills keep the profile from being marked done, so a later run retries them
+        for skill_name, items in results.items():
+            if items is None:
+                result_store.mark_skill_failed(profile, skill_name, "no stable modal in any tab")
+    return list(edit_links)
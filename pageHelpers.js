@@ -0,0 +1,219 @@
+// Helpers installed once per document by element_utils.call_page_helper().
+// Python calls them by name through PAGE_HELPER_CALL_JS instead of sending
+// their bodies with every execute_script.
+(function () {
+    if (window.__scraperHelpers) {
+        return;
+    }
+
+    var positions = new WeakMap();
+    var elementPositions = new WeakMap();
+    var absolutePaths = new WeakMap();
+    var idPaths = new WeakMap();
+    var xpathElements = new Map();
+
+    function resetCaches() {
+        positions = new WeakMap();
+        elementPositions = new WeakMap();
+        absolutePaths = new WeakMap();
+        idPaths = new WeakMap();
+        xpathElements = new Map();
+    }
+
+    // appending children (the skills list growing) leaves every cached
+    // position valid; inserts before existing nodes, removals and id changes
+    // do not
+    new MutationObserver(function (mutations) {
+        for (var i = 0; i < mutations.length; i++) {
+            var mutation = mutations[i];
+            if (mutation.type === 'attributes' || mutation.removedNodes.length || mutation.nextSibling) {
+                resetCaches();
+                return;
+            }
+        }
+    }).observe(document, {childList: true, subtree: true, attributes: true, attributeFilter: ['id']});
+
+    // 1-based position among same-named siblings, as in absoluteXPath.js;
+    // one walk over the parent records the position of every child
+    function position(node) {
+        if (node.nodeType === Node.ATTRIBUTE_NODE) {
+            return null;
+        }
+        var cached = positions.get(node);
+        if (cached !== undefined) {
+            return cached;
+        }
+        if (!node.parentNode) {
+            return 1;
+        }
+        var counts = {};
+        for (var child = node.parentNode.firstChild; child; child = child.nextSibling) {
+            counts[child.nodeName] = (counts[child.nodeName] || 0) + 1;
+            positions.set(child, counts[child.nodeName]);
+        }
+        return positions.get(node);
+    }
+
+    // 1-based position among sibling elements with the same tag, as in getXPath
+    function elementPosition(element) {
+        var cached = elementPositions.get(element);
+        if (cached !== undefined) {
+            return cached;
+        }
+        var counts = {};
+        for (var child = element.parentNode.firstElementChild; child; child = child.nextElementSibling) {
+            counts[child.tagName] = (counts[child.tagName] || 0) + 1;
+            elementPositions.set(child, counts[child.tagName]);
+        }
+        return elementPositions.get(element);
+    }
+
+    function stepName(node) {
+        switch (node.nodeType) {
+            case Node.TEXT_NODE:
+                return 'text()';
+            case Node.ATTRIBUTE_NODE:
+                return '@' + node.nodeName;
+            case Node.PROCESSING_INSTRUCTION_NODE:
+                return 'processing-instruction()';
+            case Node.COMMENT_NODE:
+                return 'comment()';
+            default:
+                return node.nodeName;
+        }
+    }
+
+    // same result as absoluteXPath(node); the parent's path is cached, so a
+    // new node only costs its own step
+    function absoluteXPath(node) {
+        if (!node || node.nodeType === Node.DOCUMENT_NODE) {
+            return '/';
+        }
+        var cached = absolutePaths.get(node);
+        if (cached !== undefined) {
+            return cached;
+        }
+        var parent = node.nodeType === Node.ATTRIBUTE_NODE ? node.ownerElement : node.parentNode;
+        var prefix = !parent || parent.nodeType === Node.DOCUMENT_NODE ? '' : absoluteXPath(parent);
+        var nodePosition = position(node);
+        var path = prefix + '/' + stepName(node).toLowerCase() + (nodePosition !== null ? '[' + nodePosition + ']' : '');
+        absolutePaths.set(node, path);
+        return path;
+    }
+
+    // path anchored at the nearest ancestor with an id, e.g. id("x")/DIV[1]/SPAN[2]
+    function idXPath(element) {
+        if (element.id !== '') {
+            return 'id("' + element.id + '")';
+        }
+        if (element === document.body) {
+            return element.tagName;
+        }
+        var cached = idPaths.get(element);
+        if (cached !== undefined) {
+            return cached;
+        }
+        var path = idXPath(element.parentNode) + '/' + element.tagName + '[' + elementPosition(element) + ']';
+        idPaths.set(element, path);
+        return path;
+    }
+
+    function findByXPath(xpath) {
+        var element = xpathElements.get(xpath);
+        if (element && element.isConnected) {
+            return element;
+        }
+        element = document.evaluate(xpath, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        if (element) {
+            xpathElements.set(xpath, element);
+        }
+        return element;
+    }
+
+    function info(element) {
+        var rect = element.getBoundingClientRect();
+        return {
+            tagName: element.tagName,
+            id: element.id,
+            className: element.className,
+            textContent: element.textContent.trim().substring(0, 50),
+            isDisplayed: element.offsetParent !== null,
+            location: {x: rect.left, y: rect.top},
+            size: {width: rect.width, height: rect.height}
+        };
+    }
+
+    // names limits the result to those attributes
+    function attributes(element, names) {
+        var items = {};
+        if (names) {
+            for (var i = 0; i < names.length; i++) {
+                if (element.hasAttribute(names[i])) {
+                    items[names[i]] = element.getAttribute(names[i]);
+                }
+            }
+            return items;
+        }
+        for (var index = 0; index < element.attributes.length; ++index) {
+            items[element.attributes[index].name] = element.attributes[index].value;
+        }
+        return items;
+    }
+
+    // fields reads only those properties instead of enumerating every one;
+    // maxProperties and maxValueLength cap the payload, and a capped dump
+    // has __truncated__ set
+    function properties(element, onlyOwn, fields, maxProperties, maxValueLength) {
+        var items = {};
+        var names = fields || [];
+        if (!fields) {
+            for (var prop in element) {
+                if (!onlyOwn || element.hasOwnProperty(prop)) {
+                    names.push(prop);
+                }
+            }
+        }
+        for (var i = 0; i < names.length; i++) {
+            if (maxProperties && i >= maxProperties) {
+                items.__truncated__ = true;
+                break;
+            }
+            var value;
+            try {
+                value = element[names[i]] !== null ? element[names[i]].toString() : 'null';
+            } catch (e) {
+                value = "Cannot convert to string";
+            }
+            if (maxValueLength && value.length > maxValueLength) {
+                value = value.substring(0, maxValueLength);
+                items.__truncated__ = true;
+            }
+            items[names[i]] = value;
+        }
+        return items;
+    }
+
+    // runs helper name on every element in one call; an element that fails
+    // gets {error: message} instead of failing the batch
+    function batch(name, elements) {
+        var args = Array.prototype.slice.call(arguments, 2);
+        var helper = window.__scraperHelpers[name];
+        return elements.map(function (element) {
+            try {
+                return helper.apply(null, [element].concat(args));
+            } catch (e) {
+                return {error: String(e)};
+            }
+        });
+    }
+
+    window.__scraperHelpers = {
+        absoluteXPath: absoluteXPath,
+        idXPath: idXPath,
+        findByXPath: findByXPath,
+        info: info,
+        attributes: attributes,
+        properties: properties,
+        batch: batch
+    };
+})();
@@ -0,0 +1,255 @@
+import argparse
+import gzip
+import json
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+import logging
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+CAPTURE_COMPRESSION_ENV = "CAPTURE_COMPRESSION"
+CAPTURE_CHUNK_CHARS = 1024 * 1024
+COMPRESSION_SUFFIXES = {None: "", "gzip": ".gz", "zstd": ".zst"}
+
+# serializes the document once inside the page and keeps it there, so python
+# can pull it in slices; returns the length in characters
+CAPTURE_START_JS = """
+var doctype = document.doctype ? new XMLSerializer().serializeToString(document.doctype) : '';
+window.__scraperCapture = doctype + document.documentElement.outerHTML;
+return window.__scraperCapture.length;
+"""
+# returns [slice, end]; a slice never ends between the two halves of a
+# surrogate pair, so it can be one UTF-16 unit shorter (or, for one-unit
+# slices, longer) than asked
+CAPTURE_CHUNK_JS = """
+var capture = window.__scraperCapture, start = arguments[0];
+var end = Math.min(start + arguments[1], capture.length);
+var last = capture.charCodeAt(end - 1);
+if (end < capture.length && last >= 0xD800 && last <= 0xDBFF) {
+    end += end - start > 1 ? -1 : 1;
+}
+return [capture.substring(start, end), end];
+"""
+CAPTURE_END_JS = "delete window.__scraperCapture;"
+
+
+def capture_compression_from_env():
+    """Read CAPTURE_COMPRESSION: gzip or zstd; unset or empty writes plain text."""
+    compression = os.getenv(CAPTURE_COMPRESSION_ENV) or None
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"{CAPTURE_COMPRESSION_ENV} must be gzip or zstd, not {compression}")
+    return compression
+
+
+def open_capture_file(file_path, compression=None):
+    """Open file_path for text writing, compressing on the fly with gzip or zstd."""
+    if compression is None:
+        return open(file_path, "w", encoding="utf-8")
+    if compression == "gzip":
+        return gzip.open(file_path, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+        return zstandard.open(file_path, "w", encoding="utf-8")
+    raise ValueError(f"Unknown capture compression: {compression}")
+
+
+def stream_page_source(driver, file, chunk_chars=CAPTURE_CHUNK_CHARS) -> int:
+    """Write the serialized DOM to an open text file in chunk_chars slices; returns the characters written.
+
+    Only one slice is held in python at a time, unlike driver.page_source,
+    which returns the whole document (plus the decoded wire copy) at once.
+    Offsets and chunk_chars count UTF-16 code units, as javascript strings do.
+    """
+    length = driver.execute_script(CAPTURE_START_JS)
+    try:
+        offset = 0
+        while offset < length:
+            chunk, offset = driver.execute_script(CAPTURE_CHUNK_JS, offset, chunk_chars)
+            file.write(chunk)
+    finally:
+        driver.execute_script(CAPTURE_END_JS)
+    return length
+
+
+def capture_to_file(driver, file_path, compression=None, chunk_chars=CAPTURE_CHUNK_CHARS) -> str:
+    """Stream the page into file_path (plus .gz/.zst when compressed) and return the path written."""
+    file_path += COMPRESSION_SUFFIXES[compression]
+    temp_path = f"{file_path}.tmp"
+    try:
+        with open_capture_file(temp_path, compression) as file:
+            length = stream_page_source(driver, file, chunk_chars)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        # a failed capture must not leave a partial .tmp file behind
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    logger.info("Streamed %d characters of page source to %s", length, file_path)
+    return file_path
+
+
+def rss_bytes() -> int:
+    with open("/proc/self/statm") as file:
+        return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+class PeakRssSampler:
+    """Samples resident memory on a background thread and keeps the highest value."""
+
+    def __init__(self, interval=0.002):
+        self.interval = interval
+        self.peak = 0
+        self.running = False
+        self.thread = None
+
+    def __enter__(self):
+        self.peak = rss_bytes()
+        self.running = True
+        self.thread = threading.Thread(target=self.sample, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.running = False
+        self.thread.join()
+        self.peak = max(self.peak, rss_bytes())
+
+    def sample(self):
+        while self.running:
+            self.peak = max(self.peak, rss_bytes())
+            time.sleep(self.interval)
+
+
+def synthetic_page(size_mb) -> str:
+    from replay_benchmark import synthetic_skills_page
+
+    skill_bytes = len(synthetic_skills_page(100)) / 100
+    return synthetic_skills_page(max(1, int(size_mb * 1024 * 1024 / skill_bytes)))
+
+
+def serve_page(connection, size_mb) -> None:
+    """Play the browser for measure_capture: hold a synthetic size_mb page and answer driver calls over connection."""
+    from fake_webdriver import FakeWebDriver
+
+    driver = FakeWebDriver()
+    driver.source = synthetic_page(size_mb)
+    connection.send(len(driver.source))
+    while True:
+        request = connection.recv()
+        if request is None:
+            break
+        if request == "page_source":
+            connection.send(driver.page_source)
+        else:
+            connection.send(driver.execute_script(*request))
+
+
+class PageProcessDriver:
+    """The driver side of serve_page: every response crosses a pipe, so it is a fresh copy, as over the wire."""
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    @property
+    def page_source(self):
+        self.connection.send("page_source")
+        return self.connection.recv()
+
+    def execute_script(self, script, *args):
+        self.connection.send((script, *args))
+        return self.connection.recv()
+
+
+def measure_capture(mode, size_mb, compression=None) -> dict:
+    """Capture a synthetic size_mb page with mode "page_source" or "stream"; returns time and memory growth.
+
+    The page is held by a separate process, as it is by the browser, so the
+    memory measured is only what the capture costs the scraper's process.
+    """
+    context = multiprocessing.get_context("spawn")
+    connection, page_connection = context.Pipe()
+    page_process = context.Process(target=serve_page, args=(page_connection, size_mb), daemon=True)
+    page_process.start()
+    # only the page process keeps its end open, so recv fails instead of hanging if it dies
+    page_connection.close()
+    try:
+        page_chars = connection.recv()
+        driver = PageProcessDriver(connection)
+        with tempfile.TemporaryDirectory() as work_dir:
+            file_path = os.path.join(work_dir, "capture.txt")
+            tracemalloc.start()
+            baseline_rss = rss_bytes()
+            start = time.perf_counter()
+            with PeakRssSampler() as sampler:
+                if mode == "page_source":
+                    with open_capture_file(file_path + COMPRESSION_SUFFIXES[compression], compression) as file:
+                        file.write(driver.page_source)
+                else:
+                    capture_to_file(driver, file_path, compression)
+            elapsed = time.perf_counter() - start
+            peak_traced = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            written = os.path.getsize(file_path + COMPRESSION_SUFFIXES[compression])
+        connection.send(None)
+    finally:
+        page_process.join(timeout=5)
+        if page_process.is_alive():
+            page_process.terminate()
+    return {
+        "mode": mode,
+        "page_mb": page_chars / 1024 / 1024,
+        "compression": compression,
+        "seconds": elapsed,
+        "written_bytes": written,
+        "peak_traced_mb": peak_traced / 1024 / 1024,
+        "peak_rss_growth_mb": (sampler.peak - baseline_rss) / 1024 / 1024,
+    }
+
+
+def report_measurement(connection, mode, size_mb, compression) -> None:
+    connection.send(measure_capture(mode, size_mb, compression))
+
+
+def benchmark_capture(sizes_mb=(5, 20), compression=None) -> list:
+    """Run each mode and size in a fresh process, so one run's heap does not hide another's peak."""
+    context = multiprocessing.get_context("spawn")
+    results = []
+    for size_mb in sizes_mb:
+        for mode in ("page_source", "stream"):
+            # not a Pool: its daemonic workers cannot start the page process
+            connection, result_connection = context.Pipe()
+            process = context.Process(target=report_measurement, args=(result_connection, mode, size_mb, compression))
+            process.start()
+            result_connection.close()
+            results.append(connection.recv())
+            process.join()
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare peak memory of page_source and streamed page captures")
+    parser.add_argument("--sizes", default="5,20", help="comma separated synthetic page sizes in MB")
+    parser.add_argument("--compression", choices=["gzip", "zstd"], help="compress the capture on the fly")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    sizes = [float(size) for size in args.sizes.split(",") if size]
+    benchmark_results = benchmark_capture(sizes, args.compression)
+    print(f"{'mode':<14}{'page MB':>9}{'seconds':>9}{'written MB':>12}{'peak traced MB':>16}{'peak RSS +MB':>14}")
+    for result in benchmark_results:
+        print(f"{result['mode']:<14}{result['page_mb']:>9.1f}{result['seconds']:>9.2f}"
+              f"{result['written_bytes'] / 1024 / 1024:>12.1f}{result['peak_traced_mb']:>16.1f}"
+              f"{result['peak_rss_growth_mb']:>14.1f}")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(benchmark_results, file, indent=2)
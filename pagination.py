@@ -0,0 +1,105 @@
+import time
+from skill_harvester import ALL_SKILLS_CONTAINER_SELECTOR
+from wait_utils import wait_for_more_items
+import logging
+
+logger = logging.getLogger(__name__)
+
+# scrolls to the bottom to trigger lazy loading and clicks an enabled
+# "Show more" button if there is one; returns whether it clicked
+LOAD_MORE_JS = """
+window.scrollTo(0, document.body.scrollHeight);
+var buttons = document.querySelectorAll('button');
+for (var i = 0; i < buttons.length; i++) {
+    if (!buttons[i].disabled && buttons[i].textContent.indexOf('Show more') !== -1) {
+        buttons[i].click();
+        return true;
+    }
+}
+return false;
+"""
+
+
+class SkillListPaginator:
+    """Loads the lazy skills list page by page until it is complete.
+
+    Each pass scrolls to the bottom (clicking "Show more" when present) and waits
+    for appended items. The wait returns as soon as items arrive, or early when
+    no request is in flight and nothing has loaded for quiet seconds. Its ceiling
+    adapts: it halves after a productive pass and doubles, up to max_timeout,
+    after an empty one, so fast pages are not slept on and slow ones are not cut
+    short. Pagination stops when expected_total items (a total stated by the
+    page, never a stored count) are present, or after max_idle_passes passes in
+    a row bring nothing; complete tells whether the whole list was loaded,
+    rather than given up on while "Show more" remained.
+    """
+
+    def __init__(self, driver, selector=ALL_SKILLS_CONTAINER_SELECTOR, expected_total=None, quiet=0.5,
+                 min_timeout=1.0, max_timeout=8.0, backoff=2.0, max_idle_passes=3):
+        self.driver = driver
+        self.selector = selector
+        self.expected_total = expected_total
+        self.quiet = quiet
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.backoff = backoff
+        self.max_idle_passes = max_idle_passes
+        self.timeout = min_timeout
+        self.idle_passes = 0
+        self.passes = 0
+        self.productive_passes = 0
+        self.show_more_clicks = 0
+        self.clicked_show_more = False
+        self.idle_seconds = 0.0
+        self.stop_reason = None
+        self.complete = False
+
+    def finished(self, count) -> bool:
+        if self.expected_total is not None and count >= self.expected_total:
+            self.stop_reason = "expected total reached"
+            self.complete = True
+        elif self.idle_passes >= self.max_idle_passes:
+            self.stop_reason = f"{self.idle_passes} passes without new items"
+            # a "Show more" button that was still there means the list was cut short
+            self.complete = not self.clicked_show_more
+        return self.stop_reason is not None
+
+    def next_page(self, count) -> bool:
+        """Ask for more items after count are loaded; returns whether any arrived."""
+        self.passes += 1
+        start = time.perf_counter()
+        self.clicked_show_more = bool(self.driver.execute_script(LOAD_MORE_JS))
+        if self.clicked_show_more:
+            self.show_more_clicks += 1
+            logger.info("Clicked 'Show more' button")
+        result = wait_for_more_items(self.driver, self.selector, count, quiet=self.quiet, timeout=self.timeout,
+                                     label="find_skill_containers.paginate", legacy_seconds=2)
+        waited = time.perf_counter() - start
+        if result and result["ok"]:
+            self.productive_passes += 1
+            self.idle_passes = 0
+            self.timeout = max(self.min_timeout, self.timeout / self.backoff)
+            return True
+        self.idle_passes += 1
+        self.idle_seconds += waited
+        reason = result["reason"] if result else "error"
+        logger.info("Pass %d brought no new items (%s after %.1fs), %d/%d idle passes",
+                    self.passes, reason, waited, self.idle_passes, self.max_idle_passes)
+        if reason != "idle":
+            # still loading when the ceiling hit, give the next pass longer
+            self.timeout = min(self.max_timeout, self.timeout * self.backoff)
+        return False
+
+    def report(self) -> dict:
+        report = {
+            "passes": self.passes,
+            "productive_passes": self.productive_passes,
+            "show_more_clicks": self.show_more_clicks,
+            "idle_seconds": self.idle_seconds,
+            "stop_reason": self.stop_reason,
+            "complete": self.complete,
+        }
+        logger.info(f"Pagination: {self.passes} passes, {self.productive_passes} productive, "
+                    f"{self.show_more_clicks} 'Show more' clicks, {self.idle_seconds:.1f}s idle, "
+                    f"stopped: {self.stop_reason}{'' if self.complete else ', list incomplete'}")
+        return report
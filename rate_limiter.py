@@ -0,0 +1,262 @@
+import argparse
+import os
+import threading
+import time
+from selenium.common.exceptions import WebDriverException
+from multi_tab import TAB_NAVIGATE_JS
+from pagination import LOAD_MORE_JS
+import logging
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_ENV = "RATE_LIMIT"
+RATE_LIMIT_MIN_ENV = "RATE_LIMIT_MIN"
+RATE_LIMIT_MAX_ENV = "RATE_LIMIT_MAX"
+
+# 999 is LinkedIn's own "request denied" status
+THROTTLE_STATUSES = frozenset([429, 503, 999])
+CHALLENGE_URL_MARKERS = ("/checkpoint/", "/authwall", "/challenge")
+# scripts that make the page request something: a tab navigation and the
+# "Show more" / scroll-to-bottom that loads the next page of skills
+RATE_LIMITED_SCRIPTS = frozenset([TAB_NAVIGATE_JS, LOAD_MORE_JS])
+
+
+class ThrottledError(WebDriverException):
+    """A page was still throttled after every retry."""
+
+
+class AdaptiveRateLimiter:
+    """Token bucket for page requests whose rate adapts AIMD style, shared by every session.
+
+    acquire() blocks until a token is available. Each healthy response adds
+    increase to the rate, up to max_rate. A throttling response, a challenge
+    or a response slower than slow_seconds multiplies it by decrease, down to
+    min_rate. Throttling and challenges also pause all sessions, for longer each
+    time in a row. Reports that arrive within decrease_interval of the last
+    decrease count as the same congestion event, so sessions that hit the same
+    throttle together do not collapse the rate.
+    """
+
+    def __init__(self, rate=0.5, min_rate=0.05, max_rate=2.0, burst=2.0, increase=0.05, decrease=0.5,
+                 slow_seconds=8.0, pause_seconds=10.0, max_pause_seconds=300.0, decrease_interval=2.0):
+        self.rate = min(max(rate, min_rate), max_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.burst = burst
+        self.increase = increase
+        self.decrease = decrease
+        self.slow_seconds = slow_seconds
+        self.pause_seconds = pause_seconds
+        self.max_pause_seconds = max_pause_seconds
+        self.decrease_interval = decrease_interval
+        self.lock = threading.Lock()
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.last_decrease = float("-inf")
+        self.consecutive_throttles = 0
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "healthy": 0, "slow": 0, "throttled": 0,
+                      "challenged": 0, "decreases": 0}
+
+    def refill(self, now) -> None:
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """Wait for a token; returns the seconds waited."""
+        start = time.monotonic()
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1:
+                    self.tokens -= 1
+                    waited = now - start
+                    self.stats["acquired"] += 1
+                    self.stats["waited_seconds"] += waited
+                    return waited
+                else:
+                    wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+    def report(self, outcome, latency=None, retry_after=None) -> None:
+        """Adjust the rate after a response: outcome is "ok", "throttled" or "challenged"."""
+        with self.lock:
+            now = time.monotonic()
+            if outcome == "ok" and (latency is None or latency <= self.slow_seconds):
+                self.stats["healthy"] += 1
+                self.consecutive_throttles = 0
+                self.rate = min(self.max_rate, self.rate + self.increase)
+                return
+            if outcome == "ok":
+                self.stats["slow"] += 1
+                self.slow_down(now, f"slow response ({latency:.1f}s)")
+                return
+            self.stats[outcome] += 1
+            self.consecutive_throttles += 1
+            pause = min(self.max_pause_seconds, self.pause_seconds * 2 ** (self.consecutive_throttles - 1))
+            if outcome == "challenged":
+                pause = self.max_pause_seconds
+            if retry_after is not None:
+                pause = max(pause, retry_after)
+            self.paused_until = max(self.paused_until, now + pause)
+            self.slow_down(now, f"{outcome}, pausing {pause:.0f}s")
+
+    def slow_down(self, now, reason) -> None:
+        # drop saved-up tokens so waiting sessions feel the new rate right away
+        self.tokens = min(self.tokens, 0.0)
+        self.refill(now)
+        if now - self.last_decrease < self.decrease_interval:
+            return
+        self.last_decrease = now
+        self.stats["decreases"] += 1
+        self.rate = max(self.min_rate, self.rate * self.decrease)
+        logger.warning(f"Rate limit lowered to {self.rate:.2f} requests/s: {reason}")
+
+    def summary(self) -> dict:
+        with self.lock:
+            return dict(self.stats, rate=self.rate)
+
+
+def classify_response(driver) -> str:
+    """Return "throttled", "challenged" or "ok" for the page the driver just loaded.
+
+    A real browser does not expose the status code, so challenges are recognised
+    by their url; drivers that know the status (FakeWebDriver.last_status) also
+    report throttling.
+    """
+    if getattr(driver, "last_status", None) in THROTTLE_STATUSES:
+        return "throttled"
+    if any(marker in (driver.current_url or "") for marker in CHALLENGE_URL_MARKERS):
+        return "challenged"
+    return "ok"
+
+
+class RateLimitedDriver:
+    """WebDriver proxy that takes a token from the shared limiter before each page request.
+
+    get() reports each response back to the limiter, with the server's
+    Retry-After when the driver knows it (FakeWebDriver.last_retry_after), and
+    retries a throttled navigation up to max_retries times before raising
+    ThrottledError; the scripts in RATE_LIMITED_SCRIPTS only take a token,
+    since their responses are not visible to the driver.
+    """
+
+    def __init__(self, driver, limiter, max_retries=2):
+        self.driver = driver
+        self.limiter = limiter
+        self.max_retries = max_retries
+
+    def __getattr__(self, name):
+        return getattr(self.driver, name)
+
+    def get(self, url):
+        for attempt in range(self.max_retries + 1):
+            self.limiter.acquire()
+            start = time.perf_counter()
+            self.driver.get(url)
+            outcome = classify_response(self.driver)
+            self.limiter.report(outcome, latency=time.perf_counter() - start,
+                                retry_after=getattr(self.driver, "last_retry_after", None))
+            if outcome != "throttled":
+                return
+            logger.warning(f"Throttled loading {url} (attempt {attempt + 1}/{self.max_retries + 1})")
+        logger.error(f"Still throttled loading {url} after {self.max_retries + 1} attempts")
+        raise ThrottledError(f"Throttled loading {url} after {self.max_retries + 1} attempts")
+
+    def execute_script(self, script, *args):
+        if script in RATE_LIMITED_SCRIPTS:
+            self.limiter.acquire()
+        return self.driver.execute_script(script, *args)
+
+
+_shared_limiter = None
+_shared_limiter_lock = threading.Lock()
+
+
+def shared_rate_limiter():
+    """Return the process-wide limiter configured by RATE_LIMIT (requests/s, 0 disables), RATE_LIMIT_MIN and RATE_LIMIT_MAX."""
+    global _shared_limiter
+    rate = float(os.getenv(RATE_LIMIT_ENV, "0.5"))
+    if rate <= 0:
+        return None
+    with _shared_limiter_lock:
+        if _shared_limiter is None:
+            _shared_limiter = AdaptiveRateLimiter(
+                rate=rate,
+                min_rate=float(os.getenv(RATE_LIMIT_MIN_ENV, "0.05")),
+                max_rate=float(os.getenv(RATE_LIMIT_MAX_ENV, "2.0")),
+            )
+        return _shared_limiter
+
+
+def rate_limited(driver, limiter):
+    """Wrap driver in a RateLimitedDriver, or return it unchanged when limiter is None."""
+    return driver if limiter is None else RateLimitedDriver(driver, limiter)
+
+
+def simulate_sessions(server_rate=4.0, sessions=4, requests_per_session=20, limiter=None, status=999) -> dict:
+    """Drive sessions FakeWebDrivers against a throttling StandInServer; returns what the server saw.
+
+    Without a limiter every session requests as fast as it can, as the scraper
+    would with its fixed sleeps removed.
+    """
+    from fake_webdriver import FakeWebDriver
+    from standin_server import ServerThrottle, StandInServer
+
+    page = "<html><body><div class=\"scaffold-finite-scroll\"></div></body></html>"
+    throttle = ServerThrottle(rate=server_rate, burst=server_rate, status=status, slow_seconds=0.2)
+    outcomes = {"ok": 0, "throttled": 0, "challenged": 0}
+    outcomes_lock = threading.Lock()
+
+    def run_session(session_id):
+        driver = FakeWebDriver(fetch_urls=True)
+        if limiter is not None:
+            driver = RateLimitedDriver(driver, limiter, max_retries=0)
+        for index in range(requests_per_session):
+            try:
+                driver.get(server.url(f"/in/session-{session_id}/details/skills/?page={index}"))
+            except ThrottledError:
+                pass  # counted below, like the unlimited sessions' throttled pages
+            with outcomes_lock:
+                outcomes[classify_response(driver)] += 1
+
+    with StandInServer({r"/in/.*": lambda path, query: page}, throttle=throttle) as server:
+        start = time.perf_counter()
+        threads = [threading.Thread(target=run_session, args=(session_id,)) for session_id in range(sessions)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    return {
+        "limited": limiter is not None,
+        "seconds": elapsed,
+        "requests": sum(outcomes.values()),
+        "ok": outcomes["ok"],
+        "throttled": outcomes["throttled"],
+        "ok_per_second": outcomes["ok"] / elapsed,
+        "final_rate": limiter.rate if limiter is not None else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run parallel sessions against a throttling stand-in server")
+    parser.add_argument("--server-rate", type=float, default=4.0, help="requests/s the server admits")
+    parser.add_argument("--sessions", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=20, help="requests per session")
+    args = parser.parse_args()
+
+    # throttled pages are expected here, the table counts them
+    logging.basicConfig(level=logging.CRITICAL)
+    print(f"{'mode':<10}{'seconds':>9}{'requests':>10}{'ok':>6}{'throttled':>11}{'ok/s':>8}{'final rate':>12}")
+    for adaptive in (False, True):
+        # start high, so the limiter has to find the server's rate
+        shared = AdaptiveRateLimiter(rate=args.server_rate * 2, max_rate=args.server_rate * 4, increase=0.2,
+                                     pause_seconds=1.0, max_pause_seconds=5.0, decrease_interval=0.5) if adaptive else None
+        result = simulate_sessions(args.server_rate, args.sessions, args.requests, shared)
+        final_rate = f"{result['final_rate']:.2f}" if result["final_rate"] is not None else "-"
+        print(f"{'aimd' if adaptive else 'none':<10}{result['seconds']:>9.2f}{result['requests']:>10}{result['ok']:>6}"
+              f"{result['throttled']:>11}{result['ok_per_second']:>8.2f}{final_rate:>12}")
@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from fake_webdriver import FakeWebDriver
+from linkedin_scraper import LINKEDIN_BASE_URL, login, go_to_skills_page, find_skill_containers, process_skill_modal
+import logging
+
+logger = logging.getLogger(__name__)
+
+LOGIN_URL = f"{LINKEDIN_BASE_URL}/login"
+FEED_URL = f"{LINKEDIN_BASE_URL}/feed/"
+BENCHMARK_USERNAME = "benchmark-user"
+SKILLS_URL = f"{LINKEDIN_BASE_URL}/in/{BENCHMARK_USERNAME}/details/skills/"
+SYNTHETIC_PROFILE_ID = "ACoAAAAsyntheticProfile0000000000000000"
+
+LOGIN_PAGE = f"""<html><body>
+<form action="{FEED_URL}">
+<input id="username" type="text"><input id="password" type="password">
+<button type="submit">Sign in</button>
+</form>
+</body></html>"""
+
+FEED_PAGE = """<html><body><div id="global-nav"></div></body></html>"""
+
+# same element structure as an ALL-SKILLS container in final_page_source.html,
+# without the styling classes and endorsement details
+SYNTHETIC_SKILL_TEMPLATE = """<li class="pvs-list__paged-list-item artdeco-list__item" id="profilePagedListComponent-{profile_id}-SKILLS-VIEW-DETAILS-profileTabSection-ALL-SKILLS-NONE-en-US-{index}">
+<div><div data-view-name="profile-component-entity">
+<div><div class="display-flex" aria-hidden="true"></div></div>
+<div class="display-flex flex-column full-width align-self-center">
+<div class="display-flex flex-row justify-space-between">
+<a data-field="skill_page_skill_topic" href="{base_url}/search/results/all/?keywords={name}">
+<div class="display-flex flex-wrap"><div class="display-flex"><div class="display-flex full-width"><div class="display-flex t-bold">
+<span aria-hidden="true">{name}</span><span class="visually-hidden">{name}</span>
+</div></div></div></div>
+</a>
+<div class="pvs-entity__action-container"><div><div>
+<a id="navigation-add-edit-deeplink-edit-skills" href="{base_url}/in/{username}/add-edit/SKILL_AND_ASSOCIATION/?skill={index}">
+<div class="pvs-navigation__icon"><svg role="img" aria-label="Edit {name}"><use href="#edit-medium"></use></svg></div>
+</a>
+</div></div></div>
+</div>
+<div class="pvs-entity__sub-components"><ul><li><span aria-hidden="true">{experiences} experiences</span></li></ul></div>
+</div></div></div>
+</li>
+"""
+
+SYNTHETIC_MODAL_TEMPLATE = """<div class="pe-edit-form-page__modal" role="dialog">
+<ul>{items}</ul>
+<button aria-label="Dismiss">Dismiss</button>
+</div>"""
+
+
+def synthetic_skills_page(skill_count, username=BENCHMARK_USERNAME, names=None) -> str:
+    """Return a skills page with skill_count ALL-SKILLS containers, named names or Synthetic Skill <index>."""
+    names = names or [f"Synthetic Skill {index}" for index in range(skill_count)]
+    items = "".join(
+        SYNTHETIC_SKILL_TEMPLATE.format(base_url=LINKEDIN_BASE_URL, profile_id=SYNTHETIC_PROFILE_ID,
+                                        username=username, index=index, name=names[index],
+                                        experiences=index % 7 + 1)
+        for index in range(skill_count)
+    )
+    return (
+        "<html><body><main><div class=\"scaffold-finite-scroll\"><div class=\"scaffold-finite-scroll__content\">"
+        f"<ul>{items}</ul></div></div></main></body></html>"
+    )
+
+
+def synthetic_modal(selected_item_count=5) -> str:
+    items = "".join(f'<li class="selected-item">Experience {index}</li>' for index in range(selected_item_count))
+    return SYNTHETIC_MODAL_TEMPLATE.format(items=items)
+
+
+def directory_bytes(directory) -> int:
+    total = 0
+    for root, _, files in os.walk(directory):
+        for file_name in files:
+            total += os.path.getsize(os.path.join(root, file_name))
+    return total
+
+
+class ReplayBenchmark:
+    """Runs the scraper stages against a FakeWebDriver and records metrics per stage.
+
+    Peak memory is only measured while tracemalloc is tracing, which slows the
+    stages down, so run_replay_benchmark measures it in a separate pass.
+    """
+
+    def __init__(self, work_dir):
+        self.work_dir = work_dir
+        self.stages = {}
+
+    @contextmanager
+    def stage(self, name, driver):
+        commands_before = sum(driver.command_counts.values())
+        bytes_before = directory_bytes(self.work_dir)
+        tracing = tracemalloc.is_tracing()
+        if tracing:
+            tracemalloc.reset_peak()
+            memory_before = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            entry = self.stages.setdefault(name, {
+                "calls": 0, "wall_seconds": 0.0, "webdriver_commands": 0, "bytes_written": 0, "peak_memory_bytes": 0,
+            })
+            entry["calls"] += 1
+            entry["wall_seconds"] += elapsed
+            entry["webdriver_commands"] += sum(driver.command_counts.values()) - commands_before
+            entry["bytes_written"] += directory_bytes(self.work_dir) - bytes_before
+            if tracing:
+                entry["peak_memory_bytes"] = max(entry["peak_memory_bytes"], tracemalloc.get_traced_memory()[1] - memory_before)
+
+    def run(self, skills_page, modal_skills):
+        driver = FakeWebDriver(
+            pages={LOGIN_URL: lambda: LOGIN_PAGE, FEED_URL: lambda: FEED_PAGE, SKILLS_URL: skills_page},
+            modal_source=synthetic_modal(),
+            auto_open_modal=True,
+        )
+        # parsing the page is the fake browser's work, keep it out of the stage timings
+        driver.preload(SKILLS_URL)
+        with self.stage("login", driver):
+            login(driver, "benchmark@example.com", "benchmark")
+        with self.stage("go_to_skills_page", driver):
+            go_to_skills_page(driver, BENCHMARK_USERNAME)
+        with self.stage("find_skill_containers", driver):
+            skills = find_skill_containers(driver, skill_handler=False)
+        for skill_name in skills[:modal_skills]:
+            with self.stage("process_skill_modal", driver):
+                process_skill_modal(driver, skill_name)
+        driver.quit()
+        return skills
+
+
+def run_profile(skills_page, modal_skills, trace_memory):
+    original_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as work_dir:
+        # files the scraper writes (page captures) land in work_dir and are counted
+        os.chdir(work_dir)
+        if trace_memory:
+            tracemalloc.start()
+        try:
+            benchmark = ReplayBenchmark(work_dir)
+            skills = benchmark.run(skills_page, modal_skills)
+        finally:
+            if trace_memory:
+                tracemalloc.stop()
+            os.chdir(original_dir)
+    return skills, benchmark.stages
+
+
+def run_replay_benchmark(page_file="final_page_source.html", synthetic_sizes=(500, 5000), modal_skills=20,
+                         trace_memory=True) -> dict:
+    """Benchmark the saved page and synthetic profiles; returns {profile: {"skills": n, "stages": {stage: metrics}}}."""
+    profiles = {}
+    if page_file:
+        profiles[os.path.basename(page_file)] = os.path.abspath(page_file)
+    for size in synthetic_sizes:
+        profiles[f"synthetic-{size}"] = (lambda size=size: synthetic_skills_page(size))
+
+    results = {}
+    for profile, skills_page in profiles.items():
+        skills, stages = run_profile(skills_page, modal_skills, trace_memory=False)
+        if trace_memory:
+            _, traced_stages = run_profile(skills_page, modal_skills, trace_memory=True)
+            for stage, entry in stages.items():
+                entry["peak_memory_bytes"] = traced_stages[stage]["peak_memory_bytes"]
+        results[profile] = {"skills": len(skills), "stages": stages}
+    return results
+
+
+def print_report(results) -> None:
+    print(f"{'profile':<28}{'stage':<24}{'calls':>6}{'wall s':>10}{'commands':>10}{'bytes written':>15}{'peak MB':>10}")
+    for profile, result in results.items():
+        for stage, entry in result["stages"].items():
+            print(f"{profile:<28}{stage:<24}{entry['calls']:>6}{entry['wall_seconds']:>10.3f}"
+                  f"{entry['webdriver_commands']:>10}{entry['bytes_written']:>15,}"
+                  f"{entry['peak_memory_bytes'] / 1e6:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay the scraper against a fake WebDriver and report per-stage metrics")
+    parser.add_argument("--page", default="final_page_source.html", help="saved skills page to replay")
+    parser.add_argument("--sizes", default="500,5000", help="comma separated synthetic profile sizes")
+    parser.add_argument("--modal-skills", type=int, default=20, help="number of skills to run process_skill_modal on")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass for peak memory")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    # the scraper logs every skill; keep the report readable
+    logging.basicConfig(level=logging.CRITICAL)
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    benchmark_results = run_replay_benchmark(args.page, sizes, args.modal_skills, trace_memory=not args.no_memory)
+    print_report(benchmark_results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(benchmark_results, file, indent=2)
@@ -0,0 +1,318 @@
+import json
+import os
+import threading
+import time
+import logging
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE_NAME = "checkpoint.json"
+SEGMENT_FILE_PATTERN = "results-{:05d}.jsonl"
+
+
+def write_file_atomically(file_path, text) -> None:
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w") as file:
+        file.write(text)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, file_path)
+
+
+class ResultStore:
+    """Append-only JSONL store for scraped skill data with a resumable checkpoint.
+
+    Records are buffered and appended to the current segment in one write per
+    batch, then a checkpoint with the flushed segment/offset and the done
+    profiles is replaced atomically, so its size does not grow with the
+    number of skills. On open the per-skill state is rebuilt by replaying
+    every complete line of the segments; a torn last line left by a crash is
+    ignored and overwritten.
+
+    A skill whose handler failed is recorded as failed until a later record
+    for it succeeds, and a profile is only marked done once every skill it
+    listed has been recorded.
+
+    Skill records may carry the list-page fingerprint they were scraped with;
+    the latest fingerprint per skill is kept so a later run can tell which
+    skills changed.
+    """
+
+    def __init__(self, directory, batch_size=50, flush_interval=5.0, segment_max_bytes=64 * 1024 * 1024):
+        self.directory = directory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.segment_max_bytes = segment_max_bytes
+        self.lock = threading.RLock()
+        self.buffer = []
+        self.last_flush = time.monotonic()
+        self.segment = 1
+        self.offset = 0
+        self.done_profiles = set()
+        self.done_skills = {}
+        self.failed_skills = {}
+        self.skill_fingerprints = {}
+        os.makedirs(directory, exist_ok=True)
+        self.load_checkpoint()
+        self.replay()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def checkpoint_path(self):
+        return os.path.join(self.directory, CHECKPOINT_FILE_NAME)
+
+    def segment_path(self, segment):
+        return os.path.join(self.directory, SEGMENT_FILE_PATTERN.format(segment))
+
+    def load_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, "r") as file:
+            checkpoint = json.load(file)
+        self.segment = checkpoint["segment"]
+        self.offset = checkpoint["offset"]
+        self.done_profiles = set(checkpoint["done_profiles"])
+
+    def replay(self):
+        """Rebuild the per-skill state from every complete record in the segments."""
+        checkpoint_position = (self.segment, self.offset)
+        segment = 1
+        while os.path.exists(self.segment_path(segment)):
+            offset = 0
+            with open(self.segment_path(segment), "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break  # torn write from a crash, it is overwritten by the next flush
+                    self.apply(json.loads(line))
+                    offset += len(line)
+            self.segment, self.offset = segment, offset
+            segment += 1
+        if (self.segment, self.offset) < checkpoint_position:
+            logger.warning(f"Result store {self.directory} ends before its checkpoint, "
+                           f"resuming from segment {self.segment} offset {self.offset}")
+        if self.done_profiles or self.done_skills:
+            logger.info(f"Resuming result store: {len(self.done_profiles)} profiles done, "
+                        f"{sum(len(skills) for skills in self.done_skills.values())} skills done")
+
+    def apply(self, record):
+        if record["type"] == "skill":
+            self.done_skills.setdefault(record["profile"], set()).add(record["name"])
+            self.failed_skills.get(record["profile"], set()).discard(record["name"])
+            if record.get("fingerprint") is not None:
+                self.skill_fingerprints.setdefault(record["profile"], {})[record["name"]] = record["fingerprint"]
+        elif record["type"] == "skill_fingerprint":
+            self.skill_fingerprints.setdefault(record["profile"], {})[record["name"]] = record["fingerprint"]
+        elif record["type"] == "skill_failed":
+            self.failed_skills.setdefault(record["profile"], set()).add(record["name"])
+        elif record["type"] == "skill_removed":
+            self.done_skills.get(record["profile"], set()).discard(record["name"])
+            self.failed_skills.get(record["profile"], set()).discard(record["name"])
+            self.skill_fingerprints.get(record["profile"], {}).pop(record["name"], None)
+        elif record["type"] == "profile_done":
+            self.done_profiles.add(record["profile"])
+
+    def is_profile_done(self, profile) -> bool:
+        with self.lock:
+            return profile in self.done_profiles
+
+    def is_skill_done(self, profile, skill_name) -> bool:
+        with self.lock:
+            return skill_name in self.done_skills.get(profile, ())
+
+    def skill_fingerprint(self, profile, skill_name):
+        """Return the fingerprint stored with the latest record of the skill, or None."""
+        with self.lock:
+            return self.skill_fingerprints.get(profile, {}).get(skill_name)
+
+    def fingerprinted_skills(self, profile) -> set:
+        with self.lock:
+            return set(self.skill_fingerprints.get(profile, {}))
+
+    def append(self, record) -> None:
+        with self.lock:
+            self.buffer.append(record)
+            self.apply(record)
+            if len(self.buffer) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+
+    def append_skill(self, profile, skill_data) -> None:
+        self.append(dict(skill_data, type="skill", profile=profile))
+
+    def mark_skills_removed(self, profile, skill_names) -> None:
+        for skill_name in sorted(skill_names):
+            logger.info("%s no longer lists %s", profile, skill_name)
+            self.append({"type": "skill_removed", "profile": profile, "name": skill_name})
+
+    def mark_skill_failed(self, profile, skill_name, reason) -> None:
+        self.append({"type": "skill_failed", "profile": profile, "name": skill_name, "reason": reason})
+
+    def incomplete_skills(self, profile, skill_names) -> list:
+        """Return the skill_names that have no record yet or whose latest attempt failed."""
+        with self.lock:
+            done = self.done_skills.get(profile, set())
+            failed = self.failed_skills.get(profile, set())
+            return [skill_name for skill_name in skill_names if skill_name not in done or skill_name in failed]
+
+    def mark_profile_done(self, profile, skill_names=()) -> bool:
+        """Mark profile done if every one of skill_names was recorded; returns whether it was marked.
+
+        A profile with missing or failed skills stays open, so a resumed run retries them.
+        """
+        incomplete = self.incomplete_skills(profile, skill_names)
+        if incomplete:
+            logger.warning(f"{profile} is not complete, {len(incomplete)} skills were not recorded: "
+                           f"{', '.join(incomplete)}")
+            self.flush()
+            return False
+        self.append({"type": "profile_done", "profile": profile})
+        self.flush()
+        return True
+
+    def flush(self) -> None:
+        with self.lock:
+            self.last_flush = time.monotonic()
+            if not self.buffer:
+                return
+            data = "".join(json.dumps(record) + "\n" for record in self.buffer).encode()
+            if self.offset > 0 and self.offset + len(data) > self.segment_max_bytes:
+                self.segment += 1
+                self.offset = 0
+            mode = "r+b" if os.path.exists(self.segment_path(self.segment)) else "wb"
+            with open(self.segment_path(self.segment), mode) as file:
+                file.seek(self.offset)
+                file.write(data)
+                file.truncate()
+                file.flush()
+                os.fsync(file.fileno())
+            self.offset += len(data)
+            logger.debug("Flushed %d records to segment %d", len(self.buffer), self.segment)
+            self.buffer = []
+            self.write_checkpoint()
+
+    def write_checkpoint(self):
+        checkpoint = {
+            "segment": self.segment,
+            "offset": self.offset,
+            "done_profiles": sorted(self.done_profiles),
+        }
+        write_file_atomically(self.checkpoint_path, json.dumps(checkpoint))
+
+    def iter_records(self, record_type="skill"):
+        """Yield every flushed record of record_type in the order it was appended."""
+        self.flush()
+        segment = 1
+        while os.path.exists(self.segment_path(segment)):
+            with open(self.segment_path(segment), "rb") as file:
+                for line in file:
+                    if not line.endswith(b"\n"):
+                        break
+                    record = json.loads(line)
+                    if record_type is None or record["type"] == record_type:
+                        yield record
+            segment += 1
+
+    def current_skills(self, profile) -> dict:
+        """Return {skill_name: latest skill record} for profile, without skills removed since."""
+        skills = {}
+        for record in self.iter_records(record_type=None):
+            if record.get("profile") != profile:
+                continue
+            if record["type"] == "skill":
+                skills[record["name"]] = record
+            elif record["type"] == "skill_removed":
+                skills.pop(record["name"], None)
+        return skills
+
+    def close(self) -> None:
+        self.flush()
+
+
+def run_skill_handler(result_store, profile, skill_handler, driver, skill_name):
+    """Return skill_handler(driver, skill_name), recording a failure in result_store when it raises or returns None."""
+    try:
+        selected_items = skill_handler(driver, skill_name)
+    except Exception as e:
+        result_store.mark_skill_failed(profile, skill_name, str(e))
+        raise
+    if selected_items is None:
+        result_store.mark_skill_failed(profile, skill_name, "no result")
+    return selected_items
+
+
+def recording_skill_handler(result_store, profile, skill_handler):
+    """Wrap skill_handler so finished skills are skipped and new results are appended to result_store."""
+    def handle_skill(driver, skill_name):
+        if result_store.is_skill_done(profile, skill_name):
+            logger.info("Skipping %s for %s, already in the result store", skill_name, profile)
+            return []
+        selected_items = run_skill_handler(result_store, profile, skill_handler, driver, skill_name)
+        if selected_items is None:
+            return None
+        result_store.append_skill(profile, {
+            "name": skill_name,
+            "selected_items": [item if isinstance(item, str) else item.text for item in selected_items],
+        })
+        return selected_items
+    return handle_skill
+
+
+def reuse_stored_skill(result_store, profile, skill_name, fingerprint) -> bool:
+    """Return whether the stored record of skill_name is still current, given its fingerprint on the list page.
+
+    A skill whose content fingerprint matches the stored one, and whose last
+    attempt did not fail, keeps its stored record; a position-only change just
+    updates the stored fingerprint.
+    """
+    stored = result_store.skill_fingerprint(profile, skill_name)
+    if fingerprint is None or stored is None or stored["content"] != fingerprint["content"]:
+        return False
+    if result_store.incomplete_skills(profile, [skill_name]):
+        return False
+    if stored["position"] != fingerprint["position"]:
+        result_store.append({"type": "skill_fingerprint", "profile": profile, "name": skill_name,
+                             "fingerprint": fingerprint})
+    logger.info("Reusing %s for %s, unchanged since it was scraped", skill_name, profile)
+    return True
+
+
+def refreshing_skill_handler(result_store, profile, fingerprints, skill_handler):
+    """Wrap skill_handler so only new or changed skills are scraped and appended to result_store.
+
+    fingerprints maps skill names to their fingerprint on the current list page
+    (find_skill_containers fills it as it discovers skills); unchanged skills
+    keep their stored record, see reuse_stored_skill.
+    """
+    def handle_skill(driver, skill_name):
+        fingerprint = fingerprints.get(skill_name)
+        if reuse_stored_skill(result_store, profile, skill_name, fingerprint):
+            return []
+        selected_items = run_skill_handler(result_store, profile, skill_handler, driver, skill_name)
+        if selected_items is None:
+            return None
+        result_store.append_skill(profile, {
+            "name": skill_name,
+            "selected_items": [item if isinstance(item, str) else item.text for item in selected_items],
+            "fingerprint": fingerprint,
+        })
+        return selected_items
+    return handle_skill
+
+
+def record_removed_skills(result_store, profile, listed_skills, pagination) -> None:
+    """Mark profile's stored skills that are not in listed_skills as removed, if the whole list was loaded.
+
+    pagination is find_skill_containers' report: a list cut short by a slow or
+    failed page load lacks skills that are still on the profile.
+    """
+    if not listed_skills:
+        return
+    if not pagination.get("complete"):
+        logger.warning(f"Not checking {profile} for removed skills, the skills list was not loaded completely "
+                       f"({pagination.get('stop_reason')})")
+        return
+    result_store.mark_skills_removed(profile, result_store.fingerprinted_skills(profile) - set(listed_skills))
@@ -0,0 +1,106 @@
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from element_handle import ElementHandle, skill_container_locators
+from skill_harvester import ALL_SKILLS_CONTAINER_SELECTOR, parse_skill_name
+import logging
+
+logger = logging.getLogger(__name__)
+
+# one pass over the ALL-SKILLS containers: [aria-label, container, document offset, id]
+SKILL_SCROLL_MAP_JS = """
+var containers = document.querySelectorAll(arguments[0]);
+var entries = [];
+for (var i = 0; i < containers.length; i++) {
+    var svg = containers[i].querySelector('div.pvs-navigation__icon svg[aria-label]');
+    entries.push([
+        svg ? svg.getAttribute('aria-label') : null,
+        containers[i],
+        containers[i].getBoundingClientRect().top + window.scrollY,
+        containers[i].id
+    ]);
+}
+return entries;
+"""
+
+# scrolls only when the container is outside the viewport (less the margin),
+# placing it margin pixels below the top; returns whether the page moved
+SCROLL_INTO_VIEW_JS = """
+var element = arguments[0], margin = arguments[1];
+var top = element.getBoundingClientRect().top + window.scrollY;
+var y = window.scrollY;
+if (top >= y + margin && top <= y + window.innerHeight - margin) {
+    return false;
+}
+window.scrollTo(0, Math.max(0, top - margin));
+return window.scrollY !== y;
+"""
+
+class ScrollPlanner:
+    """Maps skill names to their container handle and offset in one script call.
+
+    Visiting a skill is then a dict lookup plus at most one scroll, instead of a
+    document-wide XPath search and separate offset and scroll calls. The map is
+    rebuilt when a skill is missing (the list grew); a container that went stale
+    (the list was re-rendered) is looked up again by its id or aria-label alone.
+    """
+
+    def __init__(self, driver, selector=ALL_SKILLS_CONTAINER_SELECTOR, margin=100):
+        self.driver = driver
+        self.selector = selector
+        self.margin = margin
+        self.entries = {}
+        self.refreshes = 0
+        self.scrolls = 0
+
+    def refresh(self) -> None:
+        self.refreshes += 1
+        self.entries = {}
+        for aria_label, element, top, container_id in self.driver.execute_script(SKILL_SCROLL_MAP_JS, self.selector) or []:
+            skill_name = parse_skill_name(aria_label)
+            if skill_name is not None:
+                self.entries.setdefault(skill_name, (element, top, container_id))
+        logger.debug("Scroll map has %d skills", len(self.entries))
+
+    def plan(self, skill_names) -> list:
+        """Return skill_names in document order, so visiting them only scrolls forward; unknown skills go last."""
+        if any(skill_name not in self.entries for skill_name in skill_names):
+            self.refresh()
+        known = [skill_name for skill_name in skill_names if skill_name in self.entries]
+        known.sort(key=lambda skill_name: self.entries[skill_name][1])
+        return known + [skill_name for skill_name in skill_names if skill_name not in self.entries]
+
+    def scroll_to(self, skill_name):
+        """Bring the skill's container into view; returns (container handle, moved) or (None, False) if the skill is not on the page."""
+        if skill_name not in self.entries:
+            self.refresh()
+        entry = self.entries.get(skill_name)
+        if entry is None:
+            return None, False
+        element, top, container_id = entry
+        handle = ElementHandle(self.driver, skill_container_locators(skill_name, container_id, self.selector),
+                               element=element, description=f"container of {skill_name}")
+        try:
+            moved = handle.execute_script(SCROLL_INTO_VIEW_JS, self.margin)
+        except (StaleElementReferenceException, NoSuchElementException):
+            logger.warning("%s is no longer on the page", skill_name)
+            self.entries.pop(skill_name, None)
+            return None, False
+        if handle.recoveries:
+            self.entries[skill_name] = (handle.current, top, container_id)
+        if moved:
+            self.scrolls += 1
+        return handle, bool(moved)
+
+
+def scroll_planner_for(driver) -> ScrollPlanner:
+    """Return the driver's ScrollPlanner, creating it on first use.
+
+    The planner lives on the driver itself: its map holds elements, which
+    reference their driver, so a cache keyed by driver would keep every driver
+    alive. As an attribute it is collected with the driver.
+    """
+    # vars(), not getattr(): proxies such as TracingDriver forward unknown
+    # attributes to the driver they wrap
+    planner = vars(driver).get("scroll_planner")
+    if planner is None:
+        planner = driver.scroll_planner = ScrollPlanner(driver)
+    return planner
@@ -0,0 +1,293 @@
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from bs4 import BeautifulSoup
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.by import By
+from fake_webdriver import select
+from linkedin_scraper import (SKILL_CONTAINER_SELECTOR, SKILL_MODAL_SELECTOR, SELECTED_ITEM_SELECTOR,
+                              SKILLS_LIST_XPATH, DISMISS_BUTTON_XPATH)
+from skill_harvester import ALL_SKILLS_CONTAINER_SELECTOR, HARVEST_SKILL_CONTAINERS_JS, parse_skill_name
+from skills_extractor import LIVE_CONTAINER_XPATH, LIVE_ICON_XPATH, LIVE_SVG_XPATH, extract_skills_from_source
+from snapshot_store import INDEX_FILE_NAME, SnapshotStore
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_SUFFIXES = (".html", ".htm", ".txt", ".txt.gz", ".html.gz", ".txt.zst", ".html.zst")
+
+# the per-container lookups inside HARVEST_SKILL_CONTAINERS_JS, which is
+# checked to still contain them so the two cannot drift apart
+HARVEST_ICON_SELECTOR = "div.pvs-navigation__icon"
+HARVEST_SVG_SELECTOR = "svg[aria-label]"
+HARVEST_EDIT_LINK_SELECTOR = "a[id^='navigation-add-edit-deeplink-edit-skills']"
+HARVEST_SUMMARY_SELECTOR = ".pvs-entity__sub-components"
+HARVEST_ARIA_LABEL_FALLBACK_PATTERN = re.compile(r'aria-label="(Edit[^"]*)"')
+
+# (check, kind, locator): page checks count matches in the document,
+# container checks count the ALL-SKILLS containers they match in
+SKILLS_PAGE_CHECKS = [
+    ("skills_list", "page", (By.XPATH, SKILLS_LIST_XPATH)),
+    ("skill_containers", "page", (By.CSS_SELECTOR, SKILL_CONTAINER_SELECTOR)),
+    ("all_skills_containers", "page", (By.CSS_SELECTOR, ALL_SKILLS_CONTAINER_SELECTOR)),
+    ("live_containers", "page", (By.XPATH, LIVE_CONTAINER_XPATH)),
+    ("navigation_icon", "container", (By.CSS_SELECTOR, HARVEST_ICON_SELECTOR)),
+    ("edit_svg", "container", (By.CSS_SELECTOR, f"{HARVEST_ICON_SELECTOR} {HARVEST_SVG_SELECTOR}")),
+    ("live_icon", "container", (By.XPATH, LIVE_ICON_XPATH)),
+    ("edit_link", "container", (By.CSS_SELECTOR, HARVEST_EDIT_LINK_SELECTOR)),
+]
+PAGE_CHECK_NAMES = {check for check, kind, _ in SKILLS_PAGE_CHECKS if kind == "page"}
+# reported, but allowed to match fewer containers (or none)
+OPTIONAL_CHECKS = {"summary", "edit_label_fallback"}
+MODAL_PAGE_CHECKS = [
+    ("skill_modal", "page", (By.CSS_SELECTOR, SKILL_MODAL_SELECTOR)),
+    ("selected_items", "page", (By.CSS_SELECTOR, SELECTED_ITEM_SELECTOR)),
+    ("dismiss_button", "page", (By.XPATH, DISMISS_BUTTON_XPATH)),
+]
+REQUIRED_MODAL_CHECKS = ("skill_modal", "dismiss_button")
+
+_stores = {}
+
+
+def verify_harvest_selectors() -> None:
+    for selector in (HARVEST_ICON_SELECTOR, HARVEST_SVG_SELECTOR, HARVEST_EDIT_LINK_SELECTOR,
+                     HARVEST_SUMMARY_SELECTOR):
+        if selector not in HARVEST_SKILL_CONTAINERS_JS:
+            raise ValueError(f"HARVEST_SKILL_CONTAINERS_JS no longer uses {selector}, update selector_check")
+
+
+def checks_fingerprint() -> str:
+    """Hash of everything a check result depends on, so cached results expire when a selector changes."""
+    definition = repr((SKILLS_PAGE_CHECKS, MODAL_PAGE_CHECKS, sorted(OPTIONAL_CHECKS),
+                       HARVEST_ARIA_LABEL_FALLBACK_PATTERN.pattern, HARVEST_SKILL_CONTAINERS_JS))
+    return hashlib.sha1(definition.encode("utf-8")).hexdigest()
+
+
+def find_snapshots(paths) -> list:
+    """Expand files, directories and snapshot store directories into (label, source) pairs.
+
+    source is a file path, or (store directory, hash) for a capture in a SnapshotStore.
+    """
+    snapshots = []
+    for path in paths:
+        if os.path.isfile(os.path.join(path, INDEX_FILE_NAME)):
+            store = SnapshotStore(path)
+            for digest, entry in store.objects.items():
+                label = f"{path}:{entry['profile'] or '-'}/{entry['stage'] or '-'}@{digest[:12]}"
+                snapshots.append((label, (path, digest)))
+        elif os.path.isdir(path):
+            for directory, _, file_names in sorted(os.walk(path)):
+                for file_name in sorted(file_names):
+                    if file_name.endswith(SNAPSHOT_SUFFIXES):
+                        file_path = os.path.join(directory, file_name)
+                        snapshots.append((file_path, file_path))
+        else:
+            snapshots.append((path, path))
+    return snapshots
+
+
+def read_snapshot(source) -> bytes:
+    if isinstance(source, tuple):
+        directory, digest = source
+        store = _stores.get(directory)
+        if store is None:
+            store = _stores[directory] = SnapshotStore(directory)
+        return store.load(digest)
+    with open(source, "rb") as file:
+        data = file.read()
+    if source.endswith(".gz"):
+        return gzip.decompress(data)
+    if source.endswith(".zst"):
+        if zstandard is None:
+            raise ValueError("zstd snapshots need the zstandard package")
+        return zstandard.ZstdDecompressor().stream_reader(data).read()
+    return data
+
+
+def snapshot_kind(label, page_source) -> str:
+    """Classify by name and by markers that do not depend on the selectors under test."""
+    name = os.path.basename(label).lower()
+    if "error" in name:
+        return "error"
+    if "modal" in name or "skill_and_association" in name or "pe-edit-form-page" in page_source:
+        return "modal"
+    return "skills"
+
+
+def count_matches(root, locator) -> int:
+    return len(select(root, *locator))
+
+
+def check_skills_page(soup, page_source) -> tuple:
+    counts = {}
+    for check, kind, locator in SKILLS_PAGE_CHECKS:
+        if kind == "page":
+            counts[check] = count_matches(soup, locator)
+    containers = select(soup, By.CSS_SELECTOR, ALL_SKILLS_CONTAINER_SELECTOR)
+    for check, kind, locator in SKILLS_PAGE_CHECKS:
+        if kind == "container":
+            counts[check] = sum(1 for container in containers if select(container, *locator))
+    names = fallback = summaries = live_svgs = 0
+    for container in containers:
+        icon = container.select_one(HARVEST_ICON_SELECTOR)
+        svg = icon.select_one(HARVEST_SVG_SELECTOR) if icon is not None else None
+        if svg is not None:
+            names += parse_skill_name(svg.get("aria-label")) is not None
+        if icon is not None and HARVEST_ARIA_LABEL_FALLBACK_PATTERN.search(str(icon)):
+            fallback += 1
+        live_icons = select(container, By.XPATH, LIVE_ICON_XPATH)
+        live_svgs += bool(live_icons and select(live_icons[0], By.XPATH, LIVE_SVG_XPATH))
+        summaries += container.select_one(HARVEST_SUMMARY_SELECTOR) is not None
+    counts["live_svg"] = live_svgs
+    counts["edit_label_pattern"] = names
+    counts["edit_label_fallback"] = fallback
+    counts["summary"] = summaries
+    counts["offline_extractor"] = len(extract_skills_from_source(page_source))
+
+    # page checks must match something, the rest must match every container
+    failures = []
+    for check, count in counts.items():
+        if check in OPTIONAL_CHECKS:
+            continue
+        if count == 0 or (check not in PAGE_CHECK_NAMES and count < len(containers)):
+            failures.append(check)
+    return counts, failures
+
+
+def check_modal_page(soup) -> tuple:
+    counts = {check: count_matches(soup, locator) for check, _, locator in MODAL_PAGE_CHECKS}
+    return counts, [check for check in REQUIRED_MODAL_CHECKS if counts[check] == 0]
+
+
+def check_snapshot(snapshot) -> dict:
+    """Run the checks for one (label, source) snapshot; runs in a worker process."""
+    label, source = snapshot
+    start = time.perf_counter()
+    result = {"snapshot": label, "kind": None, "bytes": 0, "counts": {}, "failures": [], "error": None}
+    try:
+        data = read_snapshot(source)
+        page_source = data.decode("utf-8", errors="replace")
+        result["bytes"] = len(data)
+        result["kind"] = snapshot_kind(label, page_source)
+        if result["kind"] != "error":
+            soup = BeautifulSoup(page_source, "html.parser")
+            if result["kind"] == "modal":
+                result["counts"], result["failures"] = check_modal_page(soup)
+            else:
+                result["counts"], result["failures"] = check_skills_page(soup, page_source)
+    except (OSError, ValueError, WebDriverException) as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def content_key(label, source) -> str:
+    """Key for a snapshot's content and name-derived kind: file sha1, or the store's own sha256."""
+    if isinstance(source, tuple):
+        digest = f"sha256:{source[1]}"
+    else:
+        sha1 = hashlib.sha1()
+        with open(source, "rb") as file:
+            for block in iter(lambda: file.read(1024 * 1024), b""):
+                sha1.update(block)
+        digest = f"sha1:{sha1.hexdigest()}"
+    return f"{digest}:{snapshot_kind(label, '')}"
+
+
+def load_cache(cache_path, fingerprint) -> dict:
+    if not cache_path or not os.path.exists(cache_path):
+        return {}
+    with open(cache_path, "r") as file:
+        cache = json.load(file)
+    return cache["results"] if cache.get("checks") == fingerprint else {}
+
+
+def save_cache(cache_path, fingerprint, results) -> None:
+    cached = {result["key"]: result for result in results if not result["error"]}
+    temp_path = f"{cache_path}.tmp"
+    with open(temp_path, "w") as file:
+        json.dump({"checks": fingerprint, "results": cached}, file)
+    os.replace(temp_path, cache_path)
+
+
+def run_checks(paths, workers=None, cache_path=None) -> list:
+    """Check every snapshot under paths in a process pool; returns one result per snapshot, in input order.
+
+    With cache_path, snapshots whose content and checks are unchanged since the
+    last run reuse their cached result, so a release check only parses new
+    captures.
+    """
+    verify_harvest_selectors()
+    snapshots = find_snapshots(paths)
+    fingerprint = checks_fingerprint()
+    cache = load_cache(cache_path, fingerprint)
+    results = [None] * len(snapshots)
+    # identical captures (the same page saved at several stages) are checked once
+    pending = {}
+    for position, (label, source) in enumerate(snapshots):
+        key = content_key(label, source)
+        cached = cache.get(key)
+        if cached is not None:
+            results[position] = dict(cached, snapshot=label, cached=True)
+        else:
+            pending.setdefault(key, []).append(position)
+    logger.info(f"Checking {len(pending)} distinct of {len(snapshots)} snapshots "
+                f"({sum(result is not None for result in results)} cached)")
+    if pending:
+        keys = list(pending)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            checked = pool.map(check_snapshot, [snapshots[pending[key][0]] for key in keys],
+                               chunksize=max(1, len(keys) // ((workers or os.cpu_count() or 1) * 4)))
+            for key, result in zip(keys, checked):
+                result["key"] = key
+                for position in pending[key]:
+                    results[position] = dict(result, snapshot=snapshots[position][0])
+    if cache_path:
+        save_cache(cache_path, fingerprint, results)
+    return results
+
+
+def print_report(results) -> int:
+    """Print match counts per snapshot and return the number of failing snapshots."""
+    failed = 0
+    for result in results:
+        ok = not result["failures"] and not result["error"]
+        failed += not ok
+        status = "ok" if ok else "FAIL"
+        counts = " ".join(f"{check}={count}" for check, count in result["counts"].items())
+        print(f"{status:<5}{result['kind'] or '-':<7}{result['snapshot']}  {counts}")
+        if result["failures"]:
+            print(f"      failing: {', '.join(result['failures'])}")
+        if result["error"]:
+            print(f"      error: {result['error']}")
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check the scraper's selectors and regexes against saved snapshots")
+    parser.add_argument("paths", nargs="+", help="snapshot files, directories of them, or snapshot store directories")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per cpu)")
+    parser.add_argument("--cache", help="reuse results for unchanged snapshots from this file")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    start = time.perf_counter()
+    check_results = run_checks(args.paths, workers=args.workers, cache_path=args.cache)
+    failed_count = print_report(check_results)
+    print(f"{len(check_results)} snapshots, {failed_count} failing, {time.perf_counter() - start:.1f}s")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(check_results, file, indent=2)
+    sys.exit(1 if failed_count else 0)
@@ -0,0 +1,169 @@
+import json
+import os
+import threading
+import time
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+import logging
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:
+    Fernet = None
+    InvalidToken = None
+
+logger = logging.getLogger(__name__)
+
+# a local stand-in server (see standin_server.py) can take the live site's place
+LINKEDIN_BASE_URL = os.getenv("LINKEDIN_BASE_URL", "https://www.linkedin.com")
+LINKEDIN_HOME_URL = f"{LINKEDIN_BASE_URL}/"
+SESSION_PROBE_URL = f"{LINKEDIN_BASE_URL}/feed/"
+SESSION_COOKIE_NAME = "li_at"
+SESSION_CACHE_KEY_ENV = "SESSION_CACHE_KEY"
+SESSION_CACHE_FILE_ENV = "SESSION_CACHE_FILE"
+
+READ_LOCAL_STORAGE_JS = """
+var items = {};
+for (var i = 0; i < window.localStorage.length; i++) {
+    var key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+WRITE_LOCAL_STORAGE_JS = """
+var items = arguments[0];
+for (var key in items) {
+    window.localStorage.setItem(key, items[key]);
+}
+"""
+
+
+def session_cache_from_env():
+    """Return a SessionCache when SESSION_CACHE_FILE and SESSION_CACHE_KEY are set, otherwise None.
+
+    Setting only one of them is a configuration error and raises ValueError.
+    """
+    cache_file_path = os.getenv(SESSION_CACHE_FILE_ENV)
+    key = os.getenv(SESSION_CACHE_KEY_ENV)
+    if not cache_file_path and not key:
+        return None
+    if not cache_file_path or not key:
+        missing = SESSION_CACHE_KEY_ENV if cache_file_path else SESSION_CACHE_FILE_ENV
+        raise ValueError(f"The session cache needs both {SESSION_CACHE_FILE_ENV} and {SESSION_CACHE_KEY_ENV}; "
+                         f"{missing} is not set")
+    return SessionCache(cache_file_path, key)
+
+
+def generate_key() -> str:
+    """Return a new key for SESSION_CACHE_KEY."""
+    if Fernet is None:
+        raise RuntimeError("The session cache needs the cryptography package: pip install cryptography")
+    return Fernet.generate_key().decode()
+
+
+class SessionCache:
+    """Encrypted on-disk cache of the cookies and local storage of a logged-in session.
+
+    Safe to share between the sessions of a SessionPool: saves are serialized and
+    written atomically so a reader never sees a partial file.
+    """
+
+    def __init__(self, cache_file_path, key=None):
+        if Fernet is None:
+            raise RuntimeError("The session cache needs the cryptography package: pip install cryptography")
+        key = key or os.getenv(SESSION_CACHE_KEY_ENV)
+        if not key:
+            raise ValueError(f"Session cache key should be given or set in {SESSION_CACHE_KEY_ENV}")
+        self.cache_file_path = cache_file_path
+        self.fernet = Fernet(key.encode() if isinstance(key, str) else key)
+        self.lock = threading.Lock()
+
+    def save(self, driver) -> None:
+        state = {
+            "saved_at": time.time(),
+            "cookies": driver.get_cookies(),
+            "local_storage": driver.execute_script(READ_LOCAL_STORAGE_JS) or {},
+        }
+        token = self.fernet.encrypt(json.dumps(state).encode())
+        with self.lock:
+            temp_path = f"{self.cache_file_path}.tmp"
+            with open(temp_path, "wb") as file:
+                file.write(token)
+            os.chmod(temp_path, 0o600)
+            os.replace(temp_path, self.cache_file_path)
+        logger.info(f"Saved session with {len(state['cookies'])} cookies to {self.cache_file_path}")
+
+    def load(self):
+        """Return the decrypted session state, or None if there is no usable cache."""
+        if not os.path.exists(self.cache_file_path):
+            return None
+        with self.lock:
+            with open(self.cache_file_path, "rb") as file:
+                token = file.read()
+        try:
+            return json.loads(self.fernet.decrypt(token))
+        except InvalidToken:
+            logger.warning(f"Could not decrypt session cache {self.cache_file_path}, ignoring it")
+            return None
+
+    def clear(self) -> None:
+        with self.lock:
+            if os.path.exists(self.cache_file_path):
+                os.remove(self.cache_file_path)
+
+    def restore(self, driver) -> bool:
+        """Load the cached cookies and local storage into driver. Returns False when nothing usable is cached."""
+        state = self.load()
+        if state is None or not has_live_session_cookie(state["cookies"]):
+            return False
+        # cookies can only be set for the domain that is currently loaded
+        driver.get(LINKEDIN_HOME_URL)
+        for cookie in state["cookies"]:
+            cookie = {key: value for key, value in cookie.items() if key != "sameSite"}
+            if "expiry" in cookie:
+                cookie["expiry"] = int(cookie["expiry"])
+            try:
+                driver.add_cookie(cookie)
+            except WebDriverException as e:
+                logger.warning(f"Could not restore cookie {cookie.get('name')}: {str(e)}")
+        if state["local_storage"]:
+            driver.execute_script(WRITE_LOCAL_STORAGE_JS, state["local_storage"])
+        logger.info(f"Restored session with {len(state['cookies'])} cookies from {self.cache_file_path}")
+        return True
+
+
+def has_live_session_cookie(cookies, now=None) -> bool:
+    """Check the cached cookies for an unexpired LinkedIn session cookie without touching the browser."""
+    now = now or time.time()
+    for cookie in cookies:
+        if cookie.get("name") == SESSION_COOKIE_NAME:
+            return "expiry" not in cookie or cookie["expiry"] > now
+    return False
+
+
+def is_session_valid(driver, timeout=5) -> bool:
+    """Probe a page that needs a login and check that it rendered the navigation bar."""
+    driver.get(SESSION_PROBE_URL)
+    if "/login" in driver.current_url or "checkpoint/challenge" in driver.current_url:
+        return False
+    try:
+        WebDriverWait(driver, timeout).until(
+            EC.presence_of_element_located((By.ID, "global-nav"))
+        )
+        return True
+    except TimeoutException:
+        return False
+
+
+def login_with_cache(driver, session_cache, login_fn) -> None:
+    """Restore a cached session if it is still valid, otherwise call login_fn(driver) and cache the new session."""
+    if session_cache.restore(driver) and is_session_valid(driver):
+        logger.info("Reusing cached session, skipping login")
+        return
+    logger.info("No valid cached session, logging in")
+    login_fn(driver)
+    session_cache.save(driver)
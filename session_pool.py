@@ -0,0 +1,258 @@
+import os
+import queue
+import threading
+import time
+from linkedin_scraper import (login, go_to_skills_page, find_skill_containers, process_skill_modal,
+                              collect_skill_edit_links, deep_link_skill_handler, process_skills_by_deep_link)
+from browser_profile import create_chrome_driver, lean_mode_from_env
+from logging_setup import setup_logging
+from multi_tab import fetch_skill_modals_in_tabs
+from rate_limiter import rate_limited, shared_rate_limiter
+from result_store import ResultStore, refreshing_skill_handler, record_removed_skills
+from session_cache import session_cache_from_env, login_with_cache
+from wait_utils import wait_stats
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def chrome_driver_factory(chrome_driver_path, rate_limiter=None, **profile):
+    """Return a factory that starts a new Chrome session on each call; profile is passed to create_chrome_driver.
+
+    Every session's page requests go through rate_limiter when one is given.
+    """
+    def create_driver():
+        return rate_limited(create_chrome_driver(chrome_driver_path, **profile), rate_limiter)
+    return create_driver
+
+
+class ScrapeSession:
+    """One browser session owned by one pool worker, restarted when it fails."""
+
+    def __init__(self, session_id, driver_factory, login_fn=None, skill_handler=None, result_store=None,
+                 deep_link=False, modal_tabs=1):
+        self.session_id = session_id
+        self.driver_factory = driver_factory
+        self.login_fn = login_fn
+        self.skill_handler = skill_handler
+        self.result_store = result_store
+        self.deep_link = deep_link
+        self.modal_tabs = modal_tabs
+        self.driver = None
+        self.restarts = 0
+        self.profiles_done = 0
+
+    def start(self):
+        self.driver = self.driver_factory()
+        if self.login_fn is not None:
+            self.login_fn(self.driver)
+        logger.info(f"session {self.session_id}: started")
+
+    def restart(self):
+        self.restarts += 1
+        logger.warning(f"session {self.session_id}: restarting (restart {self.restarts})")
+        self.close()
+        self.start()
+
+    def scrape(self, username) -> list:
+        if self.driver is None:
+            self.start()
+        go_to_skills_page(self.driver, username)
+        # in every mode, only skills whose list-page fingerprint changed since they were stored get
+        # their modal reopened, and stored skills the complete list no longer has are marked removed
+        fingerprints = {}
+        pagination = {}
+        if self.modal_tabs > 1:
+            edit_links = collect_skill_edit_links(self.driver, fingerprints, pagination)
+            skills = fetch_skill_modals_in_tabs(self.driver, edit_links, self.modal_tabs, self.result_store, username,
+                                                fingerprints)
+            if self.result_store is not None:
+                record_removed_skills(self.result_store, username, fingerprints, pagination)
+                self.result_store.mark_profile_done(username, skills)
+            self.profiles_done += 1
+            return skills
+        if self.deep_link:
+            edit_links = collect_skill_edit_links(self.driver, fingerprints, pagination)
+            default_handler = deep_link_skill_handler(edit_links)
+        else:
+            default_handler = process_skill_modal
+        skill_handler = self.skill_handler
+        if self.result_store is not None and skill_handler is not False:
+            skill_handler = refreshing_skill_handler(self.result_store, username, fingerprints,
+                                                     skill_handler or default_handler)
+        if self.deep_link:
+            skills = process_skills_by_deep_link(self.driver, edit_links, skill_handler)
+        else:
+            skills = find_skill_containers(self.driver, skill_handler=skill_handler, fingerprints=fingerprints,
+                                           pagination=pagination)
+        if self.result_store is not None:
+            record_removed_skills(self.result_store, username, fingerprints, pagination)
+            # without a skill handler nothing is recorded per skill, so there is nothing to check
+            self.result_store.mark_profile_done(username, skills if skill_handler is not False else ())
+        self.profiles_done += 1
+        return skills
+
+    def close(self):
+        if self.driver is None:
+            return
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"session {self.session_id}: error quitting webdriver: {str(e)}")
+        self.driver = None
+
+
+class SessionPool:
+    """Spreads a list of usernames across size parallel browser sessions.
+
+    Each worker thread owns one ScrapeSession. A failed profile is requeued up to
+    max_attempts times and the session that failed is restarted; a worker gives up
+    after max_restarts restarts and leaves the remaining work to the other sessions.
+    Profiles already done in result_store are skipped unless refresh is set, which
+    scrapes them again for changed and removed skills.
+    """
+
+    def __init__(self, driver_factory, size=2, login_fn=None, skill_handler=None,
+                 max_attempts=2, max_restarts=3, result_store=None, deep_link=False,
+                 modal_tabs=1, refresh=False):
+        assert size > 0, "Session pool size should be positive"
+        self.driver_factory = driver_factory
+        self.size = size
+        self.login_fn = login_fn
+        self.skill_handler = skill_handler
+        self.max_attempts = max_attempts
+        self.max_restarts = max_restarts
+        self.result_store = result_store
+        self.deep_link = deep_link
+        self.modal_tabs = modal_tabs
+        self.refresh = refresh
+        self.sessions = []
+        self.lock = threading.Lock()
+        self.results = {}
+        self.failures = {}
+        self.in_progress = 0
+        self.idle_poll_interval = 0.1
+
+    def worker(self, session, work):
+        while True:
+            # an empty queue is only the end once no other session is mid-profile, since a
+            # failing profile is requeued; a session that is still live waits for it
+            with self.lock:
+                try:
+                    username, attempt = work.get_nowait()
+                    self.in_progress += 1
+                except queue.Empty:
+                    if self.in_progress == 0:
+                        break
+                    username = None
+            if username is None:
+                time.sleep(self.idle_poll_interval)
+                continue
+            try:
+                skills = session.scrape(username)
+                with self.lock:
+                    self.results[username] = skills
+                logger.info(f"session {session.session_id}: scraped {username} ({len(skills)} skills)")
+            except Exception as e:
+                logger.error(f"session {session.session_id}: error scraping {username} attempt {attempt}: {str(e)}")
+                if attempt < self.max_attempts:
+                    work.put((username, attempt + 1))
+                else:
+                    with self.lock:
+                        self.failures[username] = str(e)
+                if session.restarts >= self.max_restarts:
+                    logger.error(f"session {session.session_id}: too many restarts, stopping worker")
+                    break
+                try:
+                    session.restart()
+                except Exception as restart_error:
+                    logger.error(f"session {session.session_id}: restart failed: {str(restart_error)}")
+                    break
+            finally:
+                with self.lock:
+                    self.in_progress -= 1
+        session.close()
+
+    def run(self, usernames) -> dict:
+        """Scrape every username and return results, failures and throughput."""
+        work = queue.Queue()
+        skipped = []
+        for username in usernames:
+            if self.result_store is not None and not self.refresh and self.result_store.is_profile_done(username):
+                skipped.append(username)
+                continue
+            work.put((username, 1))
+        if skipped:
+            logger.info(f"Skipping {len(skipped)} profiles already complete in the result store")
+
+        self.results = {}
+        self.failures = {}
+        self.sessions = [
+            ScrapeSession(session_id, self.driver_factory, self.login_fn, self.skill_handler, self.result_store,
+                          self.deep_link, self.modal_tabs)
+            for session_id in range(min(self.size, max(work.qsize(), 1)))
+        ]
+        start = time.perf_counter()
+        threads = [
+            threading.Thread(target=self.worker, args=(session, work), name=f"scrape-session-{session.session_id}")
+            for session in self.sessions
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        # anything still queued was left behind after every session gave up
+        while not work.empty():
+            username, _ = work.get_nowait()
+            self.failures[username] = "no healthy session left"
+
+        profiles_per_minute = len(self.results) / elapsed * 60 if elapsed > 0 else 0.0
+        report = {
+            "results": self.results,
+            "failures": self.failures,
+            "skipped": skipped,
+            "elapsed_seconds": elapsed,
+            "profiles_per_minute": profiles_per_minute,
+            "restarts": sum(session.restarts for session in self.sessions),
+        }
+        logger.info(f"Scraped {len(self.results)}/{len(usernames)} profiles with {len(self.sessions)} sessions "
+                    f"in {elapsed:.1f}s: {profiles_per_minute:.1f} profiles/min, "
+                    f"{report['restarts']} restarts, {len(self.failures)} failures")
+        return report
+
+
+def main():
+    setup_logging(log_file='session_pool.log', json_format=os.getenv("LOG_JSON") == "1")
+    chrome_driver_path = os.getenv("CHROME_DRIVER_PATH")
+    email = os.getenv("LINKEDIN_EMAIL")
+    pswd = os.getenv("LINKEDIN_PSWD")
+    usernames = [username.strip() for username in os.getenv("LINKEDIN_USERNAMES", "").split(",") if username.strip()]
+    pool_size = int(os.getenv("SESSION_POOL_SIZE", "2"))
+
+    if not all([chrome_driver_path, email, pswd, usernames]):
+        logger.error("Please ensure CHROME_DRIVER_PATH, LINKEDIN_EMAIL, LINKEDIN_PSWD and LINKEDIN_USERNAMES are set.")
+        return
+
+    login_fn = lambda driver: login(driver, email, pswd)
+    session_cache = session_cache_from_env()
+    if session_cache is not None:
+        # every session restores the shared cached login instead of logging in again
+        login_fn = lambda driver: login_with_cache(driver, session_cache, lambda d: login(d, email, pswd))
+
+    with ResultStore(os.getenv("RESULT_STORE_DIR", "linkedin_skills_data")) as result_store:
+        rate_limiter = shared_rate_limiter()
+        driver_factory = chrome_driver_factory(chrome_driver_path, rate_limiter=rate_limiter, **lean_mode_from_env())
+        pool = SessionPool(driver_factory, size=pool_size, login_fn=login_fn,
+                           result_store=result_store, deep_link=os.getenv("DEEP_LINK_MODE") == "1",
+                           modal_tabs=int(os.getenv("MODAL_TABS", "1")),
+                           refresh=os.getenv("REFRESH_PROFILE") == "1")
+        pool.run(usernames)
+    wait_stats.report()
+    if rate_limiter is not None:
+        logger.info(f"Rate limiter: {rate_limiter.summary()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import hashlib
+import re
+from selenium.common.exceptions import WebDriverException
+import logging
+
+logger = logging.getLogger(__name__)
+
+ALL_SKILLS_CONTAINER_SELECTOR = "li[id^='profilePagedListComponent-'][id*='-SKILLS-VIEW-DETAILS-profileTabSection-'][id*='ALL-SKILLS']"
+EDIT_LABEL_PATTERN = re.compile(r'^Edit\s*(.*?)\s*$')
+
+# Walks the ALL-SKILLS containers from arguments[1] onwards in one round trip and
+# returns plain records. arguments[2] is the id expected just before that offset;
+# if the list was re-rendered and it no longer matches, the walk restarts at 0.
+# Falls back to the icon div's innerHTML when the svg can't be matched directly.
+HARVEST_SKILL_CONTAINERS_JS = """
+var containers = document.querySelectorAll(arguments[0]);
+var offset = arguments[1] || 0, lastId = arguments[2];
+if (offset > containers.length || (offset > 0 && containers[offset - 1].id !== lastId)) {
+    offset = 0;
+}
+var records = [];
+for (var i = offset; i < containers.length; i++) {
+    var container = containers[i];
+    var ariaLabel = null;
+    var iconDiv = container.querySelector('div.pvs-navigation__icon');
+    if (iconDiv) {
+        var svg = iconDiv.querySelector('svg[aria-label]');
+        if (svg) {
+            ariaLabel = svg.getAttribute('aria-label');
+        } else {
+            var match = iconDiv.innerHTML.match(/aria-label="(Edit[^"]*)"/);
+            if (match) ariaLabel = match[1];
+        }
+    }
+    var editLink = container.querySelector("a[id^='navigation-add-edit-deeplink-edit-skills']");
+    var summary = [];
+    var subComponents = container.querySelector('.pvs-entity__sub-components');
+    if (subComponents) {
+        var spans = subComponents.querySelectorAll('span[aria-hidden="true"]');
+        for (var j = 0; j < spans.length; j++) {
+            summary.push(spans[j].textContent.trim().replace(/\s+/g, ' '));
+        }
+    }
+    records.push({
+        id: container.id,
+        ariaLabel: ariaLabel,
+        editLinkId: editLink ? editLink.id : null,
+        editLinkHref: editLink ? editLink.href : null,
+        summary: summary.join(' | '),
+        position: i,
+        top: container.getBoundingClientRect().top + window.scrollY
+    });
+}
+return {
+    start: offset,
+    total: containers.length,
+    lastId: containers.length ? containers[containers.length - 1].id : null,
+    records: records
+};
+"""
+
+
+def parse_skill_name(aria_label):
+    """Return the skill name from an 'Edit <skill>' aria-label, or None."""
+    if not aria_label:
+        return None
+    match = EDIT_LABEL_PATTERN.match(aria_label)
+    if match is None or not match.group(1):
+        return None
+    return match.group(1)
+
+
+def skill_fingerprint(skill_name, summary, position) -> dict:
+    """Fingerprint a skill from the list page: a hash of its name and endorsement/association summary, and its position.
+
+    Only the content hash says whether the edit modal needs reopening; the
+    position moves whenever a skill is added or removed above it.
+    """
+    content = hashlib.sha1(f"{skill_name}\x1f{summary or ''}".encode("utf-8")).hexdigest()[:16]
+    return {"content": content, "position": position}
+
+
+def build_skill_records(raw_records) -> list:
+    """Turn the raw harvest payload into skill records, name is None when no skill name was found."""
+    records = []
+    for raw in raw_records or []:
+        skill_name = parse_skill_name(raw.get('ariaLabel'))
+        if skill_name is None:
+            logger.warning("Could not find skill name for container ID: %s", raw.get('id'))
+        records.append({
+            "id": raw.get('id'),
+            "name": skill_name,
+            "editLinkId": raw.get('editLinkId'),
+            "editLinkHref": raw.get('editLinkHref'),
+            "summary": raw.get('summary'),
+            "position": raw.get('position'),
+            "top": raw.get('top'),
+            "fingerprint": skill_fingerprint(skill_name, raw.get('summary'), raw.get('position')),
+        })
+    return records
+
+
+def harvest_skill_containers(driver, selector=ALL_SKILLS_CONTAINER_SELECTOR) -> list:
+    """Return a skill record (see build_skill_records) for every ALL-SKILLS container in one execute_script call."""
+    try:
+        payload = driver.execute_script(HARVEST_SKILL_CONTAINERS_JS, selector, 0, None)
+    except WebDriverException as e:
+        logger.error(f"Error harvesting skill containers: {str(e)}")
+        return []
+    return build_skill_records(payload['records'] if payload else [])
+
+
+class SkillContainerIndex:
+    """Id-keyed index of the skill containers already discovered on the current page.
+
+    Each discover() call only harvests containers appended after the last pass,
+    so discovering n containers over many scroll passes costs O(n) in total.
+    """
+
+    def __init__(self, selector=ALL_SKILLS_CONTAINER_SELECTOR):
+        self.selector = selector
+        self.seen_ids = set()
+        self.offset = 0
+        self.last_id = None
+        self.rescans = 0
+
+    def __len__(self):
+        return len(self.seen_ids)
+
+    def __contains__(self, container_id):
+        return container_id in self.seen_ids
+
+    def discover(self, driver) -> list:
+        """Return records for containers that were not seen in an earlier pass."""
+        try:
+            payload = driver.execute_script(HARVEST_SKILL_CONTAINERS_JS, self.selector, self.offset, self.last_id)
+        except WebDriverException as e:
+            logger.error(f"Error harvesting skill containers: {str(e)}")
+            return []
+        if not payload:
+            return []
+        if payload['start'] != self.offset:
+            self.rescans += 1
+            logger.info(f"Skill list was re-rendered, rescanned {payload['total']} containers")
+        self.offset = payload['total']
+        self.last_id = payload['lastId']
+
+        new_records = []
+        for record in build_skill_records(payload['records']):
+            if record['id'] in self.seen_ids:
+                continue
+            self.seen_ids.add(record['id'])
+            new_records.append(record)
+        return new_records
@@ -0,0 +1,217 @@
+import json
+import sys
+import time
+from html.parser import HTMLParser
+from compact_skills import COMPACT_SKILLS_SUFFIX, write_compact_skills
+import logging
+
+logger = logging.getLogger(__name__)
+
+SKILL_CONTAINER_ID_PREFIX = "profilePagedListComponent-"
+SKILL_CONTAINER_ID_MARKER = "-SKILLS-VIEW-DETAILS-profileTabSection-"
+ALL_SKILLS_MARKER = "ALL-SKILLS"
+SKILL_TOPIC_FIELD = "skill_page_skill_topic"
+EDIT_SKILL_LINK_ID_PREFIX = "navigation-add-edit-deeplink-edit-skills"
+# the per-container lookups of find_skill_containers, replayed by live_harvest
+LIVE_CONTAINER_XPATH = "//li[starts-with(@id, 'profilePagedListComponent-') and contains(@id, '-SKILLS-VIEW-DETAILS-profileTabSection-')]"
+LIVE_ICON_XPATH = ".//div[@class='pvs-navigation__icon']"
+LIVE_SVG_XPATH = "./svg[@aria-label]"
+
+# elements that never get an end tag, so they must not be pushed on the stack
+VOID_ELEMENTS = frozenset([
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+])
+
+
+def is_all_skills_container_id(element_id) -> bool:
+    return bool(element_id) \
+        and element_id.startswith(SKILL_CONTAINER_ID_PREFIX) \
+        and SKILL_CONTAINER_ID_MARKER in element_id \
+        and ALL_SKILLS_MARKER in element_id
+
+
+class SkillsPageParser(HTMLParser):
+    """Streaming parser that collects skill records from a saved skills page source.
+
+    Records have the same shape as linkedin_skills_detailed.json: the XPaths are
+    built the same way as the getXPath() javascript, anchored at the nearest
+    ancestor that has an id.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        # each stack entry is [tag, id, position, child_tag_counts]
+        self.stack = [["#document", None, 1, {}]]
+        self.records = []
+        self.container_depth = None
+        self.container_id = None
+        self.topic_depth = None
+        self.name_depth = None
+        self.name_parts = []
+        self.skill_element_xpath = None
+        self.edit_button_id = None
+
+    def element_xpath(self) -> str:
+        """Return the getXPath()-style path of the element on top of the stack."""
+        components = []
+        for tag, element_id, position, _ in reversed(self.stack):
+            if element_id:
+                components.append(f'id("{element_id}")')
+                break
+            if tag == "body":
+                components.append("BODY")
+                break
+            components.append(f"{tag.upper()}[{position}]")
+        return "/".join(reversed(components))
+
+    def handle_starttag(self, tag, attrs):
+        self.push_element(tag, attrs, tag in VOID_ELEMENTS)
+
+    def handle_startendtag(self, tag, attrs):
+        self.push_element(tag, attrs, True)
+
+    def push_element(self, tag, attrs, is_empty):
+        counts = self.stack[-1][3]
+        position = counts.get(tag, 0) + 1
+        counts[tag] = position
+        attributes = dict(attrs)
+        element_id = attributes.get("id")
+        self.stack.append([tag, element_id, position, {}])
+        depth = len(self.stack)
+
+        if self.container_depth is None:
+            if tag == "li" and is_all_skills_container_id(element_id):
+                self.container_depth = depth
+                self.container_id = element_id
+        elif tag == "a" and attributes.get("data-field") == SKILL_TOPIC_FIELD:
+            self.topic_depth = depth
+        elif tag == "a" and element_id and element_id.startswith(EDIT_SKILL_LINK_ID_PREFIX):
+            self.edit_button_id = element_id
+        elif tag == "span" and self.topic_depth is not None \
+                and self.skill_element_xpath is None \
+                and attributes.get("aria-hidden") == "true":
+            self.name_depth = depth
+            self.skill_element_xpath = self.element_xpath()
+
+        if is_empty:
+            self.pop_to(depth - 1)
+
+    def handle_endtag(self, tag):
+        # pop back to the most recent matching open tag, ignore stray end tags
+        for index in range(len(self.stack) - 1, 0, -1):
+            if self.stack[index][0] == tag:
+                self.pop_to(index)
+                return
+
+    def handle_data(self, data):
+        if self.name_depth is not None:
+            self.name_parts.append(data)
+
+    def pop_to(self, depth):
+        if self.name_depth is not None and depth < self.name_depth:
+            self.name_depth = None
+        if self.topic_depth is not None and depth < self.topic_depth:
+            self.topic_depth = None
+        if self.container_depth is not None and depth < self.container_depth:
+            self.finish_container()
+        del self.stack[depth:]
+
+    def finish_container(self):
+        name = "".join(self.name_parts).strip()
+        if name and self.skill_element_xpath:
+            self.records.append({
+                "editButtonId": self.edit_button_id,
+                "editButtonXPath": f'id("{self.edit_button_id}")' if self.edit_button_id else None,
+                "name": name,
+                "skillElementXPath": self.skill_element_xpath,
+            })
+        else:
+            logger.warning(f"Could not find skill name in container ID: {self.container_id}")
+        self.container_depth = None
+        self.container_id = None
+        self.topic_depth = None
+        self.name_depth = None
+        self.name_parts = []
+        self.skill_element_xpath = None
+        self.edit_button_id = None
+
+
+def extract_skills_from_source(page_source) -> list:
+    """Extract skill records from a page source string, e.g. driver.page_source."""
+    parser = SkillsPageParser()
+    parser.feed(page_source)
+    parser.close()
+    return parser.records
+
+
+def extract_skills(filename, chunk_size=64 * 1024) -> list:
+    """Stream a saved page source file through the parser and return its skill records."""
+    parser = SkillsPageParser()
+    with open(filename, "r", encoding="utf-8") as file:
+        while True:
+            chunk = file.read(chunk_size)
+            if not chunk:
+                break
+            parser.feed(chunk)
+    parser.close()
+    logger.info(f"Extracted {len(parser.records)} skills from {filename}")
+    return parser.records
+
+
+def save_skills(skills, filename="linkedin_skills_detailed.json") -> None:
+    """Save skills as JSON, or in the compact format when filename ends in .skr."""
+    if filename.endswith(COMPACT_SKILLS_SUFFIX):
+        write_compact_skills(skills, filename)
+        return
+    with open(filename, "w") as file:
+        json.dump(skills, file, indent=4)
+    logger.info(f"Saved {len(skills)} skills to {filename}")
+
+
+def live_harvest(driver) -> list:
+    """Collect skill names with the per-container WebDriver calls used by find_skill_containers."""
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+
+    names = []
+    containers = driver.find_elements(By.XPATH, LIVE_CONTAINER_XPATH)
+    for container in containers:
+        if 'ALL-SKILLS' not in container.get_attribute('id'):
+            continue
+        try:
+            icon_div = container.find_element(By.XPATH, LIVE_ICON_XPATH)
+            svg_element = icon_div.find_element(By.XPATH, LIVE_SVG_XPATH)
+            skill_name = svg_element.get_attribute('aria-label')
+            if skill_name and skill_name.startswith("Edit "):
+                skill_name = skill_name[5:]
+            names.append(skill_name)
+        except NoSuchElementException:
+            logger.warning(f"Could not find skill name for container ID: {container.get_attribute('id')}")
+    return names
+
+
+def benchmark_extraction(filename, driver=None, repeat=5) -> dict:
+    """Time offline extraction of filename and, given a driver on the same page, the live path."""
+    results = {}
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        skills = extract_skills(filename)
+        timings.append(time.perf_counter() - start)
+    results["offline"] = {"skills": len(skills), "best_seconds": min(timings), "webdriver_calls": 0}
+
+    if driver is not None:
+        start = time.perf_counter()
+        names = live_harvest(driver)
+        results["live"] = {"skills": len(names), "seconds": time.perf_counter() - start}
+
+    for path, result in results.items():
+        logger.info(f"{path} extraction: {result}")
+    return results
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    source_file = sys.argv[1] if len(sys.argv) > 1 else "final_page_source.html"
+    print(json.dumps(benchmark_extraction(source_file), indent=2))
@@ -0,0 +1,182 @@
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import logging
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_STORE_DIR_ENV = "SNAPSHOT_STORE_DIR"
+INDEX_FILE_NAME = "index.jsonl"
+PROFILE_URL_PATTERN = re.compile(r'linkedin\.com/in/([^/?#]+)')
+
+
+def profile_from_url(url):
+    """Return the profile username from a linkedin.com/in/<username>/... url, or None."""
+    match = PROFILE_URL_PATTERN.search(url or "")
+    return match.group(1) if match else None
+
+
+class SnapshotStore:
+    """Content-addressed, compressed store for page source captures.
+
+    Each capture is hashed (sha256) and stored once under objects/. With zstd a
+    new capture of a profile is compressed against that profile's previous
+    capture as a raw-content dictionary, so near-identical pages store as deltas.
+    A chain of deltas is at most max_chain_depth long; the next capture is
+    stored whole as a new keyframe, so loading one never decompresses more
+    than max_chain_depth + 1 objects.
+    index.jsonl records every capture by profile, stage and timestamp.
+    """
+
+    def __init__(self, directory, compression=None, level=None, max_chain_depth=16):
+        if compression is None:
+            compression = "zstd" if zstandard is not None else "gzip"
+        if compression == "zstd" and zstandard is None:
+            raise RuntimeError("zstd compression needs the zstandard package: pip install zstandard")
+        assert compression in ("zstd", "gzip"), f"Unsupported compression: {compression}"
+        self.directory = directory
+        self.compression = compression
+        self.level = level or (10 if compression == "zstd" else 6)
+        self.max_chain_depth = max_chain_depth
+        self.lock = threading.Lock()
+        self.objects = {}
+        self.latest_by_profile = {}
+        os.makedirs(os.path.join(directory, "objects"), exist_ok=True)
+        self.load_index()
+
+    @property
+    def index_path(self):
+        return os.path.join(self.directory, INDEX_FILE_NAME)
+
+    def object_path(self, digest):
+        extension = "zst" if self.objects.get(digest, {}).get("compression", self.compression) == "zstd" else "gz"
+        return os.path.join(self.directory, "objects", digest[:2], f"{digest}.{extension}")
+
+    def read_index(self):
+        """Yield the index entries; lines torn by a crash are skipped."""
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "r") as file:
+            for line in file:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping a torn line in {self.index_path}")
+
+    def load_index(self):
+        if not os.path.exists(self.index_path):
+            return
+        with open(self.index_path, "rb+") as file:
+            if file.seek(0, os.SEEK_END) > 0:
+                file.seek(-1, os.SEEK_END)
+                if file.read(1) != b"\n":
+                    # end the torn line, or the next append would be joined onto it
+                    file.write(b"\n")
+        for entry in self.read_index():
+            self.objects.setdefault(entry["hash"], entry)
+            if entry["profile"]:
+                self.latest_by_profile[entry["profile"]] = entry["hash"]
+
+    def chain(self, digest) -> list:
+        """Return digest and the bases it was compressed against, nearest first."""
+        chain = [digest]
+        while self.objects[chain[-1]].get("base") is not None:
+            chain.append(self.objects[chain[-1]]["base"])
+        return chain
+
+    def save(self, page_source, profile=None, stage=None) -> dict:
+        """Store page_source and return its index entry; identical captures are stored only once."""
+        data = page_source.encode("utf-8") if isinstance(page_source, str) else page_source
+        digest = hashlib.sha256(data).hexdigest()
+        with self.lock:
+            entry = {
+                "hash": digest,
+                "profile": profile,
+                "stage": stage,
+                "timestamp": time.time(),
+                "size": len(data),
+            }
+            stored = self.objects.get(digest)
+            if stored is None:
+                base = self.latest_by_profile.get(profile) if profile else None
+                if base is not None and len(self.chain(base)) > self.max_chain_depth:
+                    base = None  # start a new keyframe
+                entry["compression"] = self.compression
+                entry["base"] = base if self.compression == "zstd" else None
+                compressed = self.compress(data, entry["base"])
+                entry["stored_size"] = len(compressed)
+                self.objects[digest] = entry
+                object_path = self.object_path(digest)
+                os.makedirs(os.path.dirname(object_path), exist_ok=True)
+                temp_path = f"{object_path}.tmp"
+                with open(temp_path, "wb") as file:
+                    file.write(compressed)
+                os.replace(temp_path, object_path)
+            else:
+                entry["compression"] = stored["compression"]
+                entry["base"] = stored["base"]
+                entry["stored_size"] = 0
+            with open(self.index_path, "a") as file:
+                file.write(json.dumps(entry) + "\n")
+            if profile:
+                self.latest_by_profile[profile] = digest
+        logger.info(f"Snapshot {stage} of {profile} stored as {digest[:12]}: "
+                    f"{entry['size']} bytes -> {entry['stored_size']} bytes")
+        return entry
+
+    def compress(self, data, base):
+        if self.compression == "gzip":
+            return gzip.compress(data, compresslevel=self.level)
+        dict_data = None
+        if base is not None:
+            dict_data = zstandard.ZstdCompressionDict(self.load(base), dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+        return zstandard.ZstdCompressor(level=self.level, dict_data=dict_data).compress(data)
+
+    def load(self, digest) -> bytes:
+        """Return the original bytes of a stored capture."""
+        data = None
+        # decompress from the keyframe forward, each capture is the dictionary of the next
+        for link in reversed(self.chain(digest)):
+            entry = self.objects[link]
+            with open(self.object_path(link), "rb") as file:
+                compressed = file.read()
+            if entry["compression"] == "gzip":
+                data = gzip.decompress(compressed)
+                continue
+            dict_data = None
+            if data is not None:
+                dict_data = zstandard.ZstdCompressionDict(data, dict_type=zstandard.DICT_TYPE_RAWCONTENT)
+            data = zstandard.ZstdDecompressor(dict_data=dict_data).decompress(compressed)
+        return data
+
+    def entries(self, profile=None, stage=None) -> list:
+        """Return index entries in capture order, optionally filtered by profile and stage."""
+        return [
+            entry for entry in self.read_index()
+            if (profile is None or entry["profile"] == profile) and (stage is None or entry["stage"] == stage)
+        ]
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def default_snapshot_store():
+    """Return the SnapshotStore configured by SNAPSHOT_STORE_DIR, or None when it is not set."""
+    global _default_store
+    directory = os.getenv(SNAPSHOT_STORE_DIR_ENV)
+    if not directory:
+        return None
+    with _default_store_lock:
+        if _default_store is None or _default_store.directory != directory:
+            _default_store = SnapshotStore(directory)
+        return _default_store
@@ -0,0 +1,159 @@
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+import logging
+
+logger = logging.getLogger(__name__)
+
+LINKEDIN_ORIGIN = "https://www.linkedin.com"
+SKILLS_PAGE_PATTERN = r"/in/[^/]+/details/skills/?"
+SKILL_EDIT_FORM_PATTERN = r"/in/[^/]+/add-edit/SKILL_AND_ASSOCIATION/?"
+THROTTLED_PAGE = "<html><body><h1>Too many requests</h1></body></html>"
+
+
+class ServerThrottle:
+    """Server-side token bucket that answers requests over rate with a throttling status.
+
+    Like LinkedIn under load, it also slows down: once fewer than slow_below
+    tokens are left, admitted requests are delayed by slow_seconds. status 999 is
+    what LinkedIn sends; 429 carries retry_after.
+    """
+
+    def __init__(self, rate=2.0, burst=4, status=429, retry_after=1, slow_below=1.0, slow_seconds=0.0):
+        self.rate = rate
+        self.burst = burst
+        self.status = status
+        self.retry_after = retry_after
+        self.slow_below = slow_below
+        self.slow_seconds = slow_seconds
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.admitted = 0
+        self.throttled = 0
+
+    def admit(self) -> tuple:
+        """Return (admitted, delay in seconds) for one request."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                self.throttled += 1
+                return False, 0.0
+            self.tokens -= 1
+            self.admitted += 1
+            return True, self.slow_seconds if self.tokens < self.slow_below else 0.0
+
+
+class StandInServer:
+    """Local http.server that serves saved LinkedIn pages in place of the live site.
+
+    Each route maps a path regex to an html file name or a callable(path, query)
+    returning html; the first full match wins and the query string is ignored for
+    matching. Absolute linkedin.com links in served pages are rewritten to the
+    server's base url, so links the scraper follows stay on the stand-in. Point
+    the scraper at it with LINKEDIN_BASE_URL=server.base_url. With a
+    ServerThrottle, requests over its rate get a throttling response instead.
+    """
+
+    def __init__(self, routes=None, host="127.0.0.1", port=0, throttle=None):
+        self.routes = []
+        self.throttle = throttle
+        self.host = host
+        self.port = port
+        self.server = None
+        self.thread = None
+        self.lock = threading.Lock()
+        self.request_counts = {}
+        for pattern, page in (routes or {}).items():
+            self.add_route(pattern, page)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def add_route(self, pattern, page, status=200):
+        self.routes.append((re.compile(pattern), page, status))
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.server.server_address[1]}"
+
+    def url(self, path):
+        return self.base_url + path
+
+    def count_request(self, path):
+        with self.lock:
+            self.request_counts[path] = self.request_counts.get(path, 0) + 1
+
+    def render(self, path, query):
+        """Return (status, html) for a request path."""
+        for pattern, page, status in self.routes:
+            if not pattern.fullmatch(path):
+                continue
+            if callable(page):
+                html = page(path, query)
+            else:
+                with open(page, "r", encoding="utf-8") as file:
+                    html = file.read()
+            return status, html.replace(LINKEDIN_ORIGIN, self.base_url)
+        return 404, f"<html><body><h1>No stand-in page for {path}</h1></body></html>"
+
+    def handler_class(self):
+        standin = self
+
+        class StandInHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                standin.count_request(parts.path)
+                admitted, delay = standin.throttle.admit() if standin.throttle is not None else (True, 0.0)
+                if admitted:
+                    time.sleep(delay)
+                    status, html = standin.render(parts.path, parse_qs(parts.query))
+                else:
+                    status, html = standin.throttle.status, THROTTLED_PAGE
+                body = html.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                if not admitted and standin.throttle.retry_after is not None:
+                    self.send_header("Retry-After", str(standin.throttle.retry_after))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                logger.debug("stand-in %s", format % args)
+
+        return StandInHandler
+
+    def start(self):
+        self.server = ThreadingHTTPServer((self.host, self.port), self.handler_class())
+        self.thread = threading.Thread(target=self.server.serve_forever, name="standin-server", daemon=True)
+        self.thread.start()
+        logger.info(f"Stand-in server listening on {self.base_url}")
+
+    def stop(self):
+        if self.server is None:
+            return
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+        self.server = None
+
+
+def skills_standin_server(skills_page="final_page_source.html", modal_page=None, host="127.0.0.1", port=0):
+    """Return a StandInServer for a saved skills page and the edit form behind its edit links.
+
+    modal_page is an html file name or callable(path, query); every skill's edit
+    form url serves it.
+    """
+    routes = {SKILLS_PAGE_PATTERN: skills_page}
+    if modal_page is not None:
+        routes[SKILL_EDIT_FORM_PATTERN] = modal_page
+    return StandInServer(routes, host=host, port=port)
@@ -0,0 +1,7 @@
+import os
+import sys
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# the scraper's modules live at the top of the repository, not in a package
+sys.path.insert(0, REPO_DIR)
@@ -0,0 +1,52 @@
+import json
+import os
+from conftest import REPO_DIR
+from compact_skills import CompactSkills, convert_compact_to_json, write_compact_skills
+
+SKILLS_JSON_PATH = os.path.join(REPO_DIR, "linkedin_skills_detailed.json")
+
+
+def load_records():
+    with open(SKILLS_JSON_PATH, "r") as file:
+        return json.load(file)
+
+
+def test_round_trip(tmp_path):
+    records = load_records()
+    compact_path = str(tmp_path / "skills.skr")
+    write_compact_skills(records, compact_path)
+    with CompactSkills(compact_path) as skills:
+        assert len(skills) == len(records)
+        assert skills.to_records() == records
+    json_path = str(tmp_path / "skills.json")
+    convert_compact_to_json(compact_path, json_path)
+    with open(json_path, "r") as file:
+        assert json.load(file) == records
+
+
+def test_lookup_by_name(tmp_path):
+    records = load_records()
+    compact_path = str(tmp_path / "skills.skr")
+    write_compact_skills(records, compact_path)
+    with CompactSkills(compact_path) as skills:
+        assert skills.get(records[5]["name"]) == records[5]
+        assert records[-1]["name"] in skills
+        assert "Not A Skill" not in skills
+        assert skills.get("Not A Skill") is None
+
+
+def test_numbers_that_do_not_round_trip_are_kept_whole(tmp_path):
+    records = [{"name": "Leading zero", "id": 'id("item-007")'}, {"name": "Plain", "id": 'id("item-7")'}]
+    compact_path = str(tmp_path / "skills.skr")
+    write_compact_skills(records, compact_path)
+    with CompactSkills(compact_path) as skills:
+        assert skills.to_records() == records
+
+
+def test_explicit_nulls_round_trip(tmp_path):
+    records = [{"name": "Python", "editButtonId": None}, {"name": "SQL"}, {"name": None, "editButtonId": "edit-1"}]
+    compact_path = str(tmp_path / "skills.skr")
+    write_compact_skills(records, compact_path)
+    with CompactSkills(compact_path) as skills:
+        assert skills.to_records() == records
+        assert skills.names() == ["Python", "SQL"]
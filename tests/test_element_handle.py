@@ -0,0 +1,58 @@
+import pytest
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+from element_handle import ElementHandle, skill_container_locators
+from fake_webdriver import FakeWebDriver
+from replay_benchmark import SKILLS_URL, synthetic_skills_page
+from skill_harvester import ALL_SKILLS_CONTAINER_SELECTOR
+
+SKILL_NAME = "Synthetic Skill 3"
+
+
+@pytest.fixture
+def driver():
+    driver = FakeWebDriver(pages={SKILLS_URL: lambda: synthetic_skills_page(5)})
+    driver.get(SKILLS_URL)
+    return driver
+
+
+def test_plain_element_goes_stale(driver):
+    element = driver.find_elements(By.CSS_SELECTOR, ALL_SKILLS_CONTAINER_SELECTOR)[3]
+    driver.rerender()
+    with pytest.raises(StaleElementReferenceException):
+        element.text
+
+
+def test_handle_recovers_by_aria_label(driver):
+    handle = ElementHandle(driver, skill_container_locators(SKILL_NAME))
+    text = handle.text
+    assert SKILL_NAME in text
+    driver.rerender()
+    assert handle.text == text
+    assert handle.recoveries == 1
+
+
+def test_child_handle_recovers_through_stale_parent(driver):
+    parent = ElementHandle(driver, skill_container_locators(SKILL_NAME))
+    child = parent.find_element(By.CSS_SELECTOR, "svg")
+    label = child.get_attribute("aria-label")
+    driver.rerender()
+    assert child.get_attribute("aria-label") == label == f"Edit {SKILL_NAME}"
+
+
+def test_handle_gives_up_after_max_retries(driver):
+    handle = ElementHandle(driver, skill_container_locators(SKILL_NAME), max_retries=2)
+
+    def always_stale(element):
+        driver.rerender()
+        return element.text
+
+    with pytest.raises(StaleElementReferenceException):
+        handle.call(always_stale)
+    assert handle.recoveries == 2
+
+
+def test_handle_for_removed_element_raises_no_such_element(driver):
+    handle = ElementHandle(driver, skill_container_locators("Not A Skill"))
+    with pytest.raises(NoSuchElementException):
+        handle.text
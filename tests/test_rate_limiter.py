@@ -0,0 +1,57 @@
+import pytest
+from rate_limiter import AdaptiveRateLimiter
+
+
+def make_limiter(**kwargs):
+    settings = dict(rate=1.0, min_rate=0.1, max_rate=2.0, increase=0.1, decrease=0.5, pause_seconds=10.0,
+                    max_pause_seconds=60.0, decrease_interval=0.0)
+    settings.update(kwargs)
+    return AdaptiveRateLimiter(**settings)
+
+
+def test_healthy_responses_increase_the_rate_up_to_max_rate():
+    limiter = make_limiter()
+    limiter.report("ok", latency=0.5)
+    assert limiter.rate == pytest.approx(1.1)
+    for _ in range(20):
+        limiter.report("ok", latency=0.5)
+    assert limiter.rate == 2.0
+
+
+def test_throttling_halves_the_rate_down_to_min_rate():
+    limiter = make_limiter()
+    limiter.report("throttled")
+    assert limiter.rate == pytest.approx(0.5)
+    for _ in range(10):
+        limiter.report("throttled")
+    assert limiter.rate == 0.1
+    assert limiter.summary()["throttled"] == 11
+
+
+def test_slow_responses_decrease_without_pausing():
+    limiter = make_limiter(slow_seconds=2.0)
+    limiter.report("ok", latency=5.0)
+    assert limiter.rate == pytest.approx(0.5)
+    assert limiter.paused_until == 0.0
+
+
+def test_throttles_together_count_as_one_decrease():
+    limiter = make_limiter(decrease_interval=60.0)
+    for _ in range(4):
+        limiter.report("throttled")
+    assert limiter.rate == pytest.approx(0.5)
+    assert limiter.summary()["decreases"] == 1
+
+
+def test_pause_grows_with_consecutive_throttles_and_honours_retry_after(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("rate_limiter.time.monotonic", lambda: now[0])
+    limiter = make_limiter()
+    limiter.report("throttled")
+    assert limiter.paused_until == 1010.0
+    limiter.report("throttled")
+    assert limiter.paused_until == 1020.0
+    limiter.report("throttled", retry_after=120)
+    assert limiter.paused_until == 1120.0
+    limiter.report("ok", latency=0.1)
+    assert limiter.consecutive_throttles == 0
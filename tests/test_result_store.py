@@ -0,0 +1,50 @@
+import os
+from result_store import ResultStore, recording_skill_handler
+
+
+def scrape(result_store, profile, skill_names, failing=()):
+    def skill_handler(driver, skill_name):
+        return None if skill_name in failing else [f"{skill_name} item"]
+    handler = recording_skill_handler(result_store, profile, skill_handler)
+    for skill_name in skill_names:
+        handler(None, skill_name)
+
+
+def test_resume_skips_recorded_skills(tmp_path):
+    with ResultStore(str(tmp_path), batch_size=2) as result_store:
+        scrape(result_store, "alice", ["Python", "SQL", "Go"])
+    visited = []
+    with ResultStore(str(tmp_path)) as result_store:
+        assert result_store.is_skill_done("alice", "SQL")
+        handler = recording_skill_handler(result_store, "alice", lambda driver, name: visited.append(name) or [])
+        for skill_name in ["Python", "SQL", "Go", "Rust"]:
+            handler(None, skill_name)
+        assert result_store.mark_profile_done("alice", ["Python", "SQL", "Go", "Rust"])
+    assert visited == ["Rust"]
+    with ResultStore(str(tmp_path)) as result_store:
+        assert result_store.is_profile_done("alice")
+        assert [record["name"] for record in result_store.iter_records()] == ["Python", "SQL", "Go", "Rust"]
+
+
+def test_failed_skill_keeps_profile_open(tmp_path):
+    with ResultStore(str(tmp_path)) as result_store:
+        scrape(result_store, "alice", ["Python", "SQL"], failing={"SQL"})
+        assert not result_store.mark_profile_done("alice", ["Python", "SQL"])
+    with ResultStore(str(tmp_path)) as result_store:
+        assert not result_store.is_profile_done("alice")
+        assert result_store.incomplete_skills("alice", ["Python", "SQL"]) == ["SQL"]
+        scrape(result_store, "alice", ["Python", "SQL"])
+        assert result_store.mark_profile_done("alice", ["Python", "SQL"])
+
+
+def test_torn_last_line_is_ignored_and_overwritten(tmp_path):
+    with ResultStore(str(tmp_path)) as result_store:
+        scrape(result_store, "alice", ["Python"])
+        segment_path = result_store.segment_path(1)
+    with open(segment_path, "ab") as file:
+        file.write(b'{"type": "skill", "prof')
+    with ResultStore(str(tmp_path)) as result_store:
+        assert result_store.offset < os.path.getsize(segment_path)
+        scrape(result_store, "alice", ["SQL"])
+    with ResultStore(str(tmp_path)) as result_store:
+        assert [record["name"] for record in result_store.iter_records()] == ["Python", "SQL"]
@@ -0,0 +1,110 @@
+import re
+import pytest
+from fake_webdriver import FakeWebDriver
+from linkedin_scraper import LINKEDIN_BASE_URL
+from replay_benchmark import synthetic_modal, synthetic_skills_page
+from result_store import ResultStore, recording_skill_handler
+from session_pool import ScrapeSession
+
+MODES = [{}, {"deep_link": True}, {"modal_tabs": 3}]
+
+USERNAME = "paged-user"
+SKILLS_URL = f"{LINKEDIN_BASE_URL}/in/{USERNAME}/details/skills/"
+
+
+@pytest.fixture(autouse=True)
+def work_dir(tmp_path, monkeypatch):
+    # page captures are written to the working directory
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.delenv("SNAPSHOT_STORE_DIR", raising=False)
+    return tmp_path
+
+
+def skill_names(count, first=0):
+    return [f"Skill {index}" for index in range(first, first + count)]
+
+
+def skills_page(names, changed=(), removed=()):
+    page = synthetic_skills_page(len(names), username=USERNAME, names=names)
+    for name in removed:
+        # cut the container out, so the other skills keep their summaries and edit links
+        page = re.sub(rf'<li class="pvs-list__paged-list-item(?:(?!</li>\n).)*?>{re.escape(name)}<.*?</li>\n', "",
+                      page, count=1, flags=re.S)
+    for name in changed:
+        # a new endorsement changes the summary under the skill name
+        start = page.index(f">{name}<")
+        page = page[:start] + page[start:].replace(" experiences<", " experiences, 1 endorsement<", 1)
+    return page
+
+
+def scrape(result_store, names, page_size=10, changed=(), removed=(), **session_options):
+    """Scrape a profile listing names, ten "Show more" pages at a time, as one ScrapeSession."""
+    def driver_factory():
+        page = skills_page(names, changed, removed)
+        # every other url is a skill's edit form, for the deep-link and multi-tab modes
+        return FakeWebDriver(pages={SKILLS_URL: lambda: page},
+                             default_page=lambda: f"<html><body>{synthetic_modal()}</body></html>",
+                             modal_source=synthetic_modal(), auto_open_modal=True, page_size=page_size)
+    session = ScrapeSession(0, driver_factory, result_store=result_store, **session_options)
+    try:
+        return session.scrape(USERNAME)
+    finally:
+        session.close()
+
+
+def test_resume_loads_the_whole_list(work_dir):
+    names = skill_names(99)
+    with ResultStore(str(work_dir / "store")) as result_store:
+        # a first run that stopped after 30 skills
+        handler = recording_skill_handler(result_store, USERNAME, lambda driver, name: [f"{name} item"])
+        for name in names[:30]:
+            handler(None, name)
+        assert scrape(result_store, names) == names
+        assert result_store.is_profile_done(USERNAME)
+        assert result_store.incomplete_skills(USERNAME, names) == []
+
+
+def test_refresh_finds_a_skill_added_above_the_stored_ones(work_dir):
+    names = skill_names(40)
+    with ResultStore(str(work_dir / "store")) as result_store:
+        scrape(result_store, names)
+        grown = ["New Skill"] + names
+        assert scrape(result_store, grown) == grown
+        assert set(result_store.current_skills(USERNAME)) == set(grown)
+        assert list(result_store.iter_records("skill_removed")) == []
+
+
+def scraped_skills(result_store):
+    return [record["name"] for record in result_store.iter_records("skill")]
+
+
+@pytest.mark.parametrize("mode", MODES, ids=["modal", "deep_link", "multi_tab"])
+def test_refresh_reuses_unchanged_skills(work_dir, mode):
+    names = skill_names(25)
+    with ResultStore(str(work_dir / "store")) as result_store:
+        scrape(result_store, names, **mode)
+        assert sorted(scraped_skills(result_store)) == sorted(names)
+        scrape(result_store, names, **mode)
+        assert len(scraped_skills(result_store)) == len(names)
+        assert result_store.is_profile_done(USERNAME)
+
+
+@pytest.mark.parametrize("mode", MODES, ids=["modal", "deep_link", "multi_tab"])
+def test_refresh_reopens_changed_skills(work_dir, mode):
+    names = skill_names(25)
+    with ResultStore(str(work_dir / "store")) as result_store:
+        scrape(result_store, names, **mode)
+        scrape(result_store, names, changed=["Skill 3", "Skill 17"], **mode)
+        assert scraped_skills(result_store)[len(names):] == ["Skill 3", "Skill 17"]
+
+
+@pytest.mark.parametrize("mode", MODES, ids=["modal", "deep_link", "multi_tab"])
+def test_refresh_records_removed_skills(work_dir, mode):
+    names = skill_names(25)
+    with ResultStore(str(work_dir / "store")) as result_store:
+        scrape(result_store, names, **mode)
+        removed = ["Skill 0", "Skill 12"]
+        remaining = [name for name in names if name not in removed]
+        assert scrape(result_store, names, removed=removed, **mode) == remaining
+        assert len(scraped_skills(result_store)) == len(names)
+        assert set(result_store.current_skills(USERNAME)) == set(remaining)
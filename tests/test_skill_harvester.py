@@ -0,0 +1,78 @@
+import copy
+import pytest
+from fake_webdriver import FakeWebDriver
+from replay_benchmark import SKILLS_URL, synthetic_skills_page
+from skill_harvester import (ALL_SKILLS_CONTAINER_SELECTOR, SkillContainerIndex, build_skill_records,
+                             parse_skill_name)
+
+
+@pytest.mark.parametrize("aria_label, skill_name", [
+    ("Edit Python", "Python"),
+    ("Edit  Amazon Web Services (AWS) ", "Amazon Web Services (AWS)"),
+    ("Edit", None),
+    ("Edit   ", None),
+    ("Delete Python", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_skill_name(aria_label, skill_name):
+    assert parse_skill_name(aria_label) == skill_name
+
+
+def test_build_skill_records_keeps_unnamed_containers():
+    records = build_skill_records([
+        {"id": "skill-0", "ariaLabel": "Edit Python", "summary": "3 experiences", "position": 0},
+        {"id": "skill-1", "ariaLabel": "Edit", "summary": "", "position": 1},
+    ])
+    assert [record["name"] for record in records] == ["Python", None]
+    assert records[0]["fingerprint"]["position"] == 0
+    # the content hash covers the name and summary, not the position
+    moved = build_skill_records([{"id": "skill-0", "ariaLabel": "Edit Python", "summary": "3 experiences",
+                                  "position": 7}])
+    assert moved[0]["fingerprint"]["content"] == records[0]["fingerprint"]["content"]
+
+
+def paged_driver(skill_count, page_size):
+    driver = FakeWebDriver(pages={SKILLS_URL: lambda: synthetic_skills_page(skill_count)}, page_size=page_size)
+    driver.get(SKILLS_URL)
+    return driver
+
+
+def test_discover_only_harvests_new_containers():
+    driver = paged_driver(8, page_size=3)
+    index = SkillContainerIndex()
+    first = index.discover(driver)
+    assert [record["position"] for record in first] == [0, 1, 2]
+    assert index.offset == 3
+    assert index.discover(driver) == []
+    driver.load_more()
+    second = index.discover(driver)
+    assert [record["position"] for record in second] == [3, 4, 5]
+    assert [record["name"] for record in second] == [f"Synthetic Skill {index}" for index in (3, 4, 5)]
+    assert index.offset == 6 and len(index) == 6
+    assert index.rescans == 0
+
+
+def test_discover_rescans_after_a_rerender_changes_the_list():
+    driver = paged_driver(5, page_size=None)
+    index = SkillContainerIndex()
+    assert len(index.discover(driver)) == 5
+    # a skill added above the others shifts every container one place down
+    containers = driver.soup.select(ALL_SKILLS_CONTAINER_SELECTOR)
+    added = copy.copy(containers[0])
+    added["id"] = added["id"][:-1] + "added"
+    containers[0].insert_before(added)
+    driver.rerender()
+    new_records = index.discover(driver)
+    assert index.rescans == 1
+    assert [record["id"] for record in new_records] == [added["id"]]
+    assert index.offset == 6 and len(index) == 6
+
+
+def test_discover_keeps_its_offset_across_a_plain_rerender():
+    driver = paged_driver(5, page_size=None)
+    index = SkillContainerIndex()
+    index.discover(driver)
+    driver.rerender()
+    assert index.discover(driver) == []
+    assert index.rescans == 0
@@ -0,0 +1,22 @@
+import json
+import os
+from conftest import REPO_DIR
+from skills_extractor import extract_skills, extract_skills_from_source
+
+PAGE_SOURCE_PATH = os.path.join(REPO_DIR, "final_page_source.html")
+SKILLS_JSON_PATH = os.path.join(REPO_DIR, "linkedin_skills_detailed.json")
+
+
+def test_extract_skills_matches_saved_records():
+    with open(SKILLS_JSON_PATH, "r") as file:
+        expected = json.load(file)
+    assert extract_skills(PAGE_SOURCE_PATH) == expected
+
+
+def test_extract_skills_does_not_depend_on_chunk_size():
+    with open(PAGE_SOURCE_PATH, "r", encoding="utf-8") as file:
+        page_source = file.read()
+    records = extract_skills_from_source(page_source)
+    assert len(records) == 99
+    # small chunks split tags, attributes and skill names across feeds
+    assert extract_skills(PAGE_SOURCE_PATH, chunk_size=1000) == records
@@ -0,0 +1,229 @@
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import WebDriverException
+import logging
+
+logger = logging.getLogger(__name__)
+
+# extra time given to the driver's script timeout beyond the page-side ceiling
+SCRIPT_TIMEOUT_MARGIN = 5
+
+# Runs inside the page as an async script. Resolves as soon as the condition for
+# `mode` holds, re-checking on every DOM mutation (or on a short interval for
+# network idle). The timeout is only a ceiling.
+#   present     - at least one element matches selector
+#   count_above - more than target elements match selector
+#   stable      - the number of matches has not changed for quietMs
+#   network_idle - no new resource timing entries for quietMs and document is complete
+#   more_items  - more than target elements match selector; gives up early once
+#                 nothing is in flight and no resource has loaded for quietMs
+# The result's reason is "condition", "idle" or "timeout".
+WAIT_FOR_DOM_JS = """
+var selector = arguments[0], mode = arguments[1], target = arguments[2];
+var quietMs = arguments[3], timeoutMs = arguments[4];
+var done = arguments[arguments.length - 1];
+var started = Date.now(), finished = false, observer = null, quietTimer = null, poller = null, ceiling = null;
+
+function count() {
+    return selector ? document.querySelectorAll(selector).length : 0;
+}
+function finish(ok, reason) {
+    if (finished) return;
+    finished = true;
+    if (observer) observer.disconnect();
+    clearTimeout(quietTimer);
+    clearTimeout(ceiling);
+    clearInterval(poller);
+    done({ok: ok, count: count(), elapsedMs: Date.now() - started, reason: reason || (ok ? 'condition' : 'timeout'),
+          inflight: window.__scraperInflight || 0});
+}
+// counts fetch and XHR requests that have started but not finished, once per document
+function trackInflight() {
+    if (window.__scraperInflight !== undefined) return;
+    window.__scraperInflight = 0;
+    var settle = function() { window.__scraperInflight = Math.max(0, window.__scraperInflight - 1); };
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function() {
+            window.__scraperInflight++;
+            return originalFetch.apply(this, arguments).then(function(response) { settle(); return response; },
+                                                             function(error) { settle(); throw error; });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function() {
+        window.__scraperInflight++;
+        this.addEventListener('loadend', settle);
+        return originalSend.apply(this, arguments);
+    };
+}
+// the resource timing buffer stops at 250 entries by default, after which the
+// entry count never changes and every wait would look idle; raised once per document
+function growResourceTimingBuffer() {
+    if (window.__scraperResourceBuffer) return;
+    window.__scraperResourceBuffer = true;
+    if (performance.setResourceTimingBufferSize) performance.setResourceTimingBufferSize(100000);
+}
+
+if (mode === 'more_items') {
+    trackInflight();
+    growResourceTimingBuffer();
+    var lastEntries = -1, lastActivity = Date.now();
+    observer = new MutationObserver(function() {
+        if (count() > target) finish(true);
+    });
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    poller = setInterval(function() {
+        var entries = performance.getEntriesByType('resource').length;
+        if (entries !== lastEntries || window.__scraperInflight > 0) {
+            lastEntries = entries;
+            lastActivity = Date.now();
+        } else if (Date.now() - lastActivity >= quietMs) {
+            finish(false, 'idle');
+        }
+    }, 50);
+    if (count() > target) finish(true);
+} else if (mode === 'network_idle') {
+    growResourceTimingBuffer();
+    var lastEntries = -1, lastChange = Date.now();
+    poller = setInterval(function() {
+        var entries = performance.getEntriesByType('resource').length;
+        if (entries !== lastEntries) {
+            lastEntries = entries;
+            lastChange = Date.now();
+        } else if (document.readyState === 'complete' && Date.now() - lastChange >= quietMs) {
+            finish(true);
+        }
+    }, 50);
+} else {
+    var lastCount = count();
+    var check = function() {
+        var current = count();
+        if (mode === 'present' && current > 0) return finish(true);
+        if (mode === 'count_above' && current > target) return finish(true);
+        if (mode === 'stable' && (current !== lastCount || quietTimer === null)) {
+            lastCount = current;
+            clearTimeout(quietTimer);
+            quietTimer = setTimeout(function() { finish(current > 0); }, quietMs);
+        }
+    };
+    observer = new MutationObserver(check);
+    observer.observe(document.documentElement, {childList: true, subtree: true});
+    check();
+}
+ceiling = setTimeout(function() { finish(false); }, timeoutMs);
+"""
+
+
+class WaitStats:
+    """Accumulates how long each wait took compared to the fixed sleep it replaced."""
+
+    def __init__(self):
+        self.records = []
+        self.lock = threading.Lock()
+
+    def record(self, label, legacy_seconds, waited_seconds):
+        with self.lock:
+            self.records.append((label, legacy_seconds, waited_seconds))
+
+    @contextmanager
+    def timed(self, label, legacy_seconds):
+        """Record the duration of the with-block against legacy_seconds."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(label, legacy_seconds, time.perf_counter() - start)
+
+    def saved_seconds(self) -> float:
+        with self.lock:
+            return sum(legacy - waited for _, legacy, waited in self.records)
+
+    def summary(self) -> dict:
+        summary = {}
+        with self.lock:
+            for label, legacy, waited in self.records:
+                entry = summary.setdefault(label, {"count": 0, "legacy_seconds": 0.0, "waited_seconds": 0.0})
+                entry["count"] += 1
+                entry["legacy_seconds"] += legacy
+                entry["waited_seconds"] += waited
+        return summary
+
+    def report(self) -> dict:
+        summary = self.summary()
+        for label, entry in sorted(summary.items()):
+            logger.info(f"wait {label}: {entry['count']} waits, "
+                        f"{entry['waited_seconds']:.1f}s waited vs {entry['legacy_seconds']:.1f}s of fixed sleeps")
+        logger.info(f"Event-driven waits saved {self.saved_seconds():.1f}s of wall time")
+        return summary
+
+    def reset(self):
+        with self.lock:
+            self.records = []
+
+
+# shared by the scraper functions, reported at the end of main()
+wait_stats = WaitStats()
+
+# last script timeout set on each driver, so it is only sent when it must grow
+_script_timeouts = weakref.WeakKeyDictionary()
+
+
+def _ensure_script_timeout(driver, timeout):
+    needed = timeout + SCRIPT_TIMEOUT_MARGIN
+    try:
+        if _script_timeouts.get(driver, 0) >= needed:
+            return
+        driver.set_script_timeout(needed)
+        _script_timeouts[driver] = needed
+    except TypeError:
+        # driver objects that cannot be weakly referenced just set it every time
+        driver.set_script_timeout(needed)
+
+
+def wait_for_dom(driver, selector, mode, target=0, quiet=0.5, timeout=10, label=None, legacy_seconds=0, stats=None):
+    """Block until the page-side condition for mode holds or timeout seconds pass.
+
+    Returns the page-side result dict ({ok, count, elapsedMs}) or None if the script failed.
+    When label is given the wait is recorded in stats against legacy_seconds.
+    """
+    start = time.perf_counter()
+    result = None
+    try:
+        _ensure_script_timeout(driver, timeout)
+        result = driver.execute_async_script(WAIT_FOR_DOM_JS, selector, mode, target, int(quiet * 1000), int(timeout * 1000))
+    except TimeoutException:
+        logger.warning(f"wait_for_dom {mode} {selector} exceeded the script timeout")
+    except WebDriverException as e:
+        logger.warning(f"wait_for_dom {mode} {selector} failed: {str(e)}")
+    if label is not None:
+        (stats or wait_stats).record(label, legacy_seconds, time.perf_counter() - start)
+    return result
+
+
+def wait_for_element(driver, selector, timeout=10, **kwargs):
+    """Wait until at least one element matches the css selector."""
+    return wait_for_dom(driver, selector, "present", timeout=timeout, **kwargs)
+
+
+def wait_for_new_items(driver, selector, previous_count, timeout=10, **kwargs):
+    """Wait until more than previous_count elements match the css selector."""
+    return wait_for_dom(driver, selector, "count_above", target=previous_count, timeout=timeout, **kwargs)
+
+
+def wait_for_stable_count(driver, selector, quiet=0.5, timeout=10, **kwargs):
+    """Wait until the number of elements matching the css selector stops changing for quiet seconds."""
+    return wait_for_dom(driver, selector, "stable", quiet=quiet, timeout=timeout, **kwargs)
+
+
+def wait_for_more_items(driver, selector, previous_count, quiet=0.5, timeout=10, **kwargs):
+    """Wait until more than previous_count elements match, or until nothing is loading for quiet seconds."""
+    return wait_for_dom(driver, selector, "more_items", target=previous_count, quiet=quiet, timeout=timeout, **kwargs)
+
+
+def wait_for_network_idle(driver, quiet=0.5, timeout=10, **kwargs):
+    """Wait until no new resources have loaded for quiet seconds."""
+    return wait_for_dom(driver, None, "network_idle", quiet=quiet, timeout=timeout, **kwargs)